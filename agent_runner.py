@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+에이전트 동시 실행기 (Concurrent Agent Runner)
+
+ADK 의 Agent.run_async 는 이름과 달리 내부에서 동기 HTTP 호출과 time.sleep 을 사용하므로
+같은 이벤트 루프에서 gather 해도 질문이 하나씩 순차 실행됩니다.
+그래서 질문은 워커 스레드(각자의 이벤트 루프)에서 실행하고, 호출 쪽 루프는 스케줄링만 담당합니다.
+
+- run_batch: 동시 실행 수 제한, 요청별 타임아웃, 스로틀링(HTTP 429) 시 지수 백오프 재시도,
+  결과는 입력 순서대로 반환
+- run_in_worker_thread: 루프에 묶인 상태가 없는 Agent(원격 SQL 도구 등)를 스레드에서 한 번 실행
+- AgentWorkerPool: MCP 세션처럼 이벤트 루프에 묶인 도구를 쓰는 Agent 용.
+  워커 스레드마다 자기 루프 안에서 Agent 를 한 번 만들어 두고 계속 재사용
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncContextManager, Awaitable, Callable, List, Optional, Sequence
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT_SECONDS = 180.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 2.0
+MAX_BACKOFF_SECONDS = 30.0
+
+RunFunction = Callable[[str], Awaitable[Any]]
+
+
+@dataclass
+class BatchResult:
+    """질문 하나의 실행 결과 (입력 순서의 index 포함)"""
+    index: int
+    question: str
+    response: Any = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def is_throttled(error: BaseException) -> bool:
+    """OCI ServiceError(429) 등 스로틀링 오류인지 판단합니다."""
+    if getattr(error, "status", None) == 429:
+        return True
+    return getattr(error, "code", None) in ("TooManyRequests", "429")
+
+
+async def run_in_worker_thread(agent: Any, question: str, **kwargs: Any) -> Any:
+    """agent.run_async 를 워커 스레드의 새 이벤트 루프에서 실행합니다."""
+    return await asyncio.to_thread(lambda: asyncio.run(agent.run_async(question, **kwargs)))
+
+
+async def run_batch(
+    questions: Sequence[str],
+    run: RunFunction,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF_SECONDS,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+) -> List[BatchResult]:
+    """
+    질문들을 최대 concurrency 개씩 동시에 실행하고 입력 순서대로 결과를 반환합니다.
+
+    실패한 질문은 예외를 던지지 않고 BatchResult.error 에 담깁니다.
+    스로틀링 오류만 backoff * 2^n (+지터, 최대 MAX_BACKOFF_SECONDS) 만큼 기다린 뒤 재시도합니다.
+    on_result 는 질문이 끝나는 순서대로 호출됩니다 (진행 상황 출력용).
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def execute(index: int, question: str) -> BatchResult:
+        result = BatchResult(index=index, question=question)
+        async with semaphore:
+            started = time.perf_counter()
+            while True:
+                result.attempts += 1
+                try:
+                    result.response = await asyncio.wait_for(run(question), timeout)
+                    result.error = None
+                    break
+                except asyncio.TimeoutError as error:
+                    result.error = error
+                    break
+                except Exception as error:
+                    result.error = error
+                    if not is_throttled(error) or result.attempts > max_retries:
+                        break
+                    delay = min(MAX_BACKOFF_SECONDS, backoff * 2 ** (result.attempts - 1))
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            result.elapsed = time.perf_counter() - started
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    return list(await asyncio.gather(*(execute(index, question) for index, question in enumerate(questions))))
+
+
+class AgentWorkerPool:
+    """
+    이벤트 루프에 묶인 Agent 를 워커 스레드별로 유지하는 풀
+
+    agent_factory 는 Agent 를 내어주는 async context manager 를 반환해야 하며
+    (예: MCP 클라이언트 연결 → Agent 생성), 워커 스레드 안에서 한 번 진입해 close() 까지 유지됩니다.
+    """
+
+    def __init__(self, agent_factory: Callable[[], AsyncContextManager[Any]], size: int = DEFAULT_CONCURRENCY) -> None:
+        self.agent_factory = agent_factory
+        self.size = max(1, size)
+        self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+
+    async def start(self) -> "AgentWorkerPool":
+        """워커를 띄우고 모든 워커의 Agent 준비가 끝날 때까지 기다립니다."""
+        if self._threads:
+            return self
+        ready = [concurrent.futures.Future() for _ in range(self.size)]
+        for number, future in enumerate(ready):
+            thread = threading.Thread(
+                target=lambda future=future: asyncio.run(self._serve(future)),
+                name=f"agent-worker-{number}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        try:
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in ready))
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def _serve(self, ready: concurrent.futures.Future) -> None:
+        try:
+            async with self.agent_factory() as agent:
+                ready.set_result(None)
+                while True:
+                    job = await asyncio.to_thread(self._jobs.get)
+                    if job is None:
+                        return
+                    question, kwargs, context, future = job
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        # 호출한 쪽의 contextvars(트레이스 span 등)를 이어받아 실행
+                        task = asyncio.create_task(agent.run_async(question, **kwargs), context=context)
+                        future.set_result(await task)
+                    except BaseException as error:
+                        # CancelledError / KeyboardInterrupt 도 결과로 넘겨야 기다리는 run() 이 멈추지 않음
+                        future.set_exception(error)
+                        # 작업 안에서 난 CancelledError 는 결과로만 넘기고 워커는 계속 (워커 루프 자체가 취소된 경우만 종료)
+                        if isinstance(error, asyncio.CancelledError) and not asyncio.current_task().cancelling():
+                            continue
+                        if not isinstance(error, Exception):
+                            raise
+        except BaseException as error:
+            if ready.done():
+                raise
+            ready.set_exception(error)
+
+    async def run(self, question: str, **kwargs: Any) -> Any:
+        """빈 워커에서 질문 하나를 실행합니다."""
+        if not self._threads:
+            await self.start()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._jobs.put((question, kwargs, contextvars.copy_context(), future))
+        return await asyncio.wrap_future(future)
+
+    async def close(self) -> None:
+        for _ in self._threads:
+            self._jobs.put(None)
+        threads, self._threads = self._threads, []
+        await asyncio.to_thread(lambda: [thread.join() for thread in threads])
+
+    async def __aenter__(self) -> "AgentWorkerPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
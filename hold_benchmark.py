@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+AP 홀딩 MCP 도구 / SQL 에이전트 벤치마크
+
+실제 OCI 에이전트 엔드포인트와 DB Tools 연결 없이 로컬 대체물로 지연 시간을 측정합니다.
+
+- SQLite 대체 DB: AP_HOLDS_ALL / AP_INVOICES 합성 데이터를 원하는 규모로 적재
+  (사유는 롱테일 분포, ORG_ID 3~10개, 일부 홀딩은 해제 상태)
+- tools : MCP 도구를 fastmcp 인메모리 클라이언트로 호출 (SqlHoldRepository 사용)
+- records: 저장소 레코드 표현 비교 — 행마다 dict + Pydantic 응답 모델 vs HoldRow(__slots__, intern) + 응답 dict
+  (홀딩 1건당 유지 메모리, 50건 페이지의 레코드 생성 + 응답 직렬화 지연/처리량)
+- startup: 서버/CLI 모듈 import 시간(-X importtime, 패키지별 자체 시간 상위)과 서버 기동 → /ready 응답까지 시간
+- agent : CachedSqlAgent + AgentPool 을 스텁 LLM(고정 지연 후 템플릿 SQL 생성 → SQLite 실행)으로 실행
+- 도구/시나리오별 p50/p95/p99 지연, 처리량, tracemalloc 최대 할당량, 프로세스 최대 RSS
+- --json 으로 결과 저장, --baseline 으로 이전 결과와 비교해 p95 회귀 시 종료 코드 1
+
+사용법:
+    python hold_benchmark.py all --rows 100000
+    python hold_benchmark.py tools --rows 1000000 --iterations 500 --json bench.json
+    python hold_benchmark.py agent --concurrency 8 --model-latency 0.2 --baseline bench.json
+    python hold_benchmark.py records --rows 100000 --record-rows 100000
+    python hold_benchmark.py startup --iterations 5 --startup-budget 1.0
+"""
+import argparse
+import asyncio
+import gc
+import json
+import math
+import os
+import random
+import re
+import resource
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from hold_datasource import HOLD_COLUMNS, SQLITE_SCHEMA, SQLitePool, SqlHoldRepository, rows_to_records
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(PROJECT_DIR, ".cache", "bench_holds.db")
+SEED_CHUNK_ROWS = 50_000
+RECORD_PAGE_SIZE = 50
+
+# 기동 시간을 재는 모듈 (서버, MCP CLI, SQL 에이전트)
+STARTUP_MODULES = ["hold_resolve_mcp", "hold_resolve_mcp_cli", "sqltool_call"]
+READY_TIMEOUT_SECONDS = 30.0
+
+# 벤치마크 전용 AP_INVOICES 대체 테이블 (sqltool_call.SQL_TOOL_SCHEMA_TOPICS 에 나오는 컬럼 위주)
+SQLITE_INVOICES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ap_invoices (
+    INVOICE_ID TEXT PRIMARY KEY,
+    INVOICE_NUM TEXT NOT NULL,
+    VENDOR_ID INTEGER,
+    VENDOR_SITE_ID INTEGER,
+    INVOICE_AMOUNT REAL,
+    AMOUNT_PAID REAL,
+    TAX_AMOUNT REAL,
+    INVOICE_CURRENCY_CODE TEXT,
+    INVOICE_DATE TEXT,
+    GL_DATE TEXT,
+    APPROVAL_STATUS TEXT,
+    DESCRIPTION TEXT,
+    ORG_ID INTEGER,
+    LAST_UPDATE_DATE TEXT
+);
+"""
+
+
+def _reason_catalog() -> List[Tuple[str, str, str]]:
+    """(사유, 홀딩 코드, 상세 템플릿) 목록 — Mock 데이터의 사유를 그대로 사용"""
+    from hold_mock_data import HOLDING_REASON_DETAILS, MOCK_HOLDING_INVOICES
+
+    return [
+        (invoice["reason"], invoice["hold_lookup_code"], HOLDING_REASON_DETAILS[invoice["id"]]["detail"])
+        for invoice in MOCK_HOLDING_INVOICES
+    ]
+
+
+def _iter_synthetic_rows(rows: int, seed: int) -> Iterator[Tuple[tuple, Optional[tuple]]]:
+    """(AP_HOLDS_ALL 행, AP_INVOICES 행 또는 None) 을 생성합니다. 인보이스 하나에 홀딩 1~3건."""
+    rng = random.Random(seed)
+    catalog = _reason_catalog()
+    # 상위 사유에 몰리는 롱테일 분포 (1/rank^1.2)
+    weights = [1 / (rank + 1) ** 1.2 for rank in range(len(catalog))]
+    org_ids = [101, 102, 103, 104, 105, 201, 202, 301]
+    org_weights = [30, 25, 15, 10, 8, 6, 4, 2]
+    start = date(2024, 1, 1)
+    invoice_number = 0
+    holds_left = 0
+    for hold_id in range(1, rows + 1):
+        invoice_row = None
+        if holds_left == 0:
+            invoice_number += 1
+            holds_left = rng.choice((1, 1, 1, 2, 3))
+            org_id = rng.choices(org_ids, org_weights)[0]
+            invoice_date = start + timedelta(days=rng.randrange(365))
+            amount = round(rng.lognormvariate(13, 1.2), 2)
+            invoice_row = (
+                f"INV-{invoice_number:07d}", f"{invoice_number:010d}", rng.randrange(1, 5000), rng.randrange(1, 20000),
+                amount, 0.0, round(amount / 11, 2), "KRW", invoice_date.isoformat(),
+                invoice_date.isoformat(), rng.choice(("APPROVED", "REQUIRED", "NEEDS REAPPROVAL")),
+                f"합성 인보이스 {invoice_number}", org_id, invoice_date.isoformat(),
+            )
+        holds_left -= 1
+        reason, code, detail = rng.choices(catalog, weights)[0]
+        hold_date = invoice_date + timedelta(days=rng.randrange(30))
+        released = rng.random() < 0.2
+        yield (
+            f"INV-{invoice_number:07d}", code, reason, hold_date.isoformat(), org_id, detail,
+            "RELEASED" if released else None, "Released by benchmark" if released else None,
+            hold_id, hold_date.isoformat(), hold_date.isoformat(),
+        ), invoice_row
+
+
+def seed_benchmark_db(path: str, rows: int, seed: int = 42) -> Dict[str, Any]:
+    """AP_HOLDS_ALL / AP_INVOICES 합성 데이터를 SQLite 에 적재합니다 (기존 파일은 덮어씀)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    started = time.perf_counter()
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(SQLITE_SCHEMA + SQLITE_INVOICES_SCHEMA)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        holds: List[tuple] = []
+        invoices: List[tuple] = []
+
+        def flush() -> None:
+            connection.executemany(
+                """INSERT INTO ap_holds_all (INVOICE_ID, HOLD_LOOKUP_CODE, HOLD_REASON, HOLD_DATE, ORG_ID, HOLD_DETAILS,
+                                             RELEASE_LOOKUP_CODE, RELEASE_REASON, HOLD_ID, LAST_UPDATE_DATE, CREATION_DATE)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                holds,
+            )
+            connection.executemany(f"INSERT INTO ap_invoices VALUES ({', '.join('?' * 14)})", invoices)
+            holds.clear()
+            invoices.clear()
+
+        for hold_row, invoice_row in _iter_synthetic_rows(rows, seed):
+            holds.append(hold_row)
+            if invoice_row is not None:
+                invoices.append(invoice_row)
+            if len(holds) >= SEED_CHUNK_ROWS:
+                flush()
+        flush()
+        connection.commit()
+        invoice_count = connection.execute("SELECT COUNT(*) FROM ap_invoices").fetchone()[0]
+    finally:
+        connection.close()
+    return {"rows": rows, "invoices": invoice_count, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """정렬된 값의 nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(name: str, latencies: List[float], wall_seconds: float, peak_bytes: int = 0, **extra: Any) -> Dict[str, Any]:
+    values = sorted(latencies)
+    return {
+        "name": name,
+        "calls": len(values),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "throughput_per_s": round(len(values) / wall_seconds, 1) if wall_seconds else 0.0,
+        "peak_alloc_kib": round(peak_bytes / 1024, 1),
+        **extra,
+    }
+
+
+async def _measure(
+    name: str,
+    call: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    memory_iterations: int,
+    concurrency: int = 1,
+    **extra: Any,
+) -> Dict[str, Any]:
+    """call(i) 를 iterations 번 실행해 지연을 재고, 별도 패스에서 tracemalloc 으로 최대 할당량을 잽니다."""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call(index)
+            latencies.append(time.perf_counter() - started)
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(timed(index) for index in range(iterations)))
+    wall_seconds = time.perf_counter() - wall_started
+
+    # tracemalloc 은 실행을 느리게 하므로 지연 측정과 분리
+    tracemalloc.start()
+    try:
+        for index in range(memory_iterations):
+            await call(iterations + index)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return summarize(name, latencies, wall_seconds, peak, **extra)
+
+
+async def bench_tools(db_path: str, iterations: int, memory_iterations: int, response_cache: bool) -> List[Dict[str, Any]]:
+    """MCP 도구를 인메모리 클라이언트로 호출하여 도구별 지연을 측정합니다."""
+    from fastmcp import Client
+
+    import hold_resolve_mcp
+
+    started = time.perf_counter()
+    repository = SqlHoldRepository(SQLitePool(db_path))
+    hold_resolve_mcp.set_repository(repository)
+    setup_seconds = time.perf_counter() - started
+    if not response_cache:
+        hold_resolve_mcp._response_cache.max_entries = 0
+
+    invoice_count = sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM ap_invoices").fetchone()[0]
+    rng = random.Random(7)
+
+    def invoice_id() -> str:
+        return f"INV-{rng.randrange(1, invoice_count + 1):07d}"
+
+    scenarios: List[Tuple[str, Callable[[int], Dict[str, Any]]]] = [
+        ("list_holding_invoices", lambda i: {"page_size": 50}),
+        ("list_holding_invoices[reason]", lambda i: {"reason": "수량 불일치", "page_size": 50}),
+        ("get_holding_reason_detail", lambda i: {"invoice_id": invoice_id()}),
+        ("get_holding_reason_detail[missing]", lambda i: {"invoice_id": f"INV-X{i}"}),
+        ("get_holding_reason_details[20]", lambda i: {"invoice_ids": [invoice_id() for _ in range(20)]}),
+        ("get_all_holding_reason_details", lambda i: {"page_size": 50}),
+        ("get_all_holding_reason_details[table]", lambda i: {"page_size": 50, "fields": ["invoice_id", "reason"], "output_format": "table"}),
+        ("get_invoice_statistics", lambda i: {}),
+        ("get_invoice_statistics_breakdown", lambda i: {"as_of": "2025-01-01"}),
+        ("search_rule_book", lambda i: {"query": rng.choice(["단가 차이 승인", "부분납품 검수", "중복 인보이스", "예산 초과"])}),
+    ]
+
+    results = []
+    async with Client(hold_resolve_mcp.mcp) as client:
+        for name, arguments in scenarios:
+            tool = name.split("[")[0]
+            results.append(await _measure(
+                name,
+                lambda i, tool=tool, arguments=arguments: client.call_tool(tool, arguments(i)),
+                iterations,
+                memory_iterations,
+            ))
+    results.append({"name": "server_setup", "seconds": round(setup_seconds, 3), "holds": len(repository)})
+    return results
+
+
+class StubRunResponse:
+    """스텁 에이전트 응답 (sql_cache.extract_sql / extract_sql_result 가 읽는 raw_responses 구조만 흉내)"""
+
+    def __init__(self, question: str, sql: str, columns: List[str], rows: List[tuple], session_id: str) -> None:
+        self.session_id = session_id
+        trace = {"generatedSql": sql, "result": {"columns": columns, "rows": [list(row) for row in rows]}}
+        self.raw_responses = [type("RawResponse", (), {"raw_data": {"traces": [trace]}})()]
+        self.final_output = f"{question}: {len(rows)}건"
+
+    def pretty_print(self) -> None:
+        print(self.final_output)
+
+
+class StubSqlAgent:
+    """
+    LLM + DB Tools 대체물
+
+    ADK Agent 처럼 run_async 가 블로킹(time.sleep)으로 model_latency 만큼 기다린 뒤,
+    질문에 맞는 템플릿 SQL 을 SQLite 대체 DB 에서 실행합니다.
+    """
+
+    agent_endpoint_id = "stub"
+
+    def __init__(self, db_path: str, model_latency: float) -> None:
+        self.db_path = db_path
+        self.model_latency = model_latency
+        self.client = self
+
+    def get_agent_endpoint_details(self, agent_endpoint_id: str) -> Dict[str, Any]:
+        return {"id": agent_endpoint_id}
+
+    @staticmethod
+    def generate_sql(question: str) -> str:
+        match = re.search(r"INV-\d+", question)
+        if match:
+            return (
+                "SELECT aha.INVOICE_ID, aha.HOLD_LOOKUP_CODE, aha.HOLD_REASON, aha.HOLD_DATE, aia.INVOICE_AMOUNT, "
+                "aia.VENDOR_ID FROM ap_holds_all aha JOIN ap_invoices aia ON aia.INVOICE_ID = aha.INVOICE_ID "
+                f"WHERE aha.INVOICE_ID = '{match.group(0)}'"
+            )
+        if "reason" in question or "사유" in question:
+            return ("SELECT aha.HOLD_REASON, COUNT(*) FROM ap_holds_all aha WHERE aha.RELEASE_LOOKUP_CODE IS NULL "
+                    "GROUP BY aha.HOLD_REASON ORDER BY 2 DESC")
+        return ("SELECT aha.INVOICE_ID, aha.HOLD_LOOKUP_CODE, aha.HOLD_REASON, aha.HOLD_DATE FROM ap_holds_all aha "
+                "WHERE aha.RELEASE_LOOKUP_CODE IS NULL ORDER BY aha.HOLD_ID DESC LIMIT 10")
+
+    async def run_async(self, question: str, **kwargs: Any) -> StubRunResponse:
+        time.sleep(self.model_latency)
+        sql = self.generate_sql(question)
+        connection = sqlite3.connect(self.db_path)
+        try:
+            cursor = connection.execute(sql)
+            rows = cursor.fetchall()
+            columns = [column[0] for column in cursor.description]
+        finally:
+            connection.close()
+        return StubRunResponse(question, sql, columns, rows, session_id=f"stub-{id(question)}")
+
+
+async def bench_agent(
+    db_path: str,
+    iterations: int,
+    concurrency: int,
+    model_latency: float,
+    repeat_ratio: float,
+) -> List[Dict[str, Any]]:
+    """CachedSqlAgent + AgentPool 흐름을 스텁 LLM 으로 실행합니다 (반복 질문 비율 repeat_ratio)."""
+    from sqltool_call import AgentPool, CachedSqlAgent
+
+    invoice_count = sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM ap_invoices").fetchone()[0]
+    rng = random.Random(11)
+    popular = ["get invoice holding list first 10 records", "hold reason counts", "INV-0000001 holding info"]
+    questions = [
+        rng.choice(popular) if rng.random() < repeat_ratio else f"INV-{rng.randrange(1, invoice_count + 1):07d} holding info"
+        for _ in range(iterations)
+    ]
+
+    results = []
+    for label, cached in (("agent[no-cache]", False), ("agent[nl-sql-cache]", True)):
+        pool = AgentPool(size=concurrency, agent_factory=lambda: StubSqlAgent(db_path, model_latency))
+        agent = CachedSqlAgent(pool, repository=SqlHoldRepository(SQLitePool(db_path, read_only=True)))
+        if not cached:
+            agent.repository = None
+        wall_started = time.perf_counter()
+        batch = await agent.ask_many(questions, concurrency=concurrency)
+        wall_seconds = time.perf_counter() - wall_started
+        cache_counts: Dict[str, int] = {}
+        for result in batch:
+            key = result.response.cache if result.ok else "error"
+            cache_counts[key] = cache_counts.get(key, 0) + 1
+        results.append(summarize(label, [result.elapsed for result in batch], wall_seconds, answers=cache_counts))
+    return results
+
+
+def _dict_records(rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+    """HoldRow 이전의 rows_to_records: 행마다 dict, 반복 문자열 공유 없음 (비교 기준)"""
+    at = {column: HOLD_COLUMNS.index(column) for column in HOLD_COLUMNS}
+    records = []
+    for row in rows:
+        reason = row[at["HOLD_REASON"]] or row[at["HOLD_LOOKUP_CODE"]] or ""
+        records.append({
+            "id": str(row[at["INVOICE_ID"]]),
+            "status": "holding",
+            "reason": reason,
+            "hold_lookup_code": row[at["HOLD_LOOKUP_CODE"]],
+            "org_id": row[at["ORG_ID"]],
+            "hold_date": str(row[at["HOLD_DATE"]])[:10] if row[at["HOLD_DATE"]] else None,
+            "detail": row[at["HOLD_DETAILS"]] or "",
+            "search_query": f"{reason} 처리 절차",
+            "hold_id": row[at["HOLD_ID"]],
+        })
+    return records
+
+
+def _retained_bytes(fetch: Callable[[], Sequence[tuple]], convert: Callable[[Sequence[tuple]], list]) -> Tuple[int, int, int]:
+    """DB 행을 읽어 레코드로 바꾼 뒤 원본 행을 버렸을 때 남는 메모리, 최대 할당량, 레코드 수"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        rows = fetch()
+        records = convert(rows)
+        del rows
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return retained, peak, len(records)
+
+
+def bench_records(db_path: str, record_rows: int, iterations: int) -> List[Dict[str, Any]]:
+    """레코드 표현별 홀딩 1건당 유지 메모리와 페이지(50건) 단위 생성 + 응답 직렬화 비용을 잽니다."""
+    import hold_resolve_mcp
+    from hold_resolve_mcp import HoldingReasonDetail, HoldingReasonDetailPage
+    from payload_compaction import dumps
+
+    columns = ", ".join(HOLD_COLUMNS)
+    connection = sqlite3.connect(db_path)
+    try:
+        def fetch() -> List[tuple]:
+            return connection.execute(
+                f"SELECT {columns} FROM ap_holds_all WHERE RELEASE_LOOKUP_CODE IS NULL ORDER BY HOLD_ID LIMIT ?",
+                (record_rows,),
+            ).fetchall()
+
+        rows = fetch()
+        memory = {label: _retained_bytes(fetch, convert) for label, convert in (("dict+pydantic", _dict_records), ("slots", rows_to_records))}
+    finally:
+        connection.close()
+
+    def emit_pydantic(page_rows: Sequence[tuple]) -> str:
+        # 이전 경로: dict 레코드 → 항목마다 검증된 Pydantic 모델 → model_dump / model_dump_json
+        page = HoldingReasonDetailPage(items=[
+            HoldingReasonDetail(
+                invoice_id=record["id"], reason=record["reason"],
+                detail=record.get("detail", ""), search_query=record.get("search_query", "")
+            )
+            for record in _dict_records(page_rows)
+        ], next_cursor=None)
+        page.model_dump(mode="json")
+        return page.model_dump_json()
+
+    def emit_slots(page_rows: Sequence[tuple]) -> str:
+        # 현재 경로: HoldRow → 응답 dict (검증 없음) → JSON
+        return dumps({"items": [hold_resolve_mcp._reason_detail_item(record) for record in rows_to_records(page_rows)],
+                      "next_cursor": None})
+
+    pages = [rows[start:start + RECORD_PAGE_SIZE] for start in range(0, len(rows), RECORD_PAGE_SIZE)]
+    same_output = bool(pages) and emit_pydantic(pages[0]) == emit_slots(pages[0])
+    results = []
+    for label, emit in (("dict+pydantic", emit_pydantic), ("slots", emit_slots)):
+        latencies: List[float] = []
+        wall_started = time.perf_counter()
+        for index in range(iterations):
+            started = time.perf_counter()
+            emit(pages[index % len(pages)])
+            latencies.append(time.perf_counter() - started)
+        wall_seconds = time.perf_counter() - wall_started
+        retained, peak, count = memory[label]
+        results.append(summarize(
+            f"records[{label}]", latencies, wall_seconds, peak,
+            records_per_s=round(sum(len(pages[index % len(pages)]) for index in range(iterations)) / wall_seconds, 1),
+            bytes_per_hold=round(retained / count, 1) if count else 0.0,
+            same_output=same_output,
+        ))
+    return results
+
+
+def parse_importtime(stderr: str, top: int = 5) -> List[Tuple[str, float]]:
+    """-X importtime 출력에서 최상위 패키지별 자체(self) import 시간 합계(ms) 상위 top 개를 반환합니다."""
+    totals: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        package = parts[2].strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(parts[0])
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [(package, round(microseconds / 1000, 1)) for package, microseconds in ranked]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_server_ready(timeout: float = READY_TIMEOUT_SECONDS) -> float:
+    """hold_resolve_mcp.py 를 새 프로세스로 띄워 /ready 가 200 을 돌려줄 때까지의 시간(초)을 잽니다."""
+    port = _free_port()
+    env = dict(os.environ, MCP_PORT=str(port), HOT_RELOAD_INTERVAL="0")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_DIR, "hold_resolve_mcp.py")],
+        cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"hold_resolve_mcp.py exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"/ready did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def bench_startup(iterations: int) -> List[Dict[str, Any]]:
+    """모듈별 새 프로세스 import 시간(-X importtime)과 서버 기동 → /ready 시간을 잽니다."""
+    results = []
+    for module in STARTUP_MODULES:
+        latencies: List[float] = []
+        stderr = ""
+        for _ in range(iterations):
+            started = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                cwd=PROJECT_DIR, capture_output=True, text=True,
+            )
+            elapsed = time.perf_counter() - started
+            if completed.returncode != 0:
+                results.append({"name": f"startup[import {module}]", "error": completed.stderr.strip().splitlines()[-1]})
+                break
+            latencies.append(elapsed)
+            stderr = completed.stderr
+        else:
+            heaviest = ", ".join(f"{package} {ms}ms" for package, ms in parse_importtime(stderr))
+            results.append(summarize(f"startup[import {module}]", latencies, sum(latencies), heaviest=heaviest))
+
+    ready = [measure_server_ready() for _ in range(iterations)]
+    results.append(summarize("startup[server ready]", ready, sum(ready)))
+    return results
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'name':40} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'peak KiB':>9}")
+    for result in results:
+        if "p50_ms" not in result:
+            print(f"{result['name']:40} " + ", ".join(f"{k}={v}" for k, v in result.items() if k != "name"))
+            continue
+        print(f"{result['name']:40} {result['calls']:>6} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+              f"{result['p99_ms']:>9} {result['throughput_per_s']:>9} {result['peak_alloc_kib']:>9}"
+              + (f"  {result['answers']}" if "answers" in result else "")
+              + (f"  {result['heaviest']}" if "heaviest" in result else "")
+              + (f"  {result['records_per_s']} rec/s, {result['bytes_per_hold']} B/hold" if "bytes_per_hold" in result else ""))
+
+
+def compare_with_baseline(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> List[str]:
+    """p95 가 기준 결과보다 threshold 비율 이상 느려진 항목을 반환합니다."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous and "p95_ms" in result and previous.get("p95_ms"):
+            if result["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+                regressions.append(f"{result['name']}: p95 {previous['p95_ms']}ms → {result['p95_ms']}ms")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AP 홀딩 MCP 도구 / SQL 에이전트 벤치마크")
+    parser.add_argument("suite", nargs="?", choices=["tools", "agent", "records", "all", "startup"], default="all")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite 대체 DB 경로")
+    parser.add_argument("--rows", type=int, default=10_000, help="AP_HOLDS_ALL 합성 행 수 (10k ~ 10M)")
+    parser.add_argument("--reseed", action="store_true", help="DB 가 있어도 다시 적재")
+    parser.add_argument("--record-rows", type=int, default=100_000, help="records: 메모리를 잴 열린 홀딩 수")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--memory-iterations", type=int, default=20)
+    parser.add_argument("--response-cache", action="store_true", help="MCP 응답 캐시를 켠 상태로 측정")
+    parser.add_argument("--concurrency", type=int, default=4, help="agent 동시 실행 수")
+    parser.add_argument("--model-latency", type=float, default=0.05, help="스텁 LLM 지연(초)")
+    parser.add_argument("--repeat-ratio", type=float, default=0.6, help="agent 반복 질문 비율")
+    parser.add_argument("--json", dest="json_path", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="p95 회귀 허용 비율")
+    parser.add_argument("--startup-budget", type=float, help="startup: 서버 /ready p50 허용 시간(초), 넘으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = []
+    if args.suite == "startup":
+        results += bench_startup(args.iterations)
+        print_table(results)
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump({"results": results}, f, ensure_ascii=False, indent=2)
+        ready_ms = results[-1]["p50_ms"]
+        if args.startup_budget is not None and ready_ms > args.startup_budget * 1000:
+            print(f"⚠️  기동 시간 예산 초과: /ready p50 {ready_ms}ms > {args.startup_budget * 1000:.0f}ms")
+            return 1
+        return 0
+
+    existing_rows = None
+    if os.path.exists(args.db) and not args.reseed:
+        existing_rows = sqlite3.connect(args.db).execute("SELECT COUNT(*) FROM ap_holds_all").fetchone()[0]
+    if existing_rows != args.rows:
+        seeded = seed_benchmark_db(args.db, args.rows)
+        results.append({"name": "seed", **seeded})
+
+    if args.suite in ("tools", "all"):
+        results += asyncio.run(bench_tools(args.db, args.iterations, args.memory_iterations, args.response_cache))
+    if args.suite in ("agent", "all"):
+        results += asyncio.run(bench_agent(args.db, args.iterations, args.concurrency, args.model_latency, args.repeat_ratio))
+    if args.suite in ("records", "all"):
+        results += bench_records(args.db, args.record_rows, args.iterations)
+    results.append({"name": "process", "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)})
+
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "results": results}, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.threshold)
+        for regression in regressions:
+            print(f"⚠️  회귀: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+DB 기반 홀딩 데이터 소스 (AP_HOLDS_ALL)
+
+hold_resolve_mcp 의 HoldRepository 를 실제 EBS 테이블(AP_HOLDS_ALL)로 구현합니다.
+
+- 커넥션 풀: Oracle 은 python-oracledb 풀, 로컬/테스트는 SQLite 대체 풀
+- 고정된 파라미터 바인딩 쿼리만 사용 (sqltool_call.INLINE_ICL_EXAMPLES 와 같은 컬럼 목록)
+  → SQL 텍스트가 항상 같으므로 드라이버의 statement cache 가 재사용됩니다.
+- arraysize(fetch_size) 조정 가능, 행 → 레코드 변환은 페이지 단위로 일괄 처리
+- 풀은 스레드 안전하므로 이벤트 루프를 막지 않도록 워커 스레드에서 호출할 수 있습니다.
+- Oracle(EBS) 저장소는 읽기 전용입니다. AP_HOLDS_ALL 의 홀딩 생성/해제는 AP 홀드 API 로만 해야 하므로
+  add/release(델타 로그 포함)는 SQLite 대체 DB 에서만 허용합니다.
+
+환경 변수 HOLD_DATA_SOURCE 로 선택합니다.
+    mock (기본값)              : hold_mock_data 의 Mock 데이터
+    sqlite:///path/to/holds.db : SQLite 대체 DB
+    snapshot:///path/to/dir    : 메모리 매핑 컬럼 스냅숏 (hold_snapshot.py, numpy 필요)
+    oracle                     : ORACLE_USER / ORACLE_PASSWORD / ORACLE_DSN 으로 접속
+
+NL→SQL 캐시(sqltool_call.CachedSqlAgent)가 기억한 SQL 은 이 저장소가 아니라 SQL_TOOL_DATA_SOURCE 의
+읽기 전용 연결(SQL 도구와 같은 계정)에서 실행합니다 (create_sql_tool_repository_from_env).
+
+SQLite 대체 DB 생성:
+    python hold_datasource.py seed-sqlite holds.db
+"""
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from hold_store import (
+    HoldRecord, HoldRepository, HoldRow, InvalidCursorError, ReadOnlyRepositoryError, check_date_filter, clamp_page_size,
+    decode_cursor, default_search_query, encode_cursor, intern_text,
+)
+
+DEFAULT_FETCH_SIZE = 500
+DEFAULT_POOL_MIN = 1
+DEFAULT_POOL_MAX = 8
+
+# INLINE_ICL_EXAMPLES 의 "get invoice holding list" 와 같은 컬럼 목록
+HOLD_COLUMNS = [
+    "INVOICE_ID", "LINE_LOCATION_ID", "HOLD_LOOKUP_CODE", "LAST_UPDATE_DATE", "LAST_UPDATED_BY",
+    "HELD_BY", "HOLD_DATE", "HOLD_REASON", "RELEASE_LOOKUP_CODE", "RELEASE_REASON", "ORG_ID",
+    "RESPONSIBILITY_ID", "RCV_TRANSACTION_ID", "HOLD_DETAILS", "LINE_NUMBER", "HOLD_ID",
+    "WF_STATUS", "VALIDATION_REQUEST_ID",
+]
+_SELECT = "SELECT " + ", ".join(f"aha.{column}" for column in HOLD_COLUMNS) + " FROM ap_holds_all aha"
+
+# 레코드의 사유: rows_to_records 와 같이 HOLD_REASON 이 비어 있으면 HOLD_LOOKUP_CODE 로 대체
+_REASON_EXPR = "COALESCE(NULLIF(aha.HOLD_REASON, ''), aha.HOLD_LOOKUP_CODE)"
+
+# 열린(해제되지 않은) 홀딩 + 선택적 필터. 바인드 값이 NULL 이면 해당 조건은 무시됩니다.
+# 사유 필터는 응답 레코드에 보이는 사유(_REASON_EXPR)와 비교
+_OPEN_HOLD_FILTERS = f"""
+WHERE aha.RELEASE_LOOKUP_CODE IS NULL
+  AND (:reason IS NULL OR {_REASON_EXPR} = :reason)
+  AND (:hold_lookup_code IS NULL OR aha.HOLD_LOOKUP_CODE = :hold_lookup_code)
+  AND (:org_id IS NULL OR aha.ORG_ID = :org_id)"""
+
+# 열린 홀딩의 사유 / ORG_ID / 홀딩일자별 건수 (통계 초기화와 DB 워터마크 변경 시 재집계용)
+# LAST_UPDATE_DATE 는 초 단위이므로, 같은 초 안의 해제도 잡히도록 열린 홀딩 수를 함께 봄
+_WATERMARK = """
+SELECT MAX(aha.LAST_UPDATE_DATE), COUNT(*), SUM(CASE WHEN aha.RELEASE_LOOKUP_CODE IS NULL THEN 1 ELSE 0 END)
+  FROM ap_holds_all aha"""
+
+_COUNT_BY_REASON = f"""
+SELECT {_REASON_EXPR}, COUNT(*) FROM ap_holds_all aha
+WHERE aha.RELEASE_LOOKUP_CODE IS NULL
+GROUP BY {_REASON_EXPR}"""
+_COUNT_BY_ORG = """
+SELECT aha.ORG_ID, COUNT(*) FROM ap_holds_all aha
+WHERE aha.RELEASE_LOOKUP_CODE IS NULL AND aha.ORG_ID IS NOT NULL
+GROUP BY aha.ORG_ID"""
+_COUNT_BY_DATE = """
+SELECT {day}, COUNT(*) FROM ap_holds_all aha
+WHERE aha.RELEASE_LOOKUP_CODE IS NULL AND aha.HOLD_DATE IS NOT NULL
+GROUP BY {day}"""
+
+# ID 추천용: INVOICE_ID 인덱스 범위 스캔으로 key 이상 / 미만의 열린 홀딩 인보이스 ID 를 가까운 순으로 {limit}개
+_IDS_FROM = """
+SELECT DISTINCT aha.INVOICE_ID FROM ap_holds_all aha
+WHERE aha.INVOICE_ID >= :invoice_id AND aha.RELEASE_LOOKUP_CODE IS NULL
+ORDER BY aha.INVOICE_ID
+{limit}"""
+_IDS_BEFORE = """
+SELECT DISTINCT aha.INVOICE_ID FROM ap_holds_all aha
+WHERE aha.INVOICE_ID < :invoice_id AND aha.RELEASE_LOOKUP_CODE IS NULL
+ORDER BY aha.INVOICE_ID DESC
+{limit}"""
+
+QUERIES: Dict[str, Dict[str, str]] = {
+    "oracle": {
+        "get": _SELECT + """
+WHERE aha.INVOICE_ID = :invoice_id AND aha.RELEASE_LOOKUP_CODE IS NULL
+ORDER BY aha.HOLD_ID
+FETCH FIRST 1 ROWS ONLY""",
+        "page": _SELECT + _OPEN_HOLD_FILTERS + """
+  AND (:hold_date_from IS NULL OR aha.HOLD_DATE >= TO_DATE(:hold_date_from, 'YYYY-MM-DD'))
+  AND (:hold_date_to IS NULL OR aha.HOLD_DATE < TO_DATE(:hold_date_to, 'YYYY-MM-DD') + 1)
+  AND aha.HOLD_ID > :after_hold_id
+ORDER BY aha.HOLD_ID
+FETCH FIRST :page_limit ROWS ONLY""",
+        "count": "SELECT COUNT(*) FROM ap_holds_all aha WHERE aha.RELEASE_LOOKUP_CODE IS NULL",
+        "ping": "SELECT 1 FROM dual",
+        "watermark": _WATERMARK,
+        "count_by_reason": _COUNT_BY_REASON,
+        "count_by_org": _COUNT_BY_ORG,
+        "count_by_date": _COUNT_BY_DATE.format(day="TO_CHAR(aha.HOLD_DATE, 'YYYY-MM-DD')"),
+        "ids_from": _IDS_FROM.format(limit="FETCH FIRST :id_limit ROWS ONLY"),
+        "ids_before": _IDS_BEFORE.format(limit="FETCH FIRST :id_limit ROWS ONLY"),
+    },
+    "sqlite": {
+        "get": _SELECT + """
+WHERE aha.INVOICE_ID = :invoice_id AND aha.RELEASE_LOOKUP_CODE IS NULL
+ORDER BY aha.HOLD_ID
+LIMIT 1""",
+        "page": _SELECT + _OPEN_HOLD_FILTERS + """
+  AND (:hold_date_from IS NULL OR aha.HOLD_DATE >= :hold_date_from)
+  AND (:hold_date_to IS NULL OR aha.HOLD_DATE < date(:hold_date_to, '+1 day'))
+  AND aha.HOLD_ID > :after_hold_id
+ORDER BY aha.HOLD_ID
+LIMIT :page_limit""",
+        "count": "SELECT COUNT(*) FROM ap_holds_all aha WHERE aha.RELEASE_LOOKUP_CODE IS NULL",
+        "ping": "SELECT 1",
+        "watermark": _WATERMARK,
+        "count_by_reason": _COUNT_BY_REASON,
+        "count_by_org": _COUNT_BY_ORG,
+        "count_by_date": _COUNT_BY_DATE.format(day="substr(aha.HOLD_DATE, 1, 10)"),
+        "ids_from": _IDS_FROM.format(limit="LIMIT :id_limit"),
+        "ids_before": _IDS_BEFORE.format(limit="LIMIT :id_limit"),
+        "insert": """
+INSERT INTO ap_holds_all (INVOICE_ID, HOLD_LOOKUP_CODE, HOLD_REASON, HOLD_DATE, ORG_ID, HOLD_DETAILS,
+                          LAST_UPDATE_DATE, CREATION_DATE)
+VALUES (:invoice_id, :hold_lookup_code, :reason, :hold_date, :org_id, :detail,
+        datetime('now'), datetime('now'))""",
+        "release_rows": _SELECT + """
+WHERE aha.INVOICE_ID = :invoice_id AND aha.RELEASE_LOOKUP_CODE IS NULL
+ORDER BY aha.HOLD_ID""",
+        "release": """
+UPDATE ap_holds_all
+   SET RELEASE_LOOKUP_CODE = :release_lookup_code, RELEASE_REASON = :release_reason, LAST_UPDATE_DATE = datetime('now')
+ WHERE INVOICE_ID = :invoice_id AND RELEASE_LOOKUP_CODE IS NULL AND HOLD_ID <= :max_hold_id""",
+    },
+}
+
+# SQLite 대체 DB 스키마 (sqltool_call.INLINE_DATABASE_SCHEMA 의 AP_HOLDS_ALL 과 같은 컬럼)
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ap_holds_all (
+    INVOICE_ID TEXT NOT NULL,
+    LINE_LOCATION_ID INTEGER,
+    HOLD_LOOKUP_CODE TEXT,
+    LAST_UPDATE_DATE TEXT,
+    LAST_UPDATED_BY INTEGER,
+    HELD_BY INTEGER,
+    HOLD_DATE TEXT,
+    HOLD_REASON TEXT,
+    RELEASE_LOOKUP_CODE TEXT,
+    RELEASE_REASON TEXT,
+    STATUS_FLAG TEXT,
+    LAST_UPDATE_LOGIN INTEGER,
+    CREATION_DATE TEXT,
+    CREATED_BY INTEGER,
+    ATTRIBUTE_CATEGORY TEXT,
+    ATTRIBUTE15 TEXT,
+    ORG_ID INTEGER,
+    RESPONSIBILITY_ID INTEGER,
+    RCV_TRANSACTION_ID INTEGER,
+    HOLD_DETAILS TEXT,
+    LINE_NUMBER INTEGER,
+    HOLD_ID INTEGER PRIMARY KEY,
+    WF_STATUS TEXT,
+    VALIDATION_REQUEST_ID INTEGER
+);
+CREATE INDEX IF NOT EXISTS ap_holds_all_n1 ON ap_holds_all (INVOICE_ID);
+CREATE INDEX IF NOT EXISTS ap_holds_all_n2 ON ap_holds_all (HOLD_LOOKUP_CODE, HOLD_ID);
+CREATE INDEX IF NOT EXISTS ap_holds_all_n3 ON ap_holds_all (ORG_ID, HOLD_ID);
+CREATE INDEX IF NOT EXISTS ap_holds_all_n4 ON ap_holds_all (HOLD_DATE);
+"""
+
+
+class ConnectionPool(ABC):
+    """DB 커넥션 풀 인터페이스"""
+
+    dialect: str
+    # True 면 DB 수준에서 쓰기를 막은 연결만 내어줌 (LLM 이 생성한 SQL 실행용)
+    read_only = False
+
+    @abstractmethod
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """풀에서 커넥션을 빌려오고 블록이 끝나면 반납합니다."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """풀의 모든 커넥션을 닫습니다."""
+
+
+class OraclePool(ConnectionPool):
+    """python-oracledb 커넥션 풀 (statement cache 포함)"""
+
+    dialect = "oracle"
+
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        dsn: str,
+        min_size: int = DEFAULT_POOL_MIN,
+        max_size: int = DEFAULT_POOL_MAX,
+        stmtcachesize: int = 40,
+        read_only: bool = False,
+    ) -> None:
+        try:
+            import oracledb
+        except ImportError as e:
+            raise ImportError("Oracle 데이터 소스를 사용하려면 'uv sync --extra oracle' 가 필요합니다.") from e
+        self._pool = oracledb.create_pool(
+            user=user, password=password, dsn=dsn,
+            min=min_size, max=max_size, increment=1,
+            stmtcachesize=stmtcachesize,
+        )
+        self.read_only = read_only
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        connection = self._pool.acquire()
+        try:
+            if self.read_only:
+                # SELECT 안에서 호출한 PL/SQL 함수의 DML 도 ORA-01456 으로 막힘
+                with connection.cursor() as cursor:
+                    cursor.execute("SET TRANSACTION READ ONLY")
+            yield connection
+        finally:
+            if self.read_only:
+                connection.rollback()
+            self._pool.release(connection)
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+class SQLitePool(ConnectionPool):
+    """SQLite 대체 DB 용 고정 크기 커넥션 풀"""
+
+    dialect = "sqlite"
+
+    def __init__(self, path: str, max_size: int = DEFAULT_POOL_MAX, read_only: bool = False) -> None:
+        self.path = path
+        self.read_only = read_only
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False, cached_statements=64)
+        connection = sqlite3.connect(self.path, check_same_thread=False, cached_statements=64)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self._max_size
+                if can_create:
+                    self._created += 1
+            connection = self._connect() if can_create else self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _format_date(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+def rows_to_records(rows: Iterable[Tuple]) -> List[HoldRow]:
+    """AP_HOLDS_ALL 행(HOLD_COLUMNS 순서)을 저장소 레코드로 일괄 변환합니다 (반복 문자열은 intern)."""
+    invoice_id_at = HOLD_COLUMNS.index("INVOICE_ID")
+    code_at = HOLD_COLUMNS.index("HOLD_LOOKUP_CODE")
+    reason_at = HOLD_COLUMNS.index("HOLD_REASON")
+    org_at = HOLD_COLUMNS.index("ORG_ID")
+    date_at = HOLD_COLUMNS.index("HOLD_DATE")
+    details_at = HOLD_COLUMNS.index("HOLD_DETAILS")
+    hold_id_at = HOLD_COLUMNS.index("HOLD_ID")
+
+    records = []
+    for row in rows:
+        reason = intern_text(row[reason_at] or row[code_at] or "")
+        records.append(HoldRow(
+            str(row[invoice_id_at]),
+            "holding",
+            reason,
+            intern_text(row[code_at]),
+            row[org_at],
+            intern_text(_format_date(row[date_at])),
+            row[details_at] or "",
+            default_search_query(reason),
+            row[hold_id_at],
+        ))
+    return records
+
+
+class SqlHoldRepository(HoldRepository):
+    """
+    AP_HOLDS_ALL 기반 홀딩 저장소
+
+    한 인보이스에 여러 홀딩 행이 있을 수 있으므로, get() 은 가장 먼저 걸린(HOLD_ID 최소) 열린 홀딩을,
+    query() 는 홀딩 행 단위로 HOLD_ID 키셋 페이지네이션을 수행합니다.
+    쓰기(add/release)는 SQLite 대체 DB 에서만 가능하며, Oracle 은 항상 읽기 전용입니다.
+    """
+
+    blocking_io = True
+
+    def __init__(self, pool: ConnectionPool, fetch_size: int = DEFAULT_FETCH_SIZE) -> None:
+        super().__init__()
+        self.pool = pool
+        self.fetch_size = fetch_size
+        self._queries = QUERIES[pool.dialect]
+        self.read_only = pool.read_only or "insert" not in self._queries
+
+    def _fetch(self, sql: str, binds: Dict[str, Any], limit: Optional[int] = None) -> List[Tuple]:
+        with self.pool.acquire() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.arraysize = self.fetch_size if limit is None else min(self.fetch_size, limit + 1)
+                if self.pool.dialect == "oracle":
+                    cursor.prefetchrows = cursor.arraysize + 1
+                cursor.execute(sql, binds)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def _execute(self, sql: str, binds: Dict[str, Any]) -> int:
+        with self.pool.acquire() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql, binds)
+                connection.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+    def __len__(self) -> int:
+        return self._fetch(self._queries["count"], {})[0][0]
+
+    def ping(self) -> bool:
+        return self._fetch(self._queries["ping"], {})[0][0] == 1
+
+    def last_update_watermark(self) -> str:
+        """
+        AP_HOLDS_ALL 의 MAX(LAST_UPDATE_DATE) + 행 수 + 열린 홀딩 수.
+        삽입/해제(LAST_UPDATE_DATE 갱신)/삭제 시 값이 바뀌므로 결과 캐시 무효화 기준으로 사용합니다.
+        """
+        last_update, count, open_count = self._fetch(self._queries["watermark"], {})[0]
+        return f"{last_update}|{count}|{open_count}"
+
+    def aggregate_counts(self) -> Dict[str, Dict[Any, int]]:
+        """열린 홀딩의 사유 / ORG_ID / 홀딩일자별 건수를 GROUP BY 로 집계합니다 (행을 가져오지 않음)."""
+        counts: Dict[str, Dict[Any, int]] = {"reason": {}, "org_id": {}, "hold_date": {}}
+        for key, query in (("reason", "count_by_reason"), ("org_id", "count_by_org"), ("hold_date", "count_by_date")):
+            bucket = counts[key]
+            for value, count in self._fetch(self._queries[query], {}):
+                if key == "reason":
+                    value = intern_text(value or "")
+                elif key == "org_id":
+                    value = int(value)
+                bucket[value] = bucket.get(value, 0) + count
+        return counts
+
+    def select(self, sql: str, binds: Optional[Dict[str, Any]] = None, max_rows: int = DEFAULT_FETCH_SIZE) -> Tuple[List[str], List[Tuple]]:
+        """읽기 전용 SELECT 를 실행하고 (컬럼 이름 목록, 최대 max_rows 행) 을 반환합니다."""
+        with self.pool.acquire() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.arraysize = min(self.fetch_size, max_rows)
+                cursor.execute(sql, binds or {})
+                columns = [description[0] for description in cursor.description or []]
+                return columns, cursor.fetchmany(max_rows)
+            finally:
+                cursor.close()
+
+    def _invoice_id_bind(self, invoice_id: str) -> Optional[Any]:
+        """
+        INVOICE_ID 바인드 값. EBS 의 INVOICE_ID 는 NUMBER 이므로 Oracle 에서는 숫자로 바꾸고,
+        숫자가 아닌 ID("INV-999" 등)는 None (조회하면 ORA-01722 가 나므로 조회 없이 "없음" 처리)
+        """
+        if self.pool.dialect != "oracle":
+            return invoice_id
+        text = str(invoice_id).strip()
+        return int(text) if text.isascii() and text.isdigit() else None
+
+    def nearby_ids(self, key: str, k: int) -> List[str]:
+        """INVOICE_ID 인덱스에서 key 앞뒤의 열린 홀딩 ID 를 조회합니다 (Oracle 은 숫자 순서)."""
+        bind = self._invoice_id_bind(key)
+        if k <= 0 or bind is None:
+            return []
+        ids = []
+        for query in ("ids_from", "ids_before"):
+            rows = self._fetch(self._queries[query], {"invoice_id": bind, "id_limit": k}, limit=k)
+            ids.extend(str(row[0]) for row in rows)
+        return ids
+
+    def get(self, invoice_id: str) -> Optional[HoldRow]:
+        bind = self._invoice_id_bind(invoice_id)
+        if bind is None:
+            return None
+        rows = self._fetch(self._queries["get"], {"invoice_id": bind}, limit=1)
+        return rows_to_records(rows)[0] if rows else None
+
+    def query(
+        self,
+        reason: Optional[str] = None,
+        hold_lookup_code: Optional[str] = None,
+        org_id: Optional[int] = None,
+        hold_date_from: Optional[str] = None,
+        hold_date_to: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> Tuple[List[HoldRow], Optional[str]]:
+        limit = clamp_page_size(page_size)
+        check_date_filter("hold_date_from", hold_date_from)
+        check_date_filter("hold_date_to", hold_date_to)
+        after_hold_id = 0
+        if cursor:
+            try:
+                after_hold_id = int(decode_cursor(cursor)[0])
+            except ValueError as e:
+                raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+        # 다음 페이지 존재 여부를 알기 위해 limit + 1 건을 조회
+        rows = self._fetch(self._queries["page"], {
+            "reason": reason,
+            "hold_lookup_code": hold_lookup_code,
+            "org_id": org_id,
+            "hold_date_from": hold_date_from,
+            "hold_date_to": hold_date_to,
+            "after_hold_id": after_hold_id,
+            "page_limit": limit + 1,
+        }, limit=limit)
+        records = rows_to_records(rows[:limit])
+        next_cursor = encode_cursor((records[-1]["hold_id"],)) if len(rows) > limit else None
+        return records, next_cursor
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise ReadOnlyRepositoryError(
+                f"{self.pool.dialect} AP_HOLDS_ALL is read-only; create/release holds through the AP hold APIs"
+            )
+
+    def add(self, record: HoldRecord) -> None:
+        self._check_writable()
+        if self.get(record["id"]) is not None:
+            self.release(record["id"])
+        self._execute(self._queries["insert"], {
+            "invoice_id": record["id"],
+            "hold_lookup_code": record.get("hold_lookup_code"),
+            "reason": record["reason"],
+            "hold_date": record.get("hold_date"),
+            "org_id": record.get("org_id"),
+            "detail": record.get("detail"),
+        })
+        self._notify_add(record)
+
+    def release(self, invoice_id: str) -> Optional[HoldRow]:
+        """인보이스의 열린 홀딩 행을 모두 해제하고, 행마다 해제 이벤트를 보냅니다 (반환값은 get() 과 같은 첫 행)."""
+        self._check_writable()
+        records = rows_to_records(self._fetch(self._queries["release_rows"], {"invoice_id": invoice_id}))
+        if not records:
+            return None
+        self._execute(self._queries["release"], {
+            "invoice_id": invoice_id,
+            # 조회 후 새로 걸린 홀딩은 알림 대상이 아니므로 해제하지 않음
+            "max_hold_id": records[-1]["hold_id"],
+            "release_lookup_code": "RELEASED",
+            "release_reason": "Released by hold_resolve_mcp",
+        })
+        # 통계는 홀딩 행 단위로 집계하므로 (len() 과 같이) 해제한 행 수만큼 알림
+        for record in records:
+            self._notify_release(record)
+        return records[0]
+
+
+def seed_sqlite_standin(path: str, records: Iterable[HoldRecord]) -> int:
+    """SQLite 대체 DB에 AP_HOLDS_ALL 테이블을 만들고 레코드를 일괄 적재합니다."""
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(SQLITE_SCHEMA)
+        rows = [
+            (record["id"], record.get("hold_lookup_code"), record["reason"], record.get("hold_date"),
+             record.get("org_id"), record.get("detail"))
+            for record in records
+        ]
+        connection.executemany(
+            """INSERT INTO ap_holds_all (INVOICE_ID, HOLD_LOOKUP_CODE, HOLD_REASON, HOLD_DATE, ORG_ID, HOLD_DETAILS,
+                                         LAST_UPDATE_DATE, CREATION_DATE)
+               VALUES (?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))""",
+            rows,
+        )
+        connection.commit()
+        return len(rows)
+    finally:
+        connection.close()
+
+
+def create_repository_from_env() -> Optional[HoldRepository]:
+    """HOLD_DATA_SOURCE 환경 변수에 맞는 저장소를 만듭니다. mock(기본값)이면 None."""
+    source = os.getenv("HOLD_DATA_SOURCE", "mock")
+    fetch_size = int(os.getenv("HOLD_DB_FETCH_SIZE", str(DEFAULT_FETCH_SIZE)))
+    pool_max = int(os.getenv("HOLD_DB_POOL_MAX", str(DEFAULT_POOL_MAX)))
+
+    if source == "mock":
+        return None
+    if source.startswith("sqlite:///"):
+        return SqlHoldRepository(SQLitePool(source[len("sqlite:///"):], max_size=pool_max), fetch_size=fetch_size)
+    if source.startswith("snapshot:///"):
+        from hold_snapshot import SnapshotHoldRepository
+
+        return SnapshotHoldRepository(source[len("snapshot:///"):])
+    if source == "oracle":
+        pool = OraclePool(
+            user=os.environ["ORACLE_USER"],
+            password=os.environ["ORACLE_PASSWORD"],
+            dsn=os.environ["ORACLE_DSN"],
+            min_size=int(os.getenv("HOLD_DB_POOL_MIN", str(DEFAULT_POOL_MIN))),
+            max_size=pool_max,
+        )
+        return SqlHoldRepository(pool, fetch_size=fetch_size)
+    raise ValueError(f"Unknown HOLD_DATA_SOURCE: {source!r}")
+
+
+def create_sql_tool_repository_from_env() -> Optional[SqlHoldRepository]:
+    """
+    NL→SQL 캐시가 기억한 SQL 을 실행할 읽기 전용 저장소를 만듭니다. SQL_TOOL_DATA_SOURCE 가 없으면 None.
+
+    SQL 도구(DB_TOOL_CONNECTION_ID)와 같은 읽기 전용 계정으로 접속하며, MCP 서버의 HOLD_DATA_SOURCE 와는 별개입니다.
+        oracle                     : SQL_TOOL_ORACLE_USER / SQL_TOOL_ORACLE_PASSWORD / SQL_TOOL_ORACLE_DSN (READ ONLY 트랜잭션)
+        sqlite:///path/to/holds.db : 로컬 테스트 (mode=ro 로 열기)
+    """
+    source = os.getenv("SQL_TOOL_DATA_SOURCE")
+    fetch_size = int(os.getenv("HOLD_DB_FETCH_SIZE", str(DEFAULT_FETCH_SIZE)))
+    pool_max = int(os.getenv("SQL_TOOL_DB_POOL_MAX", str(DEFAULT_POOL_MAX)))
+
+    if not source:
+        return None
+    if source.startswith("sqlite:///"):
+        pool = SQLitePool(source[len("sqlite:///"):], max_size=pool_max, read_only=True)
+        return SqlHoldRepository(pool, fetch_size=fetch_size)
+    if source == "oracle":
+        pool = OraclePool(
+            user=os.environ["SQL_TOOL_ORACLE_USER"],
+            password=os.environ["SQL_TOOL_ORACLE_PASSWORD"],
+            dsn=os.environ["SQL_TOOL_ORACLE_DSN"],
+            min_size=1,
+            max_size=pool_max,
+            read_only=True,
+        )
+        return SqlHoldRepository(pool, fetch_size=fetch_size)
+    raise ValueError(f"Unknown SQL_TOOL_DATA_SOURCE: {source!r}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "seed-sqlite":
+        print("사용법: python hold_datasource.py seed-sqlite <holds.db>")
+        sys.exit(1)
+
+    from hold_mock_data import create_mock_repository
+
+    mock = create_mock_repository()
+    count = seed_sqlite_standin(sys.argv[2], mock.iter_records())
+    print(f"✅ {sys.argv[2]} 에 {count}건의 홀딩을 적재했습니다.")
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+대규모 합성 홀딩 데이터 생성기 (AP_HOLDS_ALL 컬럼 구성)
+
+Mock 데이터(10건)로는 드러나지 않는 규모 문제를 재현하기 위해, NumPy 로 수백만 건의
+현실적인 홀딩을 청크 단위로 벡터화 생성하여 컬럼 파일로 저장합니다.
+
+- 컬럼: hold_datasource.HOLD_COLUMNS (INLINE_ICL_EXAMPLES 의 AP_HOLDS_ALL 선택 컬럼)
+- 분포: 사유는 롱테일(1/rank^s), ORG_ID 는 가중치, 홀딩 일자는 최근으로 치우침, 인보이스당 홀딩 1~3건,
+  약 20% 는 해제(RELEASE_LOOKUP_CODE) 상태
+- 저장 형식 (디렉터리, 서버가 np.load(mmap_mode="r") 로 지연 로딩 가능):
+    meta.json                       : 행 수, 컬럼 목록/타입, 사전(dictionary) 값
+    <COLUMN>.npy                    : 숫자(int64, NULL=-1) / 날짜(datetime64[D], NULL=NaT)
+    <COLUMN>.codes.npy + 사전       : 카디널리티가 낮은 문자열 (uint16, 0=NULL)
+    <COLUMN>.bin + .offsets.npy     : 카디널리티가 높은 문자열 (UTF-8 연결 + int64 오프셋 n+1개)
+  pyarrow 가 설치되어 있으면 --format parquet 로 단일 Parquet 파일도 만들 수 있습니다.
+
+사용법:
+    python hold_generator.py data/holds_1m --rows 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # 생성기/스냅숏 기능에만 필요
+    np = None
+
+from hold_datasource import HOLD_COLUMNS
+
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_ROWS = 1_000_000
+DEFAULT_START_DATE = "2023-01-01"
+DEFAULT_DAYS = 730
+
+# 컬럼 저장 방식
+DICTIONARY_COLUMNS = ["HOLD_LOOKUP_CODE", "HOLD_REASON", "RELEASE_LOOKUP_CODE", "RELEASE_REASON", "WF_STATUS"]
+STRING_COLUMNS = ["INVOICE_ID", "HOLD_DETAILS"]
+DATE_COLUMNS = ["LAST_UPDATE_DATE", "HOLD_DATE"]
+INTEGER_COLUMNS = [
+    column for column in HOLD_COLUMNS
+    if column not in DICTIONARY_COLUMNS + STRING_COLUMNS + DATE_COLUMNS
+]
+
+ORG_IDS = [101, 102, 103, 104, 105, 201, 202, 301]
+ORG_WEIGHTS = [30, 25, 15, 10, 8, 6, 4, 2]
+RELEASE_CODES = [None, "RELEASED", "VARIANCE CORRECTED", "QTY ORD RELEASED", "HOLDS QUICK RELEASED"]
+RELEASE_WEIGHTS = [80, 8, 5, 4, 3]
+WF_STATUSES = [None, "MANUALLYRELEASED", "STARTED", "TERMINATED"]
+WF_WEIGHTS = [85, 6, 6, 3]
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise ImportError("합성 데이터 생성/스냅숏 기능을 사용하려면 'uv sync --extra numpy' 가 필요합니다.")
+
+
+def reason_catalog() -> List[Dict[str, str]]:
+    """Mock 데이터의 사유/홀딩 코드/상세/검색어 목록 (생성기의 사유 사전)"""
+    from hold_mock_data import HOLDING_REASON_DETAILS, MOCK_HOLDING_INVOICES
+
+    return [
+        {
+            "reason": invoice["reason"],
+            "hold_lookup_code": invoice["hold_lookup_code"],
+            "detail": HOLDING_REASON_DETAILS[invoice["id"]]["detail"],
+            "search_query": HOLDING_REASON_DETAILS[invoice["id"]]["search_query"],
+        }
+        for invoice in MOCK_HOLDING_INVOICES
+    ]
+
+
+def _weights(values: Sequence[float]) -> "np.ndarray":
+    weights = np.asarray(values, dtype=np.float64)
+    return weights / weights.sum()
+
+
+def iter_hold_chunks(
+    rows: int,
+    seed: int = 42,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    reason_skew: float = 1.2,
+    start_date: str = DEFAULT_START_DATE,
+    days: int = DEFAULT_DAYS,
+    catalog: Optional[List[Dict[str, str]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    AP_HOLDS_ALL 컬럼별 배열 청크를 생성합니다.
+    사전 컬럼은 사전 인덱스(0=NULL) 배열, 문자열 컬럼은 str 리스트, 나머지는 NumPy 배열입니다.
+    """
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    catalog = catalog or reason_catalog()
+    reason_p = _weights([1 / (rank + 1) ** reason_skew for rank in range(len(catalog))])
+    start = np.datetime64(start_date, "D")
+    details = [entry["detail"] for entry in catalog]
+
+    next_hold_id = 1
+    next_invoice = 1
+    while next_hold_id <= rows:
+        size = min(chunk_rows, rows - next_hold_id + 1)
+
+        # 인보이스당 홀딩 1~3건: 인보이스별 건수를 넉넉히 뽑아 펼친 뒤 size 개로 자름
+        per_invoice = rng.choice([1, 2, 3], size=size, p=[0.6, 0.25, 0.15])
+        invoice_numbers = np.repeat(np.arange(next_invoice, next_invoice + size), per_invoice)[:size]
+        next_invoice = int(invoice_numbers[-1]) + 1
+        first_of_invoice = np.r_[True, invoice_numbers[1:] != invoice_numbers[:-1]]
+        invoice_index = np.cumsum(first_of_invoice) - 1
+        invoices = int(invoice_index[-1]) + 1
+
+        # 인보이스 단위 속성 (같은 인보이스의 홀딩은 ORG_ID / 기준 일자 공유), 일자는 최근으로 치우침
+        org_ids = rng.choice(ORG_IDS, size=invoices, p=_weights(ORG_WEIGHTS))[invoice_index]
+        invoice_day = (rng.beta(2.0, 1.2, size=invoices) * (days - 30)).astype(np.int64)[invoice_index]
+        hold_dates = start + invoice_day + rng.integers(0, 30, size=size)
+        update_dates = hold_dates + rng.integers(0, 15, size=size)
+
+        reason_codes = rng.choice(len(catalog), size=size, p=reason_p)
+        release = rng.choice(len(RELEASE_CODES), size=size, p=_weights(RELEASE_WEIGHTS))
+        wf_status = rng.choice(len(WF_STATUSES), size=size, p=_weights(WF_WEIGHTS))
+        hold_ids = np.arange(next_hold_id, next_hold_id + size, dtype=np.int64)
+        po_numbers = rng.integers(1, 10_000_000, size=size)
+        amounts = np.round(rng.lognormal(13.0, 1.2, size=size), -2).astype(np.int64)
+
+        yield {
+            "INVOICE_ID": [f"INV-{number:07d}" for number in invoice_numbers.tolist()],
+            "LINE_LOCATION_ID": rng.integers(1, 5_000_000, size=size),
+            "HOLD_LOOKUP_CODE": reason_codes + 1,
+            "LAST_UPDATE_DATE": update_dates,
+            "LAST_UPDATED_BY": rng.integers(1000, 1200, size=size),
+            "HELD_BY": rng.integers(1000, 1200, size=size),
+            "HOLD_DATE": hold_dates,
+            "HOLD_REASON": reason_codes + 1,
+            "RELEASE_LOOKUP_CODE": release,
+            "RELEASE_REASON": release,
+            "ORG_ID": org_ids,
+            "RESPONSIBILITY_ID": np.where(reason_codes == 4, rng.integers(50000, 50100, size=size), -1),
+            "RCV_TRANSACTION_ID": rng.integers(1, 90_000_000, size=size),
+            "HOLD_DETAILS": [
+                f"{details[code]} (PO-{po:07d}, 금액 ₩{amount:,})"
+                for code, po, amount in zip(reason_codes.tolist(), po_numbers.tolist(), amounts.tolist())
+            ],
+            "LINE_NUMBER": rng.integers(1, 11, size=size),
+            "HOLD_ID": hold_ids,
+            "WF_STATUS": wf_status,
+            "VALIDATION_REQUEST_ID": rng.integers(1, 1_000_000, size=size),
+        }
+        next_hold_id += size
+
+
+def dictionaries(catalog: List[Dict[str, str]]) -> Dict[str, List[Optional[str]]]:
+    """사전 컬럼의 값 목록 (인덱스 0 은 NULL)"""
+    return {
+        "HOLD_LOOKUP_CODE": [None] + [entry["hold_lookup_code"] for entry in catalog],
+        "HOLD_REASON": [None] + [entry["reason"] for entry in catalog],
+        "RELEASE_LOOKUP_CODE": list(RELEASE_CODES),
+        "RELEASE_REASON": [None] + [f"Released: {code}" for code in RELEASE_CODES[1:]],
+        "WF_STATUS": list(WF_STATUSES),
+    }
+
+
+class ColumnWriter:
+    """청크를 컬럼 파일로 이어 쓰고 마지막에 meta.json 을 기록합니다."""
+
+    def __init__(self, path: str, dictionary_values: Dict[str, List[Optional[str]]], extra_meta: Optional[Dict[str, Any]] = None) -> None:
+        require_numpy()
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.dictionary_values = dictionary_values
+        self.extra_meta = extra_meta or {}
+        self.rows = 0
+        self._parts: Dict[str, List[str]] = {column: [] for column in HOLD_COLUMNS}
+        self._blobs = {column: open(os.path.join(path, f"{column}.bin"), "wb") for column in STRING_COLUMNS}
+        self._offsets: Dict[str, List["np.ndarray"]] = {column: [np.zeros(1, dtype=np.int64)] for column in STRING_COLUMNS}
+        self._blob_sizes = {column: 0 for column in STRING_COLUMNS}
+
+    def _spill(self, column: str, array: "np.ndarray") -> None:
+        # 청크는 임시 .npy 로 내려두고 close() 에서 하나로 합침 (메모리는 청크 크기만 사용)
+        part = os.path.join(self.path, f".{column}.part{len(self._parts[column])}.npy")
+        np.save(part, array)
+        self._parts[column].append(part)
+
+    def write(self, chunk: Dict[str, Any]) -> None:
+        for column in HOLD_COLUMNS:
+            values = chunk[column]
+            if column in STRING_COLUMNS:
+                encoded = [value.encode("utf-8") for value in values]
+                lengths = np.fromiter((len(value) for value in encoded), dtype=np.int64, count=len(encoded))
+                self._offsets[column].append(self._blob_sizes[column] + np.cumsum(lengths))
+                self._blob_sizes[column] += int(lengths.sum())
+                self._blobs[column].write(b"".join(encoded))
+            elif column in DICTIONARY_COLUMNS:
+                self._spill(column, np.asarray(values, dtype=np.uint16))
+            elif column in DATE_COLUMNS:
+                self._spill(column, np.asarray(values, dtype="datetime64[D]"))
+            else:
+                self._spill(column, np.asarray(values, dtype=np.int64))
+        self.rows += len(chunk["HOLD_ID"])
+
+    def close(self) -> Dict[str, Any]:
+        columns: Dict[str, Dict[str, str]] = {}
+        for column in HOLD_COLUMNS:
+            if column in STRING_COLUMNS:
+                self._blobs[column].close()
+                np.save(os.path.join(self.path, f"{column}.offsets.npy"), np.concatenate(self._offsets[column]))
+                columns[column] = {"kind": "string", "data": f"{column}.bin", "offsets": f"{column}.offsets.npy"}
+                continue
+            suffix = ".codes.npy" if column in DICTIONARY_COLUMNS else ".npy"
+            target = os.path.join(self.path, column + suffix)
+            parts = self._parts[column]
+            if parts:
+                merged = np.lib.format.open_memmap(
+                    target, mode="w+", dtype=np.load(parts[0], mmap_mode="r").dtype, shape=(self.rows,)
+                )
+                position = 0
+                for part in parts:
+                    array = np.load(part)
+                    merged[position:position + len(array)] = array
+                    position += len(array)
+                    os.remove(part)
+                merged.flush()
+                del merged
+            kind = "dictionary" if column in DICTIONARY_COLUMNS else "date" if column in DATE_COLUMNS else "integer"
+            columns[column] = {"kind": kind, "data": column + suffix}
+
+        meta = {
+            "version": FORMAT_VERSION,
+            "rows": self.rows,
+            "columns": columns,
+            "dictionaries": self.dictionary_values,
+            **self.extra_meta,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return meta
+
+
+def write_parquet(path: str, chunks: Iterator[Dict[str, Any]], dictionary_values: Dict[str, List[Optional[str]]]) -> int:
+    """청크를 단일 Parquet 파일로 씁니다 (pyarrow 필요). 사전 컬럼은 문자열로 풀어서 저장."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 으로 저장하려면 'uv sync --extra parquet' 가 필요합니다.") from e
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            arrays = {}
+            for column in HOLD_COLUMNS:
+                values = chunk[column]
+                if column in DICTIONARY_COLUMNS:
+                    lookup = np.asarray(dictionary_values[column], dtype=object)
+                    arrays[column] = pa.array(lookup[values], type=pa.string()).dictionary_encode()
+                elif column in INTEGER_COLUMNS:
+                    arrays[column] = pa.array(values, mask=values < 0)
+                else:
+                    arrays[column] = pa.array(values)
+            table = pa.table(arrays)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def generate(path: str, rows: int, seed: int = 42, chunk_rows: int = DEFAULT_CHUNK_ROWS, fmt: str = "npy", **options: Any) -> Dict[str, Any]:
+    """합성 홀딩 rows 건을 path 에 저장하고 요약을 반환합니다."""
+    require_numpy()
+    catalog = reason_catalog()
+    dictionary_values = dictionaries(catalog)
+    chunks = iter_hold_chunks(rows, seed=seed, chunk_rows=chunk_rows, catalog=catalog, **options)
+    started = time.perf_counter()
+    if fmt == "parquet":
+        written = write_parquet(path, chunks, dictionary_values)
+    else:
+        writer = ColumnWriter(path, dictionary_values, extra_meta={
+            "generator": {"seed": seed, "created": date.today().isoformat()},
+            # 사유별 규정집 검색어 (HOLD_REASON 사전 순서)
+            "search_queries": [None] + [entry["search_query"] for entry in catalog],
+        })
+        for chunk in chunks:
+            writer.write(chunk)
+        written = writer.close()["rows"]
+    return {"path": path, "rows": written, "format": fmt, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AP_HOLDS_ALL 합성 홀딩 데이터 생성기")
+    parser.add_argument("path", help="출력 디렉터리 (parquet 이면 파일 경로)")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--reason-skew", type=float, default=1.2, help="사유 분포 기울기 (클수록 상위 사유에 집중)")
+    parser.add_argument("--format", choices=["npy", "parquet"], default="npy")
+    args = parser.parse_args(argv)
+
+    summary = generate(args.path, args.rows, seed=args.seed, chunk_rows=args.chunk_rows,
+                       fmt=args.format, reason_skew=args.reason_skew)
+    print(f"✅ {summary['path']} 에 {summary['rows']:,}건 생성 ({summary['format']}, {summary['seconds']}초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
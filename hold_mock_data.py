@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+홀딩 Mock 데이터
+
+HOLD_DATA_SOURCE=mock(기본값)일 때 서버가 사용하는 인보이스 10건과 사유별 상세 정보입니다.
+생성기/스냅숏/일괄 분류/벤치마크 같은 오프라인 도구도 이 모듈만 가져오므로
+fastmcp 등 서버 의존성이나 서버 모듈의 초기화(저장소/규정집 인덱스 생성) 없이 사용할 수 있습니다.
+"""
+from typing import Dict, List
+
+from hold_store import InMemoryHoldRepository
+
+MOCK_HOLDING_INVOICES: List[Dict] = [
+    {"id": "INV-001", "status": "holding", "reason": "발주금액 불일치", "hold_lookup_code": "PRICE", "org_id": 101, "hold_date": "2024-09-02"},
+    {"id": "INV-002", "status": "holding", "reason": "수량 불일치", "hold_lookup_code": "QTY ORD", "org_id": 101, "hold_date": "2024-09-03"},
+    {"id": "INV-003", "status": "holding", "reason": "재고 부족", "hold_lookup_code": "QTY REC", "org_id": 102, "hold_date": "2024-09-03"},
+    {"id": "INV-004", "status": "holding", "reason": "승인자 부재", "hold_lookup_code": "APPROVAL", "org_id": 102, "hold_date": "2024-09-05"},
+    {"id": "INV-005", "status": "holding", "reason": "예산 초과", "hold_lookup_code": "FUNDS", "org_id": 101, "hold_date": "2024-09-06"},
+    {"id": "INV-006", "status": "holding", "reason": "공급업체 신용도 검토 필요", "hold_lookup_code": "VENDOR", "org_id": 103, "hold_date": "2024-09-09"},
+    {"id": "INV-007", "status": "holding", "reason": "계약서 조건 불일치", "hold_lookup_code": "TERMS", "org_id": 103, "hold_date": "2024-09-10"},
+    {"id": "INV-008", "status": "holding", "reason": "세금 계산 오류", "hold_lookup_code": "TAX", "org_id": 101, "hold_date": "2024-09-11"},
+    {"id": "INV-009", "status": "holding", "reason": "배송정보 누락", "hold_lookup_code": "SHIPPING", "org_id": 102, "hold_date": "2024-09-12"},
+    {"id": "INV-010", "status": "holding", "reason": "중복 인보이스", "hold_lookup_code": "DUPLICATE", "org_id": 103, "hold_date": "2024-09-13"},
+]
+
+# 홀딩 사유별 상세 정보
+HOLDING_REASON_DETAILS: Dict[str, Dict[str, str]] = {
+    "INV-001": {
+        "reason": "발주금액 불일치",
+        "detail": "발주서의 단가(₩15,000)와 인보이스의 단가(₩18,000)가 일치하지 않습니다. 총 금액 차이: ₩30,000 (10개 항목)",
+        "search_query": "발주금액 불일치 처리 절차 단가 차이 승인"
+    },
+    "INV-002": {
+        "reason": "수량 불일치", 
+        "detail": "발주 수량 100개에 대해 인보이스 수량이 85개로 15개 부족합니다. 부분 납품에 대한 확인이 필요합니다.",
+        "search_query": "수량 불일치 부분납품 처리방법 검수확인"
+    },
+    "INV-003": {
+        "reason": "재고 부족",
+        "detail": "현재 재고량 50개, 발주량 200개로 재고가 150개 부족합니다. 추가 발주 또는 납기 조정이 필요합니다.",
+        "search_query": "재고부족 시 처리절차 추가발주 납기조정"
+    },
+    "INV-004": {
+        "reason": "승인자 부재",
+        "detail": "담당 승인자(김부장)가 출장 중이며, 대리 승인자 지정이 필요합니다. 승인 한도: ₩5,000,000",
+        "search_query": "승인자 부재 대리승인 권한위임 절차"
+    },
+    "INV-005": {
+        "reason": "예산 초과",
+        "detail": "해당 부서 월 예산 ₩10,000,000 중 이미 ₩9,500,000 사용. 인보이스 금액 ₩800,000로 예산 초과",
+        "search_query": "예산초과 처리방법 추경예산 승인절차"
+    },
+    "INV-006": {
+        "reason": "공급업체 신용도 검토 필요",
+        "detail": "신규 공급업체로 신용평가가 미완료 상태입니다. 신용등급 확인 및 보증보험 가입 여부 검토 필요",
+        "search_query": "신규공급업체 신용평가 보증보험 검토절차"
+    },
+    "INV-007": {
+        "reason": "계약서 조건 불일치",
+        "detail": "계약서상 지불조건 Net 30일이나 인보이스는 Net 15일로 표시. 계약 조건 재확인 필요",
+        "search_query": "계약조건 불일치 지불조건 수정절차"
+    },
+    "INV-008": {
+        "reason": "세금 계산 오류",
+        "detail": "부가세 계산이 잘못됨. 공급가액 ₩1,000,000에 대해 부가세 ₩90,000 (9%)로 계산되어야 하나 ₩100,000 (10%)로 계산됨",
+        "search_query": "세금계산 오류 부가세 수정 세무처리"
+    },
+    "INV-009": {
+        "reason": "배송정보 누락",
+        "detail": "배송지 주소, 담당자 연락처가 인보이스에 누락되어 있습니다. 물류 처리를 위해 정보 보완 필요",
+        "search_query": "배송정보 누락 주소확인 물류처리절차"
+    },
+    "INV-010": {
+        "reason": "중복 인보이스",
+        "detail": "동일한 발주번호(PO-2024-001)에 대해 이미 처리된 인보이스(INV-001)가 존재합니다. 중복 처리 방지 필요",
+        "search_query": "중복인보이스 처리 발주번호 확인절차"
+    }
+}
+
+
+def create_mock_repository() -> InMemoryHoldRepository:
+    """Mock 데이터로 채운 메모리 저장소"""
+    return InMemoryHoldRepository.from_mock(MOCK_HOLDING_INVOICES, HOLDING_REASON_DETAILS)
@@ -1,20 +1,53 @@
 #!/usr/bin/env python3
 from pydantic import BaseModel, Field
-from typing import List, Optional, Union
+from typing import Any, Iterator, List, Literal, Optional, Union
+import functools
+import inspect
 import json
-import random
+import os
 import asyncio
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import date
 
 from fastmcp import FastMCP
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from hold_datasource import DEFAULT_POOL_MAX, create_repository_from_env
+from hold_mock_data import HOLDING_REASON_DETAILS, MOCK_HOLDING_INVOICES, create_mock_repository
+from hold_statistics import HoldStatistics
+from hot_reload import (
+    DEFAULT_RELOAD_INTERVAL, DEFAULT_WATERMARK_INTERVAL, DeltaLogReloadable, HotReloader, Reloadable, RuleBookReloadable,
+    SnapshotReloadable, WatermarkReloadable,
+)
+from id_suggest import InvoiceIdSuggester
+from payload_compaction import PayloadOptionError, compact_payload, dumps, wants_compaction
+from response_cache import ResponseCache, make_cache_key
+from rulebook_procedures import build_procedure_table, find_procedure, suggest_procedures
+from rulebook_search import RULE_BOOK_PATH, RuleBookIndex
+from server_metrics import ToolMetricsMiddleware, record_serialization
+from tool_executor import BlockingExecutor, SingleFlight
+from tracing import Tracer, tracing_middleware
+from hold_store import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, HoldRepository, HoldRow, InvalidCursorError, InvalidFilterError, check_date_filter,
+)
 
 # Data Models with proper Pydantic v2 syntax
 class HoldingInvoice(BaseModel):
     """홀딩된 인보이스 정보"""
-    model_config = {"json_schema_extra": {"example": {"id": "INV-001", "status": "holding", "reason": "발주금액 불일치"}}}
+    model_config = {"json_schema_extra": {"example": {"id": "INV-001", "status": "holding", "reason": "발주금액 불일치", "hold_lookup_code": "PRICE", "org_id": 101, "hold_date": "2024-09-02"}}}
     
     id: str = Field(..., description="인보이스 ID")
     status: str = Field(..., description="인보이스 상태")
     reason: str = Field(..., description="홀딩 사유")
+    hold_lookup_code: Optional[str] = Field(None, description="홀딩 코드 (AP_HOLDS_ALL.HOLD_LOOKUP_CODE)")
+    org_id: Optional[int] = Field(None, description="조직 ID (AP_HOLDS_ALL.ORG_ID)")
+    hold_date: Optional[str] = Field(None, description="홀딩 일자 (YYYY-MM-DD)")
 
 class HoldingReasonDetail(BaseModel):
     """홀딩 사유 상세 정보"""
@@ -30,10 +63,102 @@ class HoldingReasonDetail(BaseModel):
     detail: str = Field(..., description="상세 설명")
     search_query: str = Field(..., description="관련 검색 키워드")
 
+class ResolutionStep(BaseModel):
+    """처리 절차 단계"""
+    step: int = Field(..., description="단계 번호")
+    title: str = Field(..., description="단계 제목")
+    processing_time: Optional[str] = Field(None, description="처리시간 (예: 1-2시간)")
+    owner: Optional[str] = Field(None, description="담당자")
+    actions: List[str] = Field(default_factory=list, description="수행 항목")
+
+class ResolutionProcedure(BaseModel):
+    """홀딩 사유별 규정집 처리 절차"""
+    model_config = {"json_schema_extra": {"example": {
+        "reason": "발주금액 불일치",
+        "keywords": ["발주금액", "단가차이"],
+        "cause": "발주서 단가와 인보이스 단가 간 차이로 인한 총 금액 불일치",
+        "risk": "중간 (금액에 따라 높음)",
+        "owner": "구매팀 담당자",
+        "steps": [{"step": 1, "title": "차이 분석", "processing_time": "1-2시간", "owner": "구매팀 담당자",
+                   "actions": ["발주서와 인보이스 단가 비교 분석"]}],
+        "regulations": ["구매 규정 제15조 (가격 변동 처리)"]
+    }}}
+    
+    reason: str = Field(..., description="홀딩 사유")
+    keywords: List[str] = Field(default_factory=list, description="검색 키워드")
+    cause: Optional[str] = Field(None, description="발생원인")
+    risk: Optional[str] = Field(None, description="위험도")
+    owner: Optional[str] = Field(None, description="1차 담당자")
+    steps: List[ResolutionStep] = Field(default_factory=list, description="단계별 처리 절차")
+    regulations: List[str] = Field(default_factory=list, description="관련 규정")
+
+class HoldingReasonDetailWithProcedure(HoldingReasonDetail):
+    """처리 절차가 포함된 홀딩 사유 상세 정보"""
+    procedure: Optional[ResolutionProcedure] = Field(None, description="규정집 처리 절차 (사유에 해당하는 절차가 없으면 null)")
+
+class HoldingInvoicePage(BaseModel):
+    """홀딩 인보이스 목록 한 페이지"""
+    items: List[HoldingInvoice] = Field(..., description="현재 페이지의 인보이스 목록")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+class HoldingReasonDetailPage(BaseModel):
+    """홀딩 사유 상세 정보 한 페이지"""
+    items: List[HoldingReasonDetail] = Field(..., description="현재 페이지의 상세 사유 목록")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+class InvoiceLookupError(BaseModel):
+    """일괄 조회 중 개별 인보이스 오류"""
+    invoice_id: str = Field(..., description="인보이스 ID")
+    error: str = Field(..., description="에러 메시지")
+    suggested_ids: List[str] = Field(default_factory=list, description="요청한 ID와 가장 가까운 인보이스 ID 목록")
+
+class HoldingReasonDetailBatch(BaseModel):
+    """여러 인보이스의 홀딩 사유 일괄 조회 결과"""
+    items: List[HoldingReasonDetail] = Field(..., description="조회에 성공한 상세 사유 목록 (요청 순서)")
+    errors: List[InvoiceLookupError] = Field(default_factory=list, description="조회에 실패한 인보이스별 오류와 추천 ID")
+
+class RuleBookSection(BaseModel):
+    """규정집 검색 결과 항목"""
+    title: str = Field(..., description="섹션 제목 (예: 1. 발주금액 불일치 > 해결 절차)")
+    content: str = Field(..., description="섹션 본문 (마크다운)")
+    score: float = Field(..., description="관련도 점수")
+
+class RuleBookSearchResult(BaseModel):
+    """규정집 검색 결과"""
+    query: str = Field(..., description="검색어")
+    results: List[RuleBookSection] = Field(..., description="관련도 순 섹션 목록")
+
+class CompactHoldingPayload(BaseModel):
+    """fields / max_text_chars / output_format 옵션으로 축약된 응답 (값이 없는 키는 생략)"""
+    model_config = {"json_schema_extra": {"example": {
+        "columns": ["invoice_id", "reason"],
+        "rows": [["INV-001", "발주금액 불일치"], ["INV-002", "수량 불일치"]],
+        "next_cursor": "Mg==",
+        "savings": {"original_bytes": 1210, "bytes": 212, "saved_bytes": 998,
+                    "original_tokens": 402, "tokens": 61, "saved_tokens": 341, "saved_ratio": 0.848}
+    }}}
+
+    items: Optional[List[dict]] = Field(None, description="축약된 항목 목록 (output_format=json)")
+    columns: Optional[List[str]] = Field(None, description="열 이름 (output_format=table)")
+    rows: Optional[List[list]] = Field(None, description="columns 순서의 값 목록 (output_format=table)")
+    item: Optional[dict] = Field(None, description="축약된 단건 응답 (get_holding_reason_detail)")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 생략)")
+    errors: Optional[List[InvoiceLookupError]] = Field(None, description="조회에 실패한 인보이스별 오류와 추천 ID")
+    savings: dict = Field(..., description="원래 응답 대비 바이트/토큰 절감량")
+
+    def model_dump(self, **kwargs: Any) -> dict:
+        kwargs.setdefault("exclude_none", True)
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        kwargs.setdefault("exclude_none", True)
+        return super().model_dump_json(**kwargs)
+
 class ErrorResponse(BaseModel):
     """에러 응답"""
     error: str = Field(..., description="에러 메시지")
-    available_ids: Optional[List[str]] = Field(None, description="사용 가능한 ID 목록")
+    available_ids: Optional[List[str]] = Field(None, description="요청한 ID와 가장 가까운 인보이스 ID 목록 (최대 5개)")
+    suggestions: Optional[List[str]] = Field(None, description="요청한 사유와 비슷한 규정집 사유 목록 (최대 5개)")
 
 class InvoiceStatistics(BaseModel):
     """인보이스 통계 정보"""
@@ -51,120 +176,389 @@ class InvoiceStatistics(BaseModel):
     most_common_count: int = Field(..., description="가장 많은 사유의 건수")
     unique_reasons: int = Field(..., description="고유 사유 수")
 
-# Mock 데이터
-MOCK_HOLDING_INVOICES = [
-    {"id": "INV-001", "status": "holding", "reason": "발주금액 불일치"},
-    {"id": "INV-002", "status": "holding", "reason": "수량 불일치"},
-    {"id": "INV-003", "status": "holding", "reason": "재고 부족"},
-    {"id": "INV-004", "status": "holding", "reason": "승인자 부재"},
-    {"id": "INV-005", "status": "holding", "reason": "예산 초과"},
-    {"id": "INV-006", "status": "holding", "reason": "공급업체 신용도 검토 필요"},
-    {"id": "INV-007", "status": "holding", "reason": "계약서 조건 불일치"},
-    {"id": "INV-008", "status": "holding", "reason": "세금 계산 오류"},
-    {"id": "INV-009", "status": "holding", "reason": "배송정보 누락"},
-    {"id": "INV-010", "status": "holding", "reason": "중복 인보이스"},
-]
-
-# 홀딩 사유별 상세 정보
-HOLDING_REASON_DETAILS = {
-    "INV-001": {
-        "reason": "발주금액 불일치",
-        "detail": "발주서의 단가(₩15,000)와 인보이스의 단가(₩18,000)가 일치하지 않습니다. 총 금액 차이: ₩30,000 (10개 항목)",
-        "search_query": "발주금액 불일치 처리 절차 단가 차이 승인"
-    },
-    "INV-002": {
-        "reason": "수량 불일치", 
-        "detail": "발주 수량 100개에 대해 인보이스 수량이 85개로 15개 부족합니다. 부분 납품에 대한 확인이 필요합니다.",
-        "search_query": "수량 불일치 부분납품 처리방법 검수확인"
-    },
-    "INV-003": {cha
-        "reason": "재고 부족",
-        "detail": "현재 재고량 50개, 발주량 200개로 재고가 150개 부족합니다. 추가 발주 또는 납기 조정이 필요합니다.",
-        "search_query": "재고부족 시 처리절차 추가발주 납기조정"
-    },
-    "INV-004": {
-        "reason": "승인자 부재",
-        "detail": "담당 승인자(김부장)가 출장 중이며, 대리 승인자 지정이 필요합니다. 승인 한도: ₩5,000,000",
-        "search_query": "승인자 부재 대리승인 권한위임 절차"
-    },
-    "INV-005": {
-        "reason": "예산 초과",
-        "detail": "해당 부서 월 예산 ₩10,000,000 중 이미 ₩9,500,000 사용. 인보이스 금액 ₩800,000로 예산 초과",
-        "search_query": "예산초과 처리방법 추경예산 승인절차"
-    },
-    "INV-006": {
-        "reason": "공급업체 신용도 검토 필요",
-        "detail": "신규 공급업체로 신용평가가 미완료 상태입니다. 신용등급 확인 및 보증보험 가입 여부 검토 필요",
-        "search_query": "신규공급업체 신용평가 보증보험 검토절차"
-    },
-    "INV-007": {
-        "reason": "계약서 조건 불일치",
-        "detail": "계약서상 지불조건 Net 30일이나 인보이스는 Net 15일로 표시. 계약 조건 재확인 필요",
-        "search_query": "계약조건 불일치 지불조건 수정절차"
-    },
-    "INV-008": {
-        "reason": "세금 계산 오류",
-        "detail": "부가세 계산이 잘못됨. 공급가액 ₩1,000,000에 대해 부가세 ₩90,000 (9%)로 계산되어야 하나 ₩100,000 (10%)로 계산됨",
-        "search_query": "세금계산 오류 부가세 수정 세무처리"
-    },
-    "INV-009": {
-        "reason": "배송정보 누락",
-        "detail": "배송지 주소, 담당자 연락처가 인보이스에 누락되어 있습니다. 물류 처리를 위해 정보 보완 필요",
-        "search_query": "배송정보 누락 주소확인 물류처리절차"
-    },
-    "INV-010": {
-        "reason": "중복 인보이스",
-        "detail": "동일한 발주번호(PO-2024-001)에 대해 이미 처리된 인보이스(INV-001)가 존재합니다. 중복 처리 방지 필요",
-        "search_query": "중복인보이스 처리 발주번호 확인절차"
+class InvoiceStatisticsBreakdown(BaseModel):
+    """인보이스 통계 상세 분포"""
+    model_config = {"json_schema_extra": {"example": {
+        "total_holding": 10,
+        "org_distribution": {"101": 4, "102": 3, "103": 3},
+        "daily_distribution": {"2024-09-02": 1, "2024-09-03": 2},
+        "aging_distribution": {"0-7일": 0, "8-30일": 3, "31-60일": 7, "61-90일": 0, "90일 초과": 0},
+        "as_of": "2024-10-15"
+    }}}
+    
+    total_holding: int = Field(..., description="총 홀딩 인보이스 수")
+    org_distribution: dict = Field(..., description="ORG_ID별 분포")
+    daily_distribution: dict = Field(..., description="홀딩 일자별 분포")
+    aging_distribution: dict = Field(..., description="홀딩 경과일 구간별 분포")
+    as_of: str = Field(..., description="경과일 계산 기준일 (YYYY-MM-DD)")
+
+# 아래 서버 상태는 import 시점이 아니라 기동 훅(initialize, 서빙 lifespan / MCP 세션 lifespan)에서 만듭니다.
+# (DB 연결, 통계 집계, 규정집 색인을 기다리는 동안 import 가 막히지 않도록)
+
+# 홀딩 데이터 저장소 (HOLD_DATA_SOURCE 환경 변수 또는 set_repository 로 DB 등 다른 구현으로 교체 가능)
+_repository: Optional[HoldRepository] = None
+
+# 저장소 변경 이벤트로 증분 갱신되는 통계
+_statistics: Optional[HoldStatistics] = None
+
+# 규정집 검색 인덱스 (GuideBook.md 가 바뀌면 검색 시점에 바뀐 청크만 다시 색인)
+_rule_book_index: Optional[RuleBookIndex] = None
+
+# 사유 → 처리 절차 테이블 (규정집 인덱스의 파일 해시가 바뀔 때만 다시 파싱)
+_procedure_table: dict = {}
+_procedure_table_hash: Optional[str] = None
+
+def _get_procedure_table() -> dict:
+    global _procedure_table, _procedure_table_hash
+    if _hot_reloader is not None and _hot_reloader.running:
+        # 백그라운드 갱신 중에는 요청 경로에서 파일을 확인하지 않음
+        return _procedure_table
+    _rule_book_index.refresh()
+    if _procedure_table_hash != _rule_book_index.file_hash:
+        _procedure_table = build_procedure_table(_rule_book_index.chunks)
+        _procedure_table_hash = _rule_book_index.file_hash
+    return _procedure_table
+
+# 존재하지 않는 ID 조회 시 가까운 ID를 추천하기 위한 인덱스
+_id_suggester: Optional[InvoiceIdSuggester] = None
+
+# 직렬화된 도구 응답 캐시 (저장소 세대 번호가 바뀌면 자동 무효화)
+_response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+)
+
+def get_repository() -> HoldRepository:
+    """현재 사용 중인 홀딩 저장소를 반환합니다."""
+    return _repository
+
+def _prepare_repository(repository: HoldRepository) -> tuple:
+    """교체 전에 새 저장소의 통계와 ID 추천 인덱스를 미리 만듭니다 (워커 스레드에서 호출 가능)."""
+    return repository, HoldStatistics.attach(repository), InvoiceIdSuggester.attach(repository)
+
+def _activate_repository(prepared: tuple) -> None:
+    """준비된 저장소/통계/인덱스로 참조를 한 번에 바꿉니다."""
+    global _repository, _statistics, _id_suggester
+    repository, statistics, id_suggester = prepared
+    # 세대 번호를 이어서 올려, 이전 저장소 기준으로 캐시된 응답이 새 저장소에서 쓰이지 않게 함
+    if _repository is not None:
+        repository.generation = max(repository.generation, _repository.generation + 1)
+    _repository, _statistics, _id_suggester = repository, statistics, id_suggester
+
+def _activate_external_changes(prepared: tuple) -> None:
+    """
+    DB 워터마크가 바뀐 뒤(EBS/다른 워커의 변경) 다시 집계한 통계와 ID 추천 인덱스로 교체하고,
+    세대 번호를 올려 캐시된 응답을 무효화합니다. 그사이 저장소가 교체되었으면 버립니다.
+    """
+    global _statistics, _id_suggester
+    repository, statistics, id_suggester = prepared
+    stale = (statistics, id_suggester) if repository is not _repository else (_statistics, _id_suggester)
+    for listener in stale:
+        repository.unsubscribe(listener)
+    if repository is _repository:
+        _statistics, _id_suggester = statistics, id_suggester
+        _repository.generation += 1
+
+def set_repository(repository: HoldRepository) -> None:
+    """홀딩 저장소를 교체하고 통계와 ID 추천 인덱스를 새 저장소 기준으로 다시 만듭니다."""
+    _activate_repository(_prepare_repository(repository))
+    _response_cache.clear()
+
+def _build_rule_book() -> tuple:
+    index = RuleBookIndex.load_or_build()
+    return index, build_procedure_table(index.chunks)
+
+def _activate_rule_book(built: tuple) -> None:
+    """새 규정집 인덱스/처리 절차 테이블로 교체하고, 내용이 바뀌었으면 캐시된 응답을 비웁니다."""
+    global _rule_book_index, _procedure_table, _procedure_table_hash
+    index, table = built
+    changed = index.file_hash != _procedure_table_hash
+    _rule_book_index, _procedure_table, _procedure_table_hash = index, table, index.file_hash
+    if changed:
+        # 규정집 내용(담당자, 처리 절차)이 들어간 응답이 이전 규정집 기준으로 남지 않게 함
+        _response_cache.clear()
+
+def _build_hot_reloader() -> Optional[HotReloader]:
+    """
+    HOT_RELOAD_INTERVAL(초, 0 이면 끔) 마다 규정집, snapshot:/// 저장소, HOLD_DELTA_PATH 변경 로그를 확인하고,
+    DB 저장소는 HOLD_DB_WATERMARK_INTERVAL(초) 마다 워터마크를 확인합니다.
+    서빙 이벤트 루프에서 start() 되기 전까지는 기존처럼 요청 시점에 규정집 변경을 확인합니다.
+    """
+    interval = float(os.getenv("HOT_RELOAD_INTERVAL", str(DEFAULT_RELOAD_INTERVAL)))
+    if interval <= 0:
+        return None
+    reloadables: List[Reloadable] = [RuleBookReloadable(RULE_BOOK_PATH, _build_rule_book, _activate_rule_book)]
+    delta_log = None
+    if os.getenv("HOLD_DELTA_PATH") and _repository.read_only:
+        print(f"⚠️  HOLD_DELTA_PATH 무시: {type(_repository).__name__} 는 읽기 전용입니다 (EBS 홀딩은 AP 홀드 API 로 변경)")
+    elif os.getenv("HOLD_DELTA_PATH"):
+        delta_log = DeltaLogReloadable(os.environ["HOLD_DELTA_PATH"], get_repository)
+    snapshot_path = getattr(_repository, "path", None)
+    if snapshot_path and os.getenv("HOLD_DATA_SOURCE", "").startswith("snapshot:///"):
+        from hold_snapshot import SnapshotHoldRepository
+        reloadables.append(SnapshotReloadable(
+            snapshot_path, SnapshotHoldRepository, _prepare_repository, _activate_repository, delta_log
+        ))
+    if delta_log is not None:
+        reloadables.append(delta_log)
+    if hasattr(_repository, "last_update_watermark"):
+        reloadables.append(WatermarkReloadable(
+            get_repository, _prepare_repository, _activate_external_changes,
+            interval=float(os.getenv("HOLD_DB_WATERMARK_INTERVAL", str(DEFAULT_WATERMARK_INTERVAL)))
+        ))
+    return HotReloader(reloadables, interval=interval)
+
+_hot_reloader: Optional[HotReloader] = None
+
+_initialized = False
+_initialize_lock = threading.Lock()
+
+def initialize() -> None:
+    """
+    저장소, 통계, ID 추천 인덱스, 규정집 인덱스/처리 절차 테이블, 핫 리로더를 만듭니다 (블로킹, 워커 스레드에서 호출).
+    한 번만 실행되며, 그 전에 set_repository 로 넣은 저장소는 그대로 사용합니다.
+    """
+    global _hot_reloader, _initialized
+    with _initialize_lock:
+        if _initialized:
+            return
+        if _repository is None:
+            _activate_repository(_prepare_repository(create_repository_from_env() or create_mock_repository()))
+        _activate_rule_book(_build_rule_book())
+        _hot_reloader = _build_hot_reloader()
+        _initialized = True
+
+async def _ensure_initialized() -> None:
+    if not _initialized:
+        await asyncio.to_thread(initialize)
+
+@asynccontextmanager
+async def _server_lifespan(server):
+    """MCP 세션 lifespan (stateless HTTP 에서는 요청마다 호출되므로 서버 상태는 처음 한 번만 만듦)"""
+    await _ensure_initialized()
+    yield {}
+
+# 블로킹 저장소(DB/스냅숏) 조회를 이벤트 루프 밖에서 실행하는 스레드 풀 (기본: DB 커넥션 풀 크기, 0 이면 끔)
+_blocking_executor = BlockingExecutor(int(os.getenv(
+    "TOOL_EXECUTOR_THREADS", os.getenv("HOLD_DB_POOL_MAX", str(DEFAULT_POOL_MAX))
+)))
+
+# 같은 도구 + 인자 + 저장소 세대의 동시 캐시 미스를 백엔드 조회 한 번으로 합침
+_single_flight = SingleFlight()
+
+def cached_response(fn=None, *, offload: bool = True, rule_book: bool = False):
+    """
+    도구 응답을 직렬화된 JSON 으로 캐시하는 데코레이터 (@mcp.tool() 아래에 적용)
+    
+    캐시 히트 시 Pydantic 모델 생성과 직렬화 없이 저장된 ToolResult 를 그대로 반환합니다.
+    도구가 응답 모델과 같은 모양의 dict(저장소 레코드로 만든 응답)를 반환하면 검증 없이 바로 직렬화합니다.
+    FastMCP 는 반환 타입이 단일 BaseModel 이 아니면(Union 등) 구조화 응답을 {"result": ...} 로
+    감싸므로 같은 규칙을 따릅니다.
+    
+    도구는 async 로 등록됩니다. 캐시 미스이고 저장소가 블로킹 I/O 를 하면(blocking_io) 도구 본문과
+    직렬화를 _blocking_executor 에서 실행하고, 같은 키의 동시 미스는 _single_flight 로 한 번만 실행합니다.
+    offload=False 는 메모리 통계만 읽는 도구용입니다 (이벤트 루프에서 바로 실행).
+    rule_book=True 는 처리 절차 테이블을 쓰는 도구용으로, 규정집 해시를 캐시 키에 넣어
+    GuideBook.md 가 바뀌면 이전 절차가 담긴 응답을 쓰지 않습니다.
+    """
+    if fn is None:
+        return functools.partial(cached_response, offload=offload, rule_book=rule_book)
+    
+    signature = inspect.signature(fn)
+    return_type = signature.return_annotation
+    wrap_result = not (inspect.isclass(return_type) and issubclass(return_type, BaseModel))
+    
+    def build(key: str, generation: int, args: tuple, kwargs: dict):
+        result = fn(*args, **kwargs)
+        started = time.perf_counter()
+        if isinstance(result, BaseModel):
+            structured = result.model_dump(mode="json")
+            text = result.model_dump_json()
+        else:
+            structured = result
+            text = dumps(result)
+        record_serialization(time.perf_counter() - started)
+        return _response_cache.put(
+            key, generation,
+            text=text,
+            structured={"result": structured} if wrap_result else structured
+        )
+    
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = make_cache_key(fn.__name__, bound.arguments)
+        if rule_book:
+            _get_procedure_table()
+            key += f"|rule_book:{_procedure_table_hash}"
+        generation = _repository.generation
+        
+        entry = _response_cache.get(key, generation)
+        if entry is None:
+            if offload and _blocking_executor.enabled and _repository.blocking_io:
+                entry = await _single_flight.do(
+                    (key, generation),
+                    lambda: _blocking_executor.run(build, key, generation, args, kwargs)
+                )
+            else:
+                entry = build(key, generation, args, kwargs)
+        return ToolResult(
+            content=[TextContent(type="text", text=entry.text)],
+            structured_content=entry.structured
+        )
+    
+    return wrapper
+
+def _compact_response(
+    result: Union[BaseModel, dict],
+    list_key: Optional[str],
+    item_model: type,
+    fields: Optional[List[str]],
+    max_text_chars: Optional[int],
+    output_format: str
+) -> Union[BaseModel, CompactHoldingPayload, ErrorResponse]:
+    """축약 옵션이 지정되었으면 응답을 CompactHoldingPayload 로 바꿉니다 (옵션이 잘못되면 ErrorResponse)."""
+    if isinstance(result, ErrorResponse) or not wants_compaction(fields, max_text_chars, output_format):
+        return result
+    try:
+        payload = compact_payload(
+            result if isinstance(result, dict) else result.model_dump(mode="json"),
+            list_key, list(item_model.model_fields),
+            fields=fields, max_text_chars=max_text_chars, output_format=output_format
+        )
+    except PayloadOptionError as e:
+        return ErrorResponse(error=str(e))
+    return CompactHoldingPayload(**payload)
+
+# 저장소 레코드(HoldRow) → 응답 항목 dict. 저장소 데이터는 신뢰하므로 Pydantic 검증 없이
+# 응답 모델(HoldingInvoice / HoldingReasonDetail)의 필드 순서 그대로 만듭니다.
+def _invoice_item(row: HoldRow) -> dict:
+    return {
+        "id": row.id,
+        "status": row.status,
+        "reason": row.reason,
+        "hold_lookup_code": row.hold_lookup_code,
+        "org_id": row.org_id,
+        "hold_date": row.hold_date
+    }
+
+def _reason_detail_item(row: HoldRow) -> dict:
+    return {
+        "invoice_id": row.id,
+        "reason": row.reason,
+        "detail": row.detail,
+        "search_query": row.search_query
     }
-}
 
 # FastMCP 앱 초기화
-mcp = FastMCP("Invoice Holding Management Server")
+mcp = FastMCP("Invoice Holding Management Server", lifespan=_server_lifespan)
+
+# 도구별 호출 수/지연/직렬화 시간/응답 크기 계측 (/metrics, get_server_metrics)
+_tool_metrics = ToolMetricsMiddleware.from_env()
+mcp.add_middleware(_tool_metrics)
+
+# TRACE_FILE / OTEL_EXPORTER_OTLP_ENDPOINT 가 설정되면 클라이언트 traceparent 를 이어받아 도구 실행 span 을 기록
+_tracer = Tracer.from_env("hold-resolve-mcp")
+if _tracer.exporters:
+    mcp.add_middleware(tracing_middleware(_tracer))
 
 @mcp.tool()
-def list_holding_invoices() -> List[HoldingInvoice]:
+@cached_response
+def list_holding_invoices(
+    reason: Optional[str] = None,
+    hold_lookup_code: Optional[str] = None,
+    org_id: Optional[int] = None,
+    hold_date_from: Optional[str] = None,
+    hold_date_to: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    fields: Optional[List[str]] = None,
+    max_text_chars: Optional[int] = None,
+    output_format: Literal["json", "table"] = "json"
+) -> Union[HoldingInvoicePage, CompactHoldingPayload, ErrorResponse]:
     """
-    홀딩된 인보이스 목록을 반환합니다.
+    홀딩된 인보이스 목록을 페이지 단위로 반환합니다.
     
-    현재 시스템에서 홀딩 상태인 모든 인보이스의 기본 정보를 조회할 수 있습니다.
-    각 인보이스는 고유 ID, 상태, 그리고 홀딩 사유를 포함합니다.
+    현재 시스템에서 홀딩 상태인 인보이스의 기본 정보를 조회할 수 있습니다.
+    각 인보이스는 고유 ID, 상태, 홀딩 사유, 홀딩 코드, 조직 ID, 홀딩 일자를 포함합니다.
+    다음 페이지는 응답의 next_cursor 값을 cursor 로 전달하여 조회합니다.
+    
+    Args:
+        reason: 홀딩 사유 필터 (예: 발주금액 불일치)
+        hold_lookup_code: 홀딩 코드 필터 (예: PRICE, QTY ORD)
+        org_id: 조직 ID 필터
+        hold_date_from: 홀딩 일자 시작 (YYYY-MM-DD, 포함)
+        hold_date_to: 홀딩 일자 종료 (YYYY-MM-DD, 포함)
+        cursor: 이전 응답의 next_cursor
+        page_size: 페이지 크기 (최대 500)
+        fields: 항목에서 남길 필드 목록 (예: ["id", "reason"], 생략하면 전체)
+        max_text_chars: 문자열 값의 최대 글자 수 (넘으면 잘라서 "…" 표시)
+        output_format: "table" 이면 키를 반복하지 않는 columns + rows 형식
     
     Returns:
-        List[HoldingInvoice]: 홀딩된 인보이스 목록
+        HoldingInvoicePage: 홀딩된 인보이스 목록 한 페이지
+        CompactHoldingPayload: 축약 옵션을 지정한 경우 (savings 에 절감량)
+        ErrorResponse: 커서, 홀딩 일자(YYYY-MM-DD) 또는 축약 옵션이 잘못된 경우
         
     Example:
         ```json
-        [
-            {
-                "id": "INV-001",
-                "status": "holding", 
-                "reason": "발주금액 불일치"
-            },
-            {
-                "id": "INV-002",
-                "status": "holding",
-                "reason": "수량 불일치"
-            }
-        ]
+        {
+            "items": [
+                {
+                    "id": "INV-001",
+                    "status": "holding", 
+                    "reason": "발주금액 불일치",
+                    "hold_lookup_code": "PRICE",
+                    "org_id": 101,
+                    "hold_date": "2024-09-02"
+                }
+            ],
+            "next_cursor": "Mg=="
+        }
         ```
     """
-    return [HoldingInvoice(**invoice) for invoice in MOCK_HOLDING_INVOICES]
+    try:
+        records, next_cursor = _repository.query(
+            reason=reason, hold_lookup_code=hold_lookup_code, org_id=org_id,
+            hold_date_from=hold_date_from, hold_date_to=hold_date_to,
+            cursor=cursor, page_size=page_size
+        )
+    except (InvalidCursorError, InvalidFilterError) as e:
+        return ErrorResponse(error=str(e))
+    
+    return _compact_response(
+        {"items": [_invoice_item(record) for record in records], "next_cursor": next_cursor},
+        "items", HoldingInvoice, fields, max_text_chars, output_format
+    )
 
 @mcp.tool()
-def get_holding_reason_detail(invoice_id: str) -> Union[HoldingReasonDetail, ErrorResponse]:
+@cached_response(rule_book=True)
+def get_holding_reason_detail(
+    invoice_id: str,
+    include_procedure: bool = False,
+    fields: Optional[List[str]] = None,
+    max_text_chars: Optional[int] = None
+) -> Union[HoldingReasonDetailWithProcedure, HoldingReasonDetail, CompactHoldingPayload, ErrorResponse]:
     """
     특정 홀딩 인보이스의 상세 사유를 반환합니다.
     
     지정된 인보이스 ID에 대한 상세한 홀딩 사유, 처리 가이드라인,
     그리고 관련 검색 키워드를 제공합니다.
+    include_procedure=true 이면 규정집의 단계별 처리 절차를 함께 반환하므로
+    규정집을 따로 검색할 필요가 없습니다.
     
     Args:
         invoice_id: 조회할 인보이스 ID (예: INV-001)
+        include_procedure: 규정집 처리 절차 포함 여부
+        fields: 남길 필드 목록 (예: ["reason", "procedure"], 생략하면 전체)
+        max_text_chars: 문자열 값의 최대 글자 수 (처리 절차의 수행 항목에도 적용)
         
     Returns:
         HoldingReasonDetail: 상세 사유 정보
-        ErrorResponse: 인보이스를 찾을 수 없는 경우
+        HoldingReasonDetailWithProcedure: 처리 절차가 포함된 상세 사유 정보
+        CompactHoldingPayload: 축약 옵션을 지정한 경우 (item 에 응답, savings 에 절감량)
+        ErrorResponse: 인보이스를 찾을 수 없거나 (가장 가까운 ID 최대 5개를 available_ids 로 제공) 축약 옵션이 잘못된 경우
         
     Example:
         ```json
@@ -176,46 +570,200 @@ def get_holding_reason_detail(invoice_id: str) -> Union[HoldingReasonDetail, Err
         }
         ```
     """
-    if invoice_id not in HOLDING_REASON_DETAILS:
+    record = _repository.get(invoice_id)
+    if record is None:
         return ErrorResponse(
             error=f"Invoice ID '{invoice_id}' not found in holding list",
-            available_ids=list(HOLDING_REASON_DETAILS.keys())
+            available_ids=_id_suggester.suggest(invoice_id)
         )
     
-    detail_info = HOLDING_REASON_DETAILS[invoice_id]
-    return HoldingReasonDetail(
-        invoice_id=invoice_id,
-        reason=detail_info["reason"],
-        detail=detail_info["detail"],
-        search_query=detail_info["search_query"]
+    detail = _reason_detail_item(record)
+    if not include_procedure:
+        return _compact_response(detail, None, HoldingReasonDetail, fields, max_text_chars, "json")
+    
+    # 처리 절차는 규정집 마크다운을 파싱한 값이므로 ResolutionProcedure 로 검증
+    procedure = find_procedure(_get_procedure_table(), record.reason)
+    detail["procedure"] = ResolutionProcedure(**procedure).model_dump(mode="json") if procedure else None
+    return _compact_response(detail, None, HoldingReasonDetailWithProcedure, fields, max_text_chars, "json")
+
+@mcp.tool()
+@cached_response
+def get_holding_reason_details(
+    invoice_ids: List[str],
+    fields: Optional[List[str]] = None,
+    max_text_chars: Optional[int] = None,
+    output_format: Literal["json", "table"] = "json"
+) -> Union[HoldingReasonDetailBatch, CompactHoldingPayload, ErrorResponse]:
+    """
+    여러 홀딩 인보이스의 상세 사유를 한 번에 반환합니다.
+    
+    인보이스마다 get_holding_reason_detail 을 호출하는 대신 이 도구로 한 번에 조회하세요.
+    찾지 못한 ID는 errors 에 개별적으로 담기며, 각 오류에는 가장 가까운 ID 최대 3개가 추천됩니다.
+    
+    Args:
+        invoice_ids: 조회할 인보이스 ID 목록 (예: ["INV-001", "INV-002"], 최대 500개)
+        fields: 항목에서 남길 필드 목록 (예: ["invoice_id", "detail"], 생략하면 전체)
+        max_text_chars: 문자열 값의 최대 글자 수 (넘으면 잘라서 "…" 표시)
+        output_format: "table" 이면 키를 반복하지 않는 columns + rows 형식
+        
+    Returns:
+        HoldingReasonDetailBatch: 상세 사유 목록과 ID별 오류
+        CompactHoldingPayload: 축약 옵션을 지정한 경우 (errors 는 그대로, savings 에 절감량)
+        ErrorResponse: 요청한 ID 수가 최대치를 넘거나 축약 옵션이 잘못된 경우
+        
+    Example:
+        ```json
+        {
+            "items": [
+                {
+                    "invoice_id": "INV-001",
+                    "reason": "발주금액 불일치",
+                    "detail": "발주서의 단가(₩15,000)와 인보이스의 단가(₩18,000)가 일치하지 않습니다.",
+                    "search_query": "발주금액 불일치 처리 절차 단가 차이 승인"
+                }
+            ],
+            "errors": [
+                {
+                    "invoice_id": "INV-999",
+                    "error": "Invoice ID 'INV-999' not found in holding list",
+                    "suggested_ids": ["INV-010", "INV-009", "INV-008"]
+                }
+            ]
+        }
+        ```
+    """
+    if len(invoice_ids) > MAX_PAGE_SIZE:
+        return ErrorResponse(error=f"Too many invoice IDs: {len(invoice_ids)} (max {MAX_PAGE_SIZE})")
+    
+    items = []
+    errors = []
+    for invoice_id in dict.fromkeys(invoice_ids):
+        record = _repository.get(invoice_id)
+        if record is None:
+            errors.append(InvoiceLookupError(
+                invoice_id=invoice_id,
+                error=f"Invoice ID '{invoice_id}' not found in holding list",
+                suggested_ids=_id_suggester.suggest(invoice_id, k=3)
+            ).model_dump(mode="json"))
+        else:
+            items.append(_reason_detail_item(record))
+    
+    return _compact_response(
+        {"items": items, "errors": errors},
+        "items", HoldingReasonDetail, fields, max_text_chars, output_format
     )
 
 @mcp.tool()
-def get_all_holding_reason_details() -> List[HoldingReasonDetail]:
+@cached_response
+def get_all_holding_reason_details(
+    reason: Optional[str] = None,
+    hold_lookup_code: Optional[str] = None,
+    org_id: Optional[int] = None,
+    hold_date_from: Optional[str] = None,
+    hold_date_to: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    fields: Optional[List[str]] = None,
+    max_text_chars: Optional[int] = None,
+    output_format: Literal["json", "table"] = "json"
+) -> Union[HoldingReasonDetailPage, CompactHoldingPayload, ErrorResponse]:
     """
-    모든 홀딩 인보이스의 상세 사유를 반환합니다.
+    홀딩 인보이스의 상세 사유를 페이지 단위로 반환합니다.
     
-    시스템의 모든 홀딩된 인보이스에 대한 상세 정보를 한 번에 조회할 수 있습니다.
+    시스템의 홀딩된 인보이스에 대한 상세 정보를 필터 조건과 함께 조회할 수 있습니다.
     각 항목에는 홀딩 사유, 상세 설명, 처리 가이드라인이 포함됩니다.
+    다음 페이지는 응답의 next_cursor 값을 cursor 로 전달하여 조회합니다.
+    
+    Args:
+        reason: 홀딩 사유 필터 (예: 발주금액 불일치)
+        hold_lookup_code: 홀딩 코드 필터 (예: PRICE, QTY ORD)
+        org_id: 조직 ID 필터
+        hold_date_from: 홀딩 일자 시작 (YYYY-MM-DD, 포함)
+        hold_date_to: 홀딩 일자 종료 (YYYY-MM-DD, 포함)
+        cursor: 이전 응답의 next_cursor
+        page_size: 페이지 크기 (최대 500)
+        fields: 항목에서 남길 필드 목록 (예: ["invoice_id", "reason"], 생략하면 전체)
+        max_text_chars: 문자열 값의 최대 글자 수 (넘으면 잘라서 "…" 표시)
+        output_format: "table" 이면 키를 반복하지 않는 columns + rows 형식
     
     Returns:
-        List[HoldingReasonDetail]: 모든 홀딩 사유 상세 정보 목록
+        HoldingReasonDetailPage: 홀딩 사유 상세 정보 한 페이지
+        CompactHoldingPayload: 축약 옵션을 지정한 경우 (savings 에 절감량)
+        ErrorResponse: 커서, 홀딩 일자(YYYY-MM-DD) 또는 축약 옵션이 잘못된 경우
         
     Note:
-        이 기능은 대량의 데이터를 반환할 수 있으므로 필요한 경우에만 사용하세요.
+        이 기능은 대량의 데이터를 반환할 수 있으므로 필터와 페이지 크기를 지정하여 사용하세요.
         특정 인보이스 정보만 필요한 경우 get_holding_reason_detail을 사용하는 것이 효율적입니다.
+        사유 분포만 필요하면 fields=["invoice_id", "reason"], output_format="table" 로 detail 을 빼세요.
+        전체 데이터를 한 번에 받아야 하는 경우 NDJSON 스트리밍 엔드포인트
+        (GET /stream/holding-reason-details)를 사용하세요.
     """
-    result = []
-    for invoice_id, detail_info in HOLDING_REASON_DETAILS.items():
-        result.append(HoldingReasonDetail(
-            invoice_id=invoice_id,
-            reason=detail_info["reason"],
-            detail=detail_info["detail"],
-            search_query=detail_info["search_query"]
-        ))
-    return result
+    try:
+        records, next_cursor = _repository.query(
+            reason=reason, hold_lookup_code=hold_lookup_code, org_id=org_id,
+            hold_date_from=hold_date_from, hold_date_to=hold_date_to,
+            cursor=cursor, page_size=page_size
+        )
+    except (InvalidCursorError, InvalidFilterError) as e:
+        return ErrorResponse(error=str(e))
+    
+    return _compact_response(
+        {"items": [_reason_detail_item(record) for record in records], "next_cursor": next_cursor},
+        "items", HoldingReasonDetail, fields, max_text_chars, output_format
+    )
+
+def _iter_reason_details_ndjson(filters: dict) -> Iterator[bytes]:
+    """필터에 맞는 상세 사유를 페이지 단위로 읽어 NDJSON 청크로 내보냅니다."""
+    # 스트리밍 도중 저장소가 교체되어도 커서가 유효하도록 시작 시점의 저장소를 계속 사용
+    repository = _repository
+    cursor = None
+    while True:
+        records, cursor = repository.query(cursor=cursor, page_size=MAX_PAGE_SIZE, **filters)
+        if records:
+            yield "".join(
+                dumps(_reason_detail_item(record)) + "\n" for record in records
+            ).encode("utf-8")
+        if cursor is None:
+            return
+
+@mcp.custom_route("/stream/holding-reason-details", methods=["GET"])
+async def stream_holding_reason_details(request: Request) -> StreamingResponse:
+    """
+    모든 홀딩 사유 상세 정보를 NDJSON(application/x-ndjson)으로 스트리밍합니다.
+    
+    get_all_holding_reason_details 와 같은 필터(reason, hold_lookup_code, org_id,
+    hold_date_from, hold_date_to)를 쿼리 문자열로 받습니다.
+    한 줄에 하나의 HoldingReasonDetail JSON 이 담기며, 서버는 한 페이지(최대 500건)씩만
+    메모리에 올리므로 전체 건수와 관계없이 첫 바이트가 바로 전송됩니다.
+    
+    Example:
+        curl -N "http://localhost:3000/stream/holding-reason-details?org_id=101"
+    """
+    params = request.query_params
+    filters = {
+        key: params[key]
+        for key in ("reason", "hold_lookup_code", "hold_date_from", "hold_date_to")
+        if params.get(key)
+    }
+    if params.get("org_id"):
+        try:
+            filters["org_id"] = int(params["org_id"])
+        except ValueError:
+            return JSONResponse(
+                ErrorResponse(error=f"Invalid org_id '{params['org_id']}'").model_dump(),
+                status_code=400
+            )
+    try:
+        for key in ("hold_date_from", "hold_date_to"):
+            check_date_filter(key, filters.get(key))
+    except InvalidFilterError as e:
+        return JSONResponse(ErrorResponse(error=str(e)).model_dump(), status_code=400)
+    
+    await _ensure_initialized()
+    return StreamingResponse(_iter_reason_details_ndjson(filters), media_type="application/x-ndjson")
 
 @mcp.tool()
+@cached_response(offload=False)
 def get_invoice_statistics() -> InvoiceStatistics:
     """
     홀딩 인보이스 통계 정보를 반환합니다.
@@ -237,25 +785,254 @@ def get_invoice_statistics() -> InvoiceStatistics:
         }
         ```
     """
-    reason_count = {}
-    for invoice in MOCK_HOLDING_INVOICES:
-        reason = invoice["reason"]
-        reason_count[reason] = reason_count.get(reason, 0) + 1
-    
-    most_common = max(reason_count.items(), key=lambda x: x[1]) if reason_count else ("없음", 0)
+    most_common_reason, most_common_count = _statistics.most_common
     
     return InvoiceStatistics(
-        total_holding=len(MOCK_HOLDING_INVOICES),
-        reason_distribution=reason_count,
-        most_common_reason=most_common[0],
-        most_common_count=most_common[1],
-        unique_reasons=len(reason_count)
+        total_holding=_statistics.total,
+        reason_distribution=_statistics.reason_distribution,
+        most_common_reason=most_common_reason,
+        most_common_count=most_common_count,
+        unique_reasons=_statistics.unique_reasons
     )
 
-def save_openapi_schema():
-    """OpenAPI 스키마를 JSON 파일로 저장합니다."""
-    import inspect
-    from pydantic._internal._model_serialization import to_jsonable_python
+@mcp.tool()
+@cached_response(offload=False)
+def get_invoice_statistics_breakdown(as_of: Optional[str] = None) -> Union[InvoiceStatisticsBreakdown, ErrorResponse]:
+    """
+    홀딩 인보이스의 ORG_ID별, 홀딩 일자별, 경과일 구간별 분포를 반환합니다.
+    
+    Args:
+        as_of: 경과일 계산 기준일 (YYYY-MM-DD, 기본값: 오늘)
+    
+    Returns:
+        InvoiceStatisticsBreakdown: 상세 분포 정보
+        ErrorResponse: 기준일 형식이 잘못된 경우
+    """
+    try:
+        as_of_date = date.fromisoformat(as_of) if as_of else date.today()
+    except ValueError:
+        return ErrorResponse(error=f"Invalid as_of date '{as_of}' (expected YYYY-MM-DD)")
+    
+    return InvoiceStatisticsBreakdown(
+        total_holding=_statistics.total,
+        org_distribution=_statistics.org_distribution,
+        daily_distribution=_statistics.daily_distribution,
+        aging_distribution=_statistics.aging_distribution(as_of_date),
+        as_of=as_of_date.isoformat()
+    )
+
+@mcp.tool()
+def get_resolution_procedure(reason: str) -> Union[ResolutionProcedure, ErrorResponse]:
+    """
+    홀딩 사유에 해당하는 규정집 처리 절차를 구조화하여 반환합니다.
+    
+    담당자, 단계별 처리시간과 수행 항목, 관련 규정을 한 번에 제공합니다.
+    
+    Args:
+        reason: 홀딩 사유 (예: 발주금액 불일치)
+    
+    Returns:
+        ResolutionProcedure: 처리 절차
+        ErrorResponse: 해당 사유의 절차가 규정집에 없는 경우 (사유 이름이 공백 차이 외에 다르면 suggestions 에 후보 제시)
+    """
+    table = _get_procedure_table()
+    procedure = find_procedure(table, reason)
+    if procedure is None:
+        return ErrorResponse(
+            error=f"No procedure for reason '{reason}'",
+            suggestions=suggest_procedures(table, reason)
+        )
+    return ResolutionProcedure(**procedure)
+
+@mcp.tool()
+def search_rule_book(query: str, top_k: int = 3) -> RuleBookSearchResult:
+    """
+    인보이스 홀딩 해결 규정집(GuideBook)에서 관련 처리 절차 섹션을 검색합니다.
+    
+    HoldingReasonDetail 의 search_query 를 그대로 검색어로 사용할 수 있습니다.
+    규정집 전체를 읽는 대신 관련도가 높은 섹션만 받아 볼 수 있습니다.
+    
+    Args:
+        query: 검색어 (예: "발주금액 불일치 처리 절차 단가 차이 승인")
+        top_k: 반환할 섹션 수 (최대 10)
+    
+    Returns:
+        RuleBookSearchResult: 관련도 순 섹션 목록
+        
+    Example:
+        ```json
+        {
+            "query": "대리승인 권한위임",
+            "results": [
+                {
+                    "title": "4. 승인자 부재 > 해결 절차",
+                    "content": "#### 1단계: 승인자 상태 확인 (처리시간: 즉시) ...",
+                    "score": 0.93
+                }
+            ]
+        }
+        ```
+    """
+    if _hot_reloader is None or not _hot_reloader.running:
+        _rule_book_index.refresh()
+    hits = _rule_book_index.search(query, top_k=max(1, min(top_k, 10)))
+    return RuleBookSearchResult(
+        query=query,
+        results=[
+            RuleBookSection(title=chunk.title, content=chunk.text, score=round(score, 4))
+            for chunk, score in hits
+        ]
+    )
+
+@mcp.tool()
+def get_response_cache_metrics() -> dict:
+    """
+    도구 응답 캐시의 지표를 반환합니다.
+    
+    Returns:
+        dict: 항목 수, 히트/미스 횟수, 히트율, 제거/만료/무효화 횟수, 캐시된 바이트 수
+    """
+    return _response_cache.metrics()
+
+@mcp.tool()
+def get_server_metrics() -> dict:
+    """
+    MCP 서버 도구별 계측 지표를 반환합니다.
+    
+    Returns:
+        dict: 도구별 호출/오류 수, 전체·실행·직렬화 시간 및 응답 크기 분포(p50/p95/p99),
+              최근 느린 호출 목록, 응답 캐시 지표, 블로킹 조회 스레드 풀/요청 병합 지표
+    """
+    metrics = _tool_metrics.snapshot()
+    metrics["response_cache"] = _response_cache.metrics()
+    metrics["executor"] = _blocking_executor.metrics()
+    metrics["single_flight"] = _single_flight.metrics()
+    return metrics
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    """
+    Prometheus 형식 지표 (도구별 카운터/히스토그램 + 저장소/응답 캐시 게이지와 카운터)
+    기동 훅(initialize)이 끝나기 전에도 200 으로 응답하며, 저장소 지표는 0 으로 내보냅니다.
+    """
+    repository, statistics = _repository, _statistics
+    cache = _response_cache.metrics()
+    executor = _blocking_executor.metrics()
+    text = _tool_metrics.render_prometheus(
+        {
+            "mcp_holds": statistics.total if statistics is not None else 0,
+            "mcp_repository_generation": repository.generation if repository is not None else 0,
+            "mcp_response_cache_entries": cache["entries"],
+            "mcp_tool_executor_active": executor["active"],
+            "mcp_tool_executor_queued": executor["queued"],
+        },
+        extra_counters={
+            "mcp_response_cache_hits_total": cache["hits"],
+            "mcp_response_cache_misses_total": cache["misses"],
+            "mcp_single_flight_shared_total": _single_flight.shared,
+        },
+    )
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+# 서빙 상태 (ASGI lifespan 시작 후 ready, 종료 시작 시 not ready)
+_serving_state = {"ready": False}
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health(request: Request) -> JSONResponse:
+    """프로세스 생존 여부 (liveness)"""
+    return JSONResponse({"status": "ok", "pid": os.getpid()})
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    """트래픽을 받을 준비 여부 (readiness): 앱 기동 완료 + 저장소 응답 가능"""
+    if not _serving_state["ready"]:
+        return JSONResponse({"status": "starting_or_stopping", "pid": os.getpid()}, status_code=503)
+    try:
+        await asyncio.to_thread(_repository.ping)
+    except Exception as e:
+        return JSONResponse({"status": "repository_unavailable", "error": str(e), "pid": os.getpid()}, status_code=503)
+    return JSONResponse({
+        "status": "ready",
+        "pid": os.getpid(),
+        "holds": _statistics.total,
+        "generation": _repository.generation,
+        "hot_reload": _hot_reloader.status() if _hot_reloader is not None else None
+    })
+
+def create_app():
+    """
+    uvicorn 워커용 ASGI 앱 팩토리
+    
+    각 워커 프로세스는 HOLD_DATA_SOURCE 로 같은 DB(공유) 또는 같은 Mock 데이터(복제)를 읽고,
+    응답 캐시는 워커별로 유지됩니다. MCP_STATELESS_HTTP=1 이면 세션 상태 없이 동작하므로
+    로드밸런서 뒤에서 요청이 어느 워커/노드로 가도 됩니다.
+    """
+    app = mcp.http_app(path="/mcp", stateless_http=os.getenv("MCP_STATELESS_HTTP", "1") == "1")
+    mcp_lifespan = app.router.lifespan_context
+    
+    @asynccontextmanager
+    async def lifespan(app_):
+        async with mcp_lifespan(app_) as state:
+            # 저장소 연결/통계 집계/규정집 색인은 여기서 (워커 스레드). 끝나기 전까지 /ready 는 503
+            await _ensure_initialized()
+            if _hot_reloader is not None:
+                _hot_reloader.start()
+            _serving_state["ready"] = True
+            try:
+                yield state
+            finally:
+                _serving_state["ready"] = False
+                if _hot_reloader is not None:
+                    await _hot_reloader.stop()
+    
+    app.router.lifespan_context = lifespan
+    return app
+
+def serve(argv: Optional[List[str]] = None) -> None:
+    """여러 워커 프로세스로 같은 포트에서 서빙합니다 (python hold_resolve_mcp.py serve --workers 4)."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="hold_resolve_mcp.py serve", description="Invoice Holding MCP 운영 서빙 모드")
+    parser.add_argument("--host", default=os.getenv("MCP_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("MCP_PORT", "3000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("MCP_WORKERS", str(os.cpu_count() or 1))))
+    parser.add_argument("--stateful", action="store_true", help="세션 상태 유지 (단일 워커 + 세션 고정 환경에서만)")
+    parser.add_argument("--graceful-timeout", type=int, default=30, help="종료 시 진행 중 요청 대기 시간(초)")
+    args = parser.parse_args(argv)
+    
+    if args.stateful and args.workers > 1:
+        parser.error("--stateful 은 --workers 1 에서만 사용할 수 있습니다 (세션이 워커 간에 공유되지 않음)")
+    os.environ["MCP_STATELESS_HTTP"] = "0" if args.stateful else "1"
+    
+    import uvicorn
+    print(f"🚀 Invoice Holding MCP Server: http://{args.host}:{args.port}/mcp (workers={args.workers})")
+    print(f"🩺 Health: /health  Ready: /ready  Metrics: /metrics")
+    uvicorn.run(
+        "hold_resolve_mcp:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level="info"
+    )
+
+async def run_streamable_http(port: int = 3000) -> None:
+    """단일 프로세스 streamable-http 서버를 실행하고, 같은 이벤트 루프에서 데이터/규정집 변경을 감시합니다."""
+    await _ensure_initialized()
+    if _hot_reloader is not None:
+        _hot_reloader.start()
+        print(f"♻️  Hot reload: {_hot_reloader.interval}초마다 규정집/홀딩 데이터 변경 확인")
+    _serving_state["ready"] = True
+    try:
+        await mcp.run_async(transport="streamable-http", port=port)
+    finally:
+        _serving_state["ready"] = False
+        if _hot_reloader is not None:
+            await _hot_reloader.stop()
+
+def save_openapi_schema(output_path: str = "openapi_schema.json"):
+    """OpenAPI 스키마를 JSON 파일로 저장합니다 (python hold_resolve_mcp.py openapi [경로])."""
     
     # 간단한 OpenAPI 스키마 생성
     openapi_schema = {
@@ -280,8 +1057,15 @@ def save_openapi_schema():
             "schemas": {
                 "HoldingInvoice": HoldingInvoice.model_json_schema(),
                 "HoldingReasonDetail": HoldingReasonDetail.model_json_schema(),
+                "HoldingInvoicePage": HoldingInvoicePage.model_json_schema(),
+                "HoldingReasonDetailPage": HoldingReasonDetailPage.model_json_schema(),
+                "HoldingReasonDetailBatch": HoldingReasonDetailBatch.model_json_schema(),
+                "CompactHoldingPayload": CompactHoldingPayload.model_json_schema(),
+                "RuleBookSearchResult": RuleBookSearchResult.model_json_schema(),
+                "ResolutionProcedure": ResolutionProcedure.model_json_schema(),
                 "ErrorResponse": ErrorResponse.model_json_schema(),
-                "InvoiceStatistics": InvoiceStatistics.model_json_schema()
+                "InvoiceStatistics": InvoiceStatistics.model_json_schema(),
+                "InvoiceStatisticsBreakdown": InvoiceStatisticsBreakdown.model_json_schema()
             }
         }
     }
@@ -290,8 +1074,12 @@ def save_openapi_schema():
     tools = [
         ("list_holding_invoices", "GET", "/api/v1/invoices/holding", "홀딩된 인보이스 목록 조회"),
         ("get_holding_reason_detail", "GET", "/api/v1/invoices/holding/{invoice_id}/reason", "특정 인보이스 홀딩 사유 조회"),
+        ("get_holding_reason_details", "POST", "/api/v1/invoices/holding/reasons/batch", "여러 인보이스 홀딩 사유 일괄 조회"),
         ("get_all_holding_reason_details", "GET", "/api/v1/invoices/holding/reasons/all", "모든 홀딩 사유 조회"),
-        ("get_invoice_statistics", "GET", "/api/v1/invoices/statistics", "인보이스 통계 조회")
+        ("get_resolution_procedure", "GET", "/api/v1/rule-book/procedures/{reason}", "홀딩 사유별 처리 절차 조회"),
+        ("search_rule_book", "GET", "/api/v1/rule-book/search", "규정집 처리 절차 검색"),
+        ("get_invoice_statistics", "GET", "/api/v1/invoices/statistics", "인보이스 통계 조회"),
+        ("get_invoice_statistics_breakdown", "GET", "/api/v1/invoices/statistics/breakdown", "인보이스 통계 상세 분포 조회")
     ]
     
     for tool_name, method, path, summary in tools:
@@ -323,32 +1111,42 @@ def save_openapi_schema():
                     "example": "INV-001"
                 }
             ]
+        
+        if "{reason}" in path:
+            openapi_schema["paths"][path][method.lower()]["parameters"] = [
+                {
+                    "name": "reason",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                    "description": "홀딩 사유",
+                    "example": "발주금액 불일치"
+                }
+            ]
     
     # OpenAPI 스키마를 파일로 저장
-    with open("openapi_schema.json", "w", encoding="utf-8") as f:
+    with open(output_path, "w", encoding="utf-8") as f:
         json.dump(openapi_schema, f, indent=2, ensure_ascii=False)
     
-    print("📄 OpenAPI 스키마가 'openapi_schema.json' 파일로 저장되었습니다.")
+    print(f"📄 OpenAPI 스키마가 '{output_path}' 파일로 저장되었습니다.")
     return openapi_schema
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(sys.argv[2:])
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "openapi":
+        # 스키마 생성은 기동 경로에서 제외 (모델이 바뀌었을 때만 명시적으로 실행)
+        save_openapi_schema(*sys.argv[2:3])
+        sys.exit(0)
+    
+    port = int(os.getenv("MCP_PORT", "3000"))
     print("🚀 Invoice Holding Management Server 시작")
-    print("🌐 MCP Server: http://localhost:3000")
-    print("🔧 MCP Tools: 4개의 도구가 등록됨")
-    print("")
-    print("📚 OpenAPI 문서를 생성하려면:")
-    print("   1. 서버를 실행한 후")
-    print("   2. 별도 터미널에서 'uvx mcpo --port 8000 -- python hold_resolve_mcp.py' 실행")
-    print("   3. http://localhost:8000/docs 에서 Swagger UI 확인")
-    print("")
-    print("또는 다음 명령으로 OpenAPI 스키마 파일을 생성:")
-    print("   python -c \"from hold_resolve_mcp import save_openapi_schema; save_openapi_schema()\"")
-    
-    # OpenAPI 스키마 파일 자동 생성 (안전하게)
-    try:
-        save_openapi_schema()
-    except Exception as e:
-        print(f"⚠️  OpenAPI 스키마 생성을 건너뜁니다: {e}")
+    print(f"🌐 MCP Server: http://localhost:{port}")
+    print(f"📡 NDJSON Stream: http://localhost:{port}/stream/holding-reason-details")
+    print("🔧 MCP Tools: 10개의 도구가 등록됨")
+    print("📚 OpenAPI 스키마 파일 생성: python hold_resolve_mcp.py openapi [openapi_schema.json]")
+    print("   (또는 'uvx mcpo --port 8000 -- python hold_resolve_mcp.py' 실행 후 http://localhost:8000/docs)")
     
     print("\n🎯 MCP 서버 시작 중...")
-    mcp.run(transport="streamable-http", port=3000)
\ No newline at end of file
+    asyncio.run(run_streamable_http(port=port))
@@ -4,17 +4,92 @@
 #export OCI_CONFIG_PROFILE=DXOCIAGENT
 
 import asyncio
-from mcp.client.session_group import StreamableHttpParameters
-from oci.addons.adk import Agent, AgentClient, tool
-from oci.addons.adk.mcp import MCPClientStreamableHttp
+import functools
+import os
+from contextlib import asynccontextmanager
+
+# OCI ADK / MCP 클라이언트는 무거우므로 첫 연결(open_agent) 때 가져옴 → 모듈 import 와 배너 출력이 빠름
+from agent_runner import AgentWorkerPool, BatchResult, run_batch
+from tracing import Tracer, format_summary, instrument_agent
+
+# 턴별 시간 분해는 항상 출력하고, TRACE_FILE / OTEL_EXPORTER_OTLP_ENDPOINT 가 있으면 span 도 내보냄
+tracer = Tracer.from_env("hold-resolve-cli")
+
+# 테스트 케이스를 동시에 실행할 워커(Agent) 수
+CLI_CONCURRENCY = int(os.getenv("CLI_CONCURRENCY", "3"))
+
+AGENT_INSTRUCTIONS = """
+            당신은 인보이스 홀딩 관리 전문가입니다. 
+            사용자의 질문에 따라 적절한 도구를 사용하여 다음과 같은 작업을 수행하세요:
+            1. 홀딩된 인보이스 목록 조회
+            2. 특정 인보이스의 홀딩 사유 상세 조회
+            3. 규정집 검색을 위한 키워드 제공
+            
+            여러 인보이스의 사유가 필요하면 get_holding_reason_detail 을 반복 호출하지 말고
+            get_holding_reason_details 로 한 번에 조회하세요.
+            처리 절차가 필요하면 get_holding_reason_detail 에 include_procedure=true 를 주어 한 번에 받으세요.
+            목록 도구는 필요한 필드만 fields 로 지정하고, 건수가 많으면 output_format="table" 을 사용하세요
+            (예: 사유 분포만 필요하면 fields=["invoice_id", "reason"]).
+            그 밖의 규정 내용은 search_query 를 search_rule_book 에 넘겨 규정집에서 관련 섹션을 찾으세요.
+            
+            한국어로 친절하고 상세하게 답변해주세요.
+            """
+
+TEST_CASES = [
+    # 테스트 케이스 1: 홀딩된 인보이스 목록 조회
+    "홀딩된 인보이스 목록을 보여주세요.",
+    # 테스트 케이스 2: 특정 인보이스 상세 사유 조회
+    "INV-001 인보이스의 홀딩 사유를 자세히 알려주세요.",
+    # 테스트 케이스 3: 다른 인보이스 조회
+    "INV-005 인보이스는 왜 홀딩되었나요? 규정집 검색 키워드도 알려주세요.",
+    # 테스트 케이스 4: 존재하지 않는 인보이스 조회
+    "INV-999 인보이스 정보를 알려주세요.",
+    # 테스트 케이스 5: 여러 인보이스 일괄 조회
+    "INV-001, INV-002, INV-999 인보이스의 홀딩 사유를 한 번에 알려주세요.",
+    # 테스트 케이스 6: 모든 홀딩 사유 조회
+    "모든 홀딩된 인보이스의 상세 사유를 보여주세요.",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def traced_mcp_client_class():
+    """MCPClientStreamableHttp 를 상속한 추적 클라이언트 클래스 (OCI ADK 를 처음 필요할 때 가져옴)"""
+    from mcp import types
+    from oci.addons.adk.mcp import MCPClientStreamableHttp
+
+    class TracedMCPClient(MCPClientStreamableHttp):
+        """도구 호출마다 mcp.<도구> span 을 열고, traceparent 를 요청 _meta 로 서버에 전달합니다."""
+
+        async def call_tool(self, tool_name, arguments):
+            with tracer.span(f"mcp.{tool_name}", category="mcp", tool=tool_name) as span:
+                if not self.session:
+                    return await super().call_tool(tool_name, arguments)
+                request = types.ClientRequest(types.CallToolRequest(
+                    method="tools/call",
+                    params=types.CallToolRequestParams(
+                        name=tool_name, arguments=arguments, _meta={"traceparent": span.traceparent}
+                    ),
+                ))
+                return await self.session.send_request(request, types.CallToolResult)
+
+    return TracedMCPClient
+
+
+@asynccontextmanager
+async def open_agent():
+    """
+    MCP 서버에 연결된 Agent 를 만듭니다.
+    MCP 세션은 연결한 이벤트 루프에 묶이므로 AgentWorkerPool 의 워커마다 하나씩 만들어 재사용합니다.
+    """
+    from mcp.client.session_group import StreamableHttpParameters
+    from oci.addons.adk import Agent, AgentClient
 
-async def main():
     # MCP 서버 연결 설정 (FastMCP 서버가 실행되는 주소)
     params = StreamableHttpParameters(
         url="http://localhost:3000/mcp",  # FastMCP 서버 주소
     )
 
-    async with MCPClientStreamableHttp(
+    async with traced_mcp_client_class()(
         params=params,
         name="Invoice Holding MCP Server",
     ) as mcp_client:
@@ -30,64 +105,49 @@ async def main():
         agent = Agent(
             client=client,
             agent_endpoint_id="ocid1.genaiagentendpoint.oc1.ap-osaka-1.amaaaaaarykjadqah2zw7mxczrxoa6o3ebdneenum4s5g5mqfk2urommiytq",
-            instructions="""
-            당신은 인보이스 홀딩 관리 전문가입니다. 
-            사용자의 질문에 따라 적절한 도구를 사용하여 다음과 같은 작업을 수행하세요:
-            1. 홀딩된 인보이스 목록 조회
-            2. 특정 인보이스의 홀딩 사유 상세 조회
-            3. 규정집 검색을 위한 키워드 제공
-            
-            한국어로 친절하고 상세하게 답변해주세요.
-            """,
+            instructions=AGENT_INSTRUCTIONS,
             tools=[await mcp_client.as_toolkit()],
         )
 
         # tool setting 이 안된 경우에만.
         # agent.setup()
 
-        print("=== Invoice Holding Management Client ===\n")
+        yield instrument_agent(agent, tracer)
 
-        # 테스트 케이스 1: 홀딩된 인보이스 목록 조회
-        input_message = "홀딩된 인보이스 목록을 보여주세요."
-        print(f"🔍 실행: {input_message}")
-        response = await agent.run_async(input_message)
-        response.pretty_print()
-        print("\n" + "="*60 + "\n")
 
-        # 테스트 케이스 2: 특정 인보이스 상세 사유 조회
-        input_message = "INV-001 인보이스의 홀딩 사유를 자세히 알려주세요."
-        print(f"🔍 실행: {input_message}")
-        response = await agent.run_async(input_message)
-        response.pretty_print()
-        print("\n" + "="*60 + "\n")
+async def run_turn(pool: AgentWorkerPool, question: str):
+    """질문 하나를 agent.turn span 으로 감싸 실행하고 (응답, 시간 분해) 를 반환합니다."""
+    with tracer.span("agent.turn", question=question) as span:
+        response = await pool.run(question)
+    return response, tracer.summarize(span.trace_id)
 
-        # 테스트 케이스 3: 다른 인보이스 조회
-        input_message = "INV-005 인보이스는 왜 홀딩되었나요? 규정집 검색 키워드도 알려주세요."
-        print(f"🔍 실행: {input_message}")
-        response = await agent.run_async(input_message)
-        response.pretty_print()
-        print("\n" + "="*60 + "\n")
 
-        # 테스트 케이스 4: 존재하지 않는 인보이스 조회
-        input_message = "INV-999 인보이스 정보를 알려주세요."
-        print(f"🔍 실행: {input_message}")
-        response = await agent.run_async(input_message)
+def print_result(result: BatchResult) -> None:
+    print(f"🔍 실행 [{result.index + 1}]: {result.question} ({result.elapsed:.1f}초)")
+    if result.ok:
+        response, summary = result.response
         response.pretty_print()
-        print("\n" + "="*60 + "\n")
+        print(f"⏱️  {format_summary(summary)}")
+    else:
+        print(f"❌ 오류 발생: {result.error!r}")
+    print("\n" + "="*60 + "\n")
 
-        # 테스트 케이스 5: 모든 홀딩 사유 조회
-        input_message = "모든 홀딩된 인보이스의 상세 사유를 보여주세요."
-        print(f"🔍 실행: {input_message}")
-        response = await agent.run_async(input_message)
-        response.pretty_print()
-        print("\n" + "="*60 + "\n")
+
+async def main():
+    async with AgentWorkerPool(open_agent, size=CLI_CONCURRENCY) as pool:
+
+        print("=== Invoice Holding Management Client ===\n")
+
+        # 테스트 케이스는 동시에 실행하고, 출력은 입력 순서대로
+        for result in await run_batch(TEST_CASES, functools.partial(run_turn, pool), concurrency=CLI_CONCURRENCY):
+            print_result(result)
 
         # 대화형 모드
         print("💬 대화형 모드를 시작합니다. 'quit' 또는 'exit'를 입력하면 종료됩니다.\n")
         
         while True:
             try:
-                user_input = input("❓ 질문: ").strip()
+                user_input = (await asyncio.to_thread(input, "❓ 질문: ")).strip()
                 
                 if user_input.lower() in ['quit', 'exit', '종료', '나가기']:
                     print("👋 클라이언트를 종료합니다.")
@@ -97,11 +157,12 @@ async def main():
                     continue
                 
                 print(f"\n🔍 처리 중: {user_input}")
-                response = await agent.run_async(user_input)
+                response, summary = await run_turn(pool, user_input)
                 response.pretty_print()
+                print(f"⏱️  {format_summary(summary)}")
                 print("\n" + "-"*40 + "\n")
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n\n👋 클라이언트를 종료합니다.")
                 break
             except Exception as e:
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+홀딩 통계 집계기 (Hold Statistics Aggregator)
+
+저장소의 추가/해제 이벤트를 받아 카운터를 증분 갱신합니다.
+대시보드가 통계를 자주 조회해도 전체 인보이스를 다시 순회하지 않습니다.
+
+- 사유별 건수 + 건수 버킷(count -> 사유 집합): 최다 사유를 O(1)로 조회
+- ORG_ID별 / 홀딩 일자별 건수
+- 홀딩 경과일(aging) 구간별 건수는 일자별 건수에서 계산 (고유 일자 수에 비례)
+- 변경 이벤트는 요청 스레드와 핫 리로드 워커 스레드에서 모두 오므로 갱신/조회는 락 안에서 수행
+"""
+import threading
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from hold_store import HoldListener, HoldRecord, HoldRepository
+
+# 홀딩 경과일 구간: (라벨, 최소 일수, 최대 일수 - None 이면 상한 없음)
+AGING_BUCKETS: List[Tuple[str, int, Optional[int]]] = [
+    ("0-7일", 0, 7),
+    ("8-30일", 8, 30),
+    ("31-60일", 31, 60),
+    ("61-90일", 61, 90),
+    ("90일 초과", 91, None),
+]
+
+
+class HoldStatistics(HoldListener):
+    """증분 갱신되는 홀딩 통계"""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self._reason_count: Dict[str, int] = {}
+        # count -> {reason: None} (삽입 순서를 보존하는 집합)
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._max_count = 0
+        self._org_count: Dict[int, int] = {}
+        self._day_count: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def attach(cls, repository: HoldRepository) -> "HoldStatistics":
+        """저장소의 현재 데이터로 초기화한 뒤 변경 이벤트를 구독합니다."""
+        statistics = cls()
+        counts = repository.aggregate_counts()
+        if counts is None:
+            for record in repository.iter_records():
+                statistics.on_hold_added(record)
+        else:
+            with statistics._lock:
+                for reason, count in counts["reason"].items():
+                    statistics.total += count
+                    statistics._move_reason(reason, count)
+                statistics._org_count = dict(counts["org_id"])
+                statistics._day_count = dict(counts["hold_date"])
+        repository.subscribe(statistics)
+        return statistics
+
+    def on_hold_added(self, record: HoldRecord) -> None:
+        self._apply(record, +1)
+
+    def on_hold_released(self, record: HoldRecord) -> None:
+        self._apply(record, -1)
+
+    def _apply(self, record: HoldRecord, delta: int) -> None:
+        with self._lock:
+            self.total += delta
+            self._move_reason(record["reason"], delta)
+            _increment(self._org_count, record.get("org_id"), delta)
+            _increment(self._day_count, record.get("hold_date"), delta)
+
+    def _move_reason(self, reason: str, delta: int) -> None:
+        """사유를 현재 건수 버킷에서 (건수 + delta) 버킷으로 옮깁니다."""
+        old_count = self._reason_count.get(reason, 0)
+        new_count = old_count + delta
+
+        if old_count:
+            bucket = self._buckets[old_count]
+            del bucket[reason]
+            if not bucket:
+                del self._buckets[old_count]
+                # 최다 버킷이 비었다면 감소한 사유가 바로 아래 버킷에 있으므로 1만 내리면 됩니다.
+                if old_count == self._max_count and delta < 0:
+                    self._max_count = new_count
+
+        if new_count:
+            self._reason_count[reason] = new_count
+            self._buckets.setdefault(new_count, {})[reason] = None
+            self._max_count = max(self._max_count, new_count)
+        else:
+            self._reason_count.pop(reason, None)
+
+    @property
+    def most_common(self) -> Tuple[str, int]:
+        """가장 많은 사유와 건수. 홀딩이 없으면 ("없음", 0)."""
+        with self._lock:
+            if not self._max_count:
+                return ("없음", 0)
+            return next(iter(self._buckets[self._max_count])), self._max_count
+
+    @property
+    def reason_distribution(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._reason_count)
+
+    @property
+    def org_distribution(self) -> Dict[int, int]:
+        with self._lock:
+            return dict(self._org_count)
+
+    @property
+    def daily_distribution(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(sorted(self._day_count.items()))
+
+    @property
+    def unique_reasons(self) -> int:
+        with self._lock:
+            return len(self._reason_count)
+
+    def aging_distribution(self, as_of: Optional[date] = None) -> Dict[str, int]:
+        """기준일(as_of, 기본값 오늘) 대비 홀딩 경과일 구간별 건수를 반환합니다."""
+        as_of = as_of or date.today()
+        result = {label: 0 for label, _, _ in AGING_BUCKETS}
+        with self._lock:
+            day_count = dict(self._day_count)
+        for hold_date, count in day_count.items():
+            age = max((as_of - date.fromisoformat(hold_date)).days, 0)
+            for label, low, high in AGING_BUCKETS:
+                if age >= low and (high is None or age <= high):
+                    result[label] += count
+                    break
+        return result
+
+
+def _increment(counter: dict, key, delta: int) -> None:
+    if key is None:
+        return
+    value = counter.get(key, 0) + delta
+    if value:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+홀딩 인보이스 저장소 (Hold Repository)
+
+MCP 도구들이 전체 목록을 매번 스캔하지 않도록, 홀딩 데이터를 보조 인덱스와 함께 보관합니다.
+
+- 사유(reason) / HOLD_LOOKUP_CODE / ORG_ID 별 인덱스: 삽입 순번(seq) 오름차순 리스트
+- 홀딩일자(hold_date) 인덱스: (hold_date, seq) 오름차순 리스트
+- 커서 기반 페이지네이션: 마지막으로 반환한 인덱스 키를 불투명(opaque) 문자열로 인코딩
+
+한 번의 조회 비용은 인덱스 탐색(bisect) + 페이지 크기만큼의 순회로, 전체 홀딩 건수와 무관합니다.
+
+저장소가 보관/반환하는 레코드는 HoldRow(__slots__ 레코드)입니다. 행마다 dict 를 두지 않아 메모리가 작고,
+사유/상태/코드 같은 반복 문자열은 sys.intern 으로 한 객체를 공유합니다. Pydantic 모델은 도구 응답을
+내보낼 때만(API 경계) 사용합니다.
+"""
+import base64
+import sys
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# 저장소 레코드는 MOCK_HOLDING_INVOICES + HOLDING_REASON_DETAILS 를 합친 매핑입니다 (add() 는 dict 도 받음).
+# 필수 키: id, status, reason / 선택 키: hold_lookup_code, org_id, hold_date, detail, search_query, hold_id
+HoldRecord = Mapping[str, Any]
+
+HOLD_ROW_FIELDS = ("id", "status", "reason", "hold_lookup_code", "org_id", "hold_date", "detail", "search_query", "hold_id")
+_HOLD_ROW_FIELD_SET = frozenset(HOLD_ROW_FIELDS)
+
+
+def intern_text(value: Any) -> Any:
+    """반복되는 문자열 값을 sys.intern 으로 공유합니다 (문자열이 아니면 그대로)."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@lru_cache(maxsize=4096)
+def default_search_query(reason: str) -> str:
+    """search_query 가 없는 레코드의 기본 검색어 (사유별로 한 문자열을 공유)"""
+    return sys.intern(f"{reason} 처리 절차")
+
+
+class HoldRow(Mapping):
+    """
+    홀딩 레코드 한 건 (__slots__, 검증 없음)
+
+    저장소가 만든 신뢰할 수 있는 데이터만 담으므로 생성 시 검증하지 않습니다.
+    dict 레코드처럼 record["reason"] / record.get("org_id") 로 읽을 수 있고(키는 항상 HOLD_ROW_FIELDS),
+    같은 속성 이름(row.reason)으로 더 빠르게 읽을 수 있습니다. 생성 후에는 바꾸지 않습니다.
+    """
+
+    __slots__ = HOLD_ROW_FIELDS
+
+    def __init__(
+        self,
+        id: str,
+        status: str,
+        reason: str,
+        hold_lookup_code: Optional[str] = None,
+        org_id: Optional[int] = None,
+        hold_date: Optional[str] = None,
+        detail: str = "",
+        search_query: str = "",
+        hold_id: Optional[int] = None,
+    ) -> None:
+        self.id = id
+        self.status = status
+        self.reason = reason
+        self.hold_lookup_code = hold_lookup_code
+        self.org_id = org_id
+        self.hold_date = hold_date
+        self.detail = detail
+        self.search_query = search_query
+        self.hold_id = hold_id
+
+    @classmethod
+    def from_record(cls, record: HoldRecord) -> "HoldRow":
+        """dict 레코드(Mock 데이터, 델타 로그 등)를 반복 문자열을 intern 한 HoldRow 로 바꿉니다."""
+        if isinstance(record, HoldRow):
+            return record
+        get = record.get
+        return cls(
+            record["id"],
+            intern_text(get("status")),
+            intern_text(record["reason"]),
+            intern_text(get("hold_lookup_code")),
+            get("org_id"),
+            intern_text(get("hold_date")),
+            get("detail") or "",
+            intern_text(get("search_query") or ""),
+            get("hold_id"),
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _HOLD_ROW_FIELD_SET:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _HOLD_ROW_FIELD_SET else default
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(HOLD_ROW_FIELDS)
+
+    def __len__(self) -> int:
+        return len(HOLD_ROW_FIELDS)
+
+    def __reduce__(self):
+        # 프로세스 풀로 보낼 때 (클래스, 값 튜플) 만 피클링
+        return HoldRow, tuple(getattr(self, field) for field in HOLD_ROW_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"HoldRow({dict(self)!r})"
+
+
+class InvalidCursorError(ValueError):
+    """잘못된 페이지 커서"""
+
+
+class InvalidFilterError(ValueError):
+    """잘못된 조회 조건 (예: YYYY-MM-DD 가 아닌 홀딩 일자)"""
+
+
+class ReadOnlyRepositoryError(RuntimeError):
+    """읽기 전용 저장소에 추가/해제를 시도함"""
+
+
+def encode_cursor(key: Tuple) -> str:
+    """인덱스 키를 불투명 커서 문자열로 변환합니다."""
+    raw = "|".join(str(part) for part in key)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> List[str]:
+    """커서 문자열을 인덱스 키 구성요소로 되돌립니다."""
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+
+def check_date_filter(name: str, value: Optional[str]) -> Optional[str]:
+    """홀딩 일자 조건이 YYYY-MM-DD 형식의 실제 날짜인지 확인합니다. 아니면 InvalidFilterError."""
+    if value is None:
+        return None
+    try:
+        if len(value) != 10:
+            raise ValueError(value)
+        date.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        raise InvalidFilterError(f"Invalid {name} {value!r} (expected YYYY-MM-DD)") from e
+    return value
+
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    """페이지 크기를 1 ~ MAX_PAGE_SIZE 범위로 제한합니다."""
+    if not page_size:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(page_size), MAX_PAGE_SIZE))
+
+
+class HoldListener(ABC):
+    """저장소 변경 이벤트 리스너"""
+
+    @abstractmethod
+    def on_hold_added(self, record: HoldRecord) -> None:
+        """홀딩이 추가되었을 때 호출됩니다."""
+
+    @abstractmethod
+    def on_hold_released(self, record: HoldRecord) -> None:
+        """홀딩이 해제되었을 때 호출됩니다."""
+
+
+class HoldRepository(ABC):
+    """
+    홀딩 데이터 저장소 인터페이스
+
+    MCP 서버는 이 인터페이스만 사용하므로, 메모리/DB 등 다른 구현으로 교체할 수 있습니다.
+    """
+
+    # 조회가 DB/파일 I/O 로 막힐 수 있으면 True (MCP 서버가 도구 본문을 스레드 풀로 넘김)
+    blocking_io = False
+    # 원본 시스템(EBS 등)의 데이터를 읽기만 하는 저장소면 True (add/release 는 ReadOnlyRepositoryError)
+    read_only = False
+
+    def __init__(self) -> None:
+        self._listeners: List[HoldListener] = []
+        # 변경될 때마다 증가하는 세대 번호 (응답 캐시 무효화에 사용)
+        self.generation = 0
+
+    def subscribe(self, listener: HoldListener) -> None:
+        """추가/해제 이벤트를 받을 리스너(통계 집계기 등)를 등록합니다."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: HoldListener) -> None:
+        """리스너 등록을 해제합니다 (통계를 다시 만들어 교체할 때)."""
+        self._listeners = [registered for registered in self._listeners if registered is not listener]
+
+    def _notify_add(self, record: HoldRecord) -> None:
+        self.generation += 1
+        for listener in self._listeners:
+            listener.on_hold_added(record)
+
+    def _notify_release(self, record: HoldRecord) -> None:
+        self.generation += 1
+        for listener in self._listeners:
+            listener.on_hold_released(record)
+
+    @abstractmethod
+    def get(self, invoice_id: str) -> Optional[HoldRow]:
+        """인보이스 ID로 단건 조회합니다. 없으면 None."""
+
+    @abstractmethod
+    def query(
+        self,
+        reason: Optional[str] = None,
+        hold_lookup_code: Optional[str] = None,
+        org_id: Optional[int] = None,
+        hold_date_from: Optional[str] = None,
+        hold_date_to: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> Tuple[List[HoldRow], Optional[str]]:
+        """필터 조건에 맞는 한 페이지와 다음 페이지 커서(마지막 페이지면 None)를 반환합니다."""
+
+    @abstractmethod
+    def add(self, record: HoldRecord) -> None:
+        """홀딩을 추가합니다. 같은 ID가 있으면 교체합니다."""
+
+    @abstractmethod
+    def release(self, invoice_id: str) -> Optional[HoldRow]:
+        """홀딩을 해제(삭제)하고 해제된 레코드를 반환합니다."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """현재 홀딩 건수"""
+
+    def ping(self) -> bool:
+        """저장소가 요청을 처리할 수 있는지 확인합니다 (readiness 체크용)."""
+        return True
+
+    def ids(self) -> List[str]:
+        """전체 인보이스 ID 목록 (디버깅/에러 응답용)"""
+        return [record["id"] for record in self.iter_records()]
+
+    def nearby_ids(self, key: str, k: int) -> Optional[List[str]]:
+        """
+        저장소가 INVOICE_ID 순서 인덱스로 직접 찾을 수 있으면, key 이상인 열린 홀딩 ID 최대 k개(오름차순)와
+        key 미만인 ID 최대 k개(내림차순)를 이어서 반환합니다 (ID 추천용).
+        None 이면 지원하지 않으므로 ID 추천 인덱스가 ids() 로 전체 ID 를 읽어 직접 유지합니다.
+        """
+        return None
+
+    def aggregate_counts(self) -> Optional[Dict[str, Dict[Any, int]]]:
+        """
+        저장소가 직접 집계할 수 있으면 사유("reason") / "org_id" / "hold_date" 별 건수를 반환합니다.
+        None 이면 통계 초기화 시 iter_records() 로 전체를 순회합니다.
+        """
+        return None
+
+    def iter_records(self, **filters: Any) -> Iterator[HoldRow]:
+        """필터에 맞는 모든 레코드를 페이지 단위로 순회합니다."""
+        cursor = None
+        while True:
+            records, cursor = self.query(cursor=cursor, page_size=MAX_PAGE_SIZE, **filters)
+            yield from records
+            if cursor is None:
+                return
+
+
+class InMemoryHoldRepository(HoldRepository):
+    """
+    보조 인덱스를 갖춘 메모리 저장소
+
+    모든 인덱스 리스트는 정렬 상태를 유지하므로, 커서 위치는 bisect로 O(log n)에 찾습니다.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._seq = 0
+        self._records: Dict[int, HoldRow] = {}             # seq -> record
+        self._seq_by_id: Dict[str, int] = {}                # invoice_id -> seq
+        self._all: List[int] = []                           # seq 오름차순
+        self._by_reason: Dict[str, List[int]] = {}
+        self._by_code: Dict[str, List[int]] = {}
+        self._by_org: Dict[int, List[int]] = {}
+        self._by_date: List[Tuple[str, int]] = []           # (hold_date, seq) 오름차순
+
+    @classmethod
+    def from_mock(cls, invoices: List[dict], details: Dict[str, dict]) -> "InMemoryHoldRepository":
+        """MOCK_HOLDING_INVOICES 와 HOLDING_REASON_DETAILS 를 합쳐 저장소를 만듭니다."""
+        repository = cls()
+        for invoice in invoices:
+            record = dict(invoice)
+            detail_info = details.get(invoice["id"], {})
+            record.setdefault("detail", detail_info.get("detail", ""))
+            record.setdefault("search_query", detail_info.get("search_query", ""))
+            repository.add(record)
+        return repository
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, invoice_id: str) -> Optional[HoldRow]:
+        seq = self._seq_by_id.get(invoice_id)
+        return None if seq is None else self._records[seq]
+
+    def ids(self) -> List[str]:
+        return list(self._seq_by_id.keys())
+
+    def add(self, record: HoldRecord) -> None:
+        record = HoldRow.from_record(record)
+        if record.id in self._seq_by_id:
+            self.release(record.id)
+        self._seq += 1
+        seq = self._seq
+        self._records[seq] = record
+        self._seq_by_id[record.id] = seq
+        self._all.append(seq)
+        self._by_reason.setdefault(record.reason, []).append(seq)
+        if record.hold_lookup_code:
+            self._by_code.setdefault(record.hold_lookup_code, []).append(seq)
+        if record.org_id is not None:
+            self._by_org.setdefault(record.org_id, []).append(seq)
+        if record.hold_date:
+            insort(self._by_date, (record.hold_date, seq))
+        self._notify_add(record)
+
+    def release(self, invoice_id: str) -> Optional[HoldRow]:
+        seq = self._seq_by_id.pop(invoice_id, None)
+        if seq is None:
+            return None
+        record = self._records.pop(seq)
+        _remove_sorted(self._all, seq)
+        _remove_from_index(self._by_reason, record.reason, seq)
+        _remove_from_index(self._by_code, record.hold_lookup_code, seq)
+        _remove_from_index(self._by_org, record.org_id, seq)
+        if record.hold_date:
+            _remove_sorted(self._by_date, (record.hold_date, seq))
+        self._notify_release(record)
+        return record
+
+    def query(
+        self,
+        reason: Optional[str] = None,
+        hold_lookup_code: Optional[str] = None,
+        org_id: Optional[int] = None,
+        hold_date_from: Optional[str] = None,
+        hold_date_to: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> Tuple[List[HoldRow], Optional[str]]:
+        limit = clamp_page_size(page_size)
+        check_date_filter("hold_date_from", hold_date_from)
+        check_date_filter("hold_date_to", hold_date_to)
+        seq_indexes = []
+        if reason is not None:
+            seq_indexes.append(self._by_reason.get(reason, []))
+        if hold_lookup_code is not None:
+            seq_indexes.append(self._by_code.get(hold_lookup_code, []))
+        if org_id is not None:
+            seq_indexes.append(self._by_org.get(org_id, []))
+
+        def in_date_range(record: HoldRow) -> bool:
+            hold_date = record.hold_date
+            if hold_date_from is not None and (not hold_date or hold_date < hold_date_from):
+                return False
+            if hold_date_to is not None and (not hold_date or hold_date > hold_date_to):
+                return False
+            return True
+
+        has_date_filter = hold_date_from is not None or hold_date_to is not None
+
+        if not seq_indexes and has_date_filter:
+            # 날짜 조건만 있는 경우: 날짜 인덱스를 구간 탐색
+            return self._query_by_date(hold_date_from, hold_date_to, cursor, limit)
+
+        # 가장 선택도가 높은(짧은) 인덱스를 기준으로 순회하고 나머지 조건은 술어로 검사
+        candidates = min(seq_indexes, key=len) if seq_indexes else self._all
+        predicates: List[Callable[[HoldRow], bool]] = []
+        if reason is not None:
+            predicates.append(lambda r: r.reason == reason)
+        if hold_lookup_code is not None:
+            predicates.append(lambda r: r.hold_lookup_code == hold_lookup_code)
+        if org_id is not None:
+            predicates.append(lambda r: r.org_id == org_id)
+        if has_date_filter:
+            predicates.append(in_date_range)
+
+        start = 0
+        if cursor:
+            parts = decode_cursor(cursor)
+            try:
+                start = bisect_right(candidates, int(parts[-1]))
+            except ValueError as e:
+                raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+        page: List[HoldRow] = []
+        last_seq = None
+        for position in range(start, len(candidates)):
+            seq = candidates[position]
+            record = self._records[seq]
+            if all(predicate(record) for predicate in predicates):
+                if len(page) == limit:
+                    return page, encode_cursor((last_seq,))
+                page.append(record)
+                last_seq = seq
+        return page, None
+
+    def _query_by_date(
+        self,
+        hold_date_from: Optional[str],
+        hold_date_to: Optional[str],
+        cursor: Optional[str],
+        limit: int,
+    ) -> Tuple[List[HoldRow], Optional[str]]:
+        """홀딩일자 인덱스에서 [from, to] 구간을 커서 이후부터 잘라 반환합니다."""
+        start = bisect_left(self._by_date, (hold_date_from,)) if hold_date_from is not None else 0
+        if cursor:
+            parts = decode_cursor(cursor)
+            try:
+                start = max(start, bisect_right(self._by_date, (parts[0], int(parts[1]))))
+            except (ValueError, IndexError) as e:
+                raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+        # 같은 날짜의 모든 seq 를 포함하도록 상한은 (to, +inf) 로 탐색
+        end = bisect_right(self._by_date, (hold_date_to, float("inf"))) if hold_date_to is not None else len(self._by_date)
+
+        window = self._by_date[start:min(end, start + limit)]
+        page = [self._records[seq] for _, seq in window]
+        next_cursor = encode_cursor(window[-1]) if window and start + limit < end else None
+        return page, next_cursor
+
+
+def _remove_sorted(items: list, value: Any) -> None:
+    """정렬된 리스트에서 값을 이진 탐색으로 찾아 제거합니다."""
+    position = bisect_left(items, value)
+    if position < len(items) and items[position] == value:
+        del items[position]
+
+
+def _remove_from_index(index: Dict[Any, List[int]], key: Any, seq: int) -> None:
+    if key is None or key not in index:
+        return
+    _remove_sorted(index[key], seq)
+    if not index[key]:
+        del index[key]
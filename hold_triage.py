@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+오프라인 홀딩 일괄 분류 (Hold Triage)
+
+열린 홀딩 전체를 LLM 대화 없이 규정집(GuideBook.md) 규칙으로 분류해 권장 조치와 담당 부서를 만듭니다.
+대부분의 사유는 규정집 기준(예: 단가 차이 5% 이내 → 구매팀장 승인)으로 결정되므로,
+LLM 에이전트(hold_resolve_mcp_cli)는 규칙으로 판단할 수 없는 홀딩에만 사용합니다.
+
+- 읽기: HOLD_DATA_SOURCE 저장소를 iter_records() 로 페이지 단위 스트리밍
+- 분류: 청크 단위로 프로세스 풀에서 실행 (사유 → 처리 절차 테이블은 워커마다 한 번만 전달)
+  사유는 규정집 섹션 제목과 정확히(공백 차이만 허용) 일치할 때만 규칙을 적용하고,
+  "기타 불일치" 처럼 일부만 겹치는 사유는 다른 사유의 규칙으로 처리하지 않고 decision="llm" 으로 남깁니다.
+- 쓰기: 입력 순서대로 NDJSON 한 줄씩 바로 기록 (처리 중인 청크 수를 제한하므로 메모리는 건수와 무관)
+- 판단 불가(decision="llm") 홀딩은 --ambiguous 파일로 따로 모아 llm 명령으로 에이전트에 넘깁니다.
+
+사용법:
+    python hold_triage.py run triage.ndjson --workers 8 --ambiguous leftovers.ndjson
+    HOLD_DATA_SOURCE=snapshot:////data/holds_1m python hold_triage.py run triage.ndjson --chunk-rows 5000
+    python hold_triage.py llm leftovers.ndjson --output leftovers_llm.ndjson --limit 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from hold_store import HoldRecord, HoldRepository
+from rulebook_procedures import ProcedureRecord, build_procedure_table, find_procedure
+from rulebook_search import RULE_BOOK_PATH, parse_sections
+
+DEFAULT_CHUNK_ROWS = 2000
+# 워커당 동시에 처리 중일 수 있는 청크 수 (출력 순서를 지키면서 워커가 쉬지 않을 만큼)
+PENDING_CHUNKS_PER_WORKER = 2
+DEFAULT_VARIANCE_THRESHOLD = 5.0
+
+# 분류 결과 한 건 (NDJSON 한 줄)
+TriageResult = Dict[str, Any]
+# 상세 설명 + 처리 절차 → 조치 (판단할 수 없으면 None)
+Rule = Callable[[str, ProcedureRecord], Optional[Dict[str, Any]]]
+
+_AMOUNT = re.compile(r"₩\s*([\d,]+)")
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_UNIT_PRICES = re.compile(r"단가\s*\(\s*₩\s*([\d,]+)\s*\).*?단가\s*\(\s*₩\s*([\d,]+)\s*\)")
+_QUANTITIES = re.compile(r"발주\s*수량\s*([\d,]+)\s*개.*?인보이스\s*수량[이은]?\s*([\d,]+)\s*개")
+_BUDGET = re.compile(r"예산\s*₩\s*([\d,]+).*?₩\s*([\d,]+)\s*사용.*?금액\s*₩\s*([\d,]+)")
+_INVOICE_REF = re.compile(r"인보이스\s*\(\s*([A-Za-z]+-[\w-]+)\s*\)")
+_PO_NUMBER = re.compile(r"\bPO-[\w-]+")
+_BRANCH_THRESHOLD = re.compile(r"(\d+(?:\.\d+)?)\s*%\s*이내")
+_APPROVER = re.compile(r"^(\S+?)\s*승인")
+
+
+def _number(text: str) -> int:
+    return int(text.replace(",", ""))
+
+
+def load_procedure_table(path: str = RULE_BOOK_PATH) -> Dict[str, ProcedureRecord]:
+    """규정집 마크다운을 바로 파싱해 사유 → 처리 절차 테이블을 만듭니다 (검색 인덱스는 만들지 않음)."""
+    with open(path, encoding="utf-8") as f:
+        return build_procedure_table(parse_sections(f.read()))
+
+
+def _step(procedure: ProcedureRecord, number: int) -> Optional[Dict[str, Any]]:
+    return next((step for step in procedure["steps"] if step["step"] == number), None)
+
+
+def _branch_actions(procedure: ProcedureRecord, branch: str) -> List[str]:
+    """'라벨: 조치' 형식의 단계별 조치 중 라벨에 branch 가 들어간 조치만 라벨을 떼고 반환합니다."""
+    actions = []
+    for step in procedure["steps"]:
+        for action in step["actions"]:
+            label, separator, text = action.partition(": ")
+            if separator and branch in label:
+                actions.append(text)
+    return actions
+
+
+def _variance_threshold(procedure: ProcedureRecord) -> float:
+    """승인 분기 라벨(예: "5% 이내 차이")의 기준 비율. 규정집에 없으면 5%."""
+    for step in procedure["steps"]:
+        for action in step["actions"]:
+            match = _BRANCH_THRESHOLD.search(action.partition(": ")[0])
+            if match:
+                return float(match.group(1))
+    return DEFAULT_VARIANCE_THRESHOLD
+
+
+def _outcome(action: str, procedure: ProcedureRecord, actions: List[str], step: int = 1, **extra: Any) -> Dict[str, Any]:
+    selected = _step(procedure, step) or {}
+    outcome = {
+        "action": action,
+        "route": procedure.get("owner"),
+        "recommended_actions": actions or list(selected.get("actions", [])),
+        "processing_time": selected.get("processing_time"),
+    }
+    outcome.update(extra)
+    return outcome
+
+
+def _price_variance_rule(detail: str, procedure: ProcedureRecord) -> Optional[Dict[str, Any]]:
+    match = _UNIT_PRICES.search(detail)
+    if not match:
+        return None
+    ordered, invoiced = _number(match.group(1)), _number(match.group(2))
+    if not ordered:
+        return None
+    variance = (invoiced - ordered) / ordered * 100
+    threshold = _variance_threshold(procedure)
+    branch = "이내" if abs(variance) <= threshold else "초과"
+    actions = _branch_actions(procedure, branch)
+    approver = _APPROVER.match(actions[0]) if actions else None
+    return _outcome(
+        "approve_price_variance" if branch == "이내" else "escalate_price_variance",
+        procedure, actions, step=2,
+        approver=approver.group(1) if approver else None,
+        metrics={"po_unit_price": ordered, "invoice_unit_price": invoiced,
+                 "variance_pct": round(variance, 2), "threshold_pct": threshold},
+    )
+
+
+def _quantity_rule(detail: str, procedure: ProcedureRecord) -> Optional[Dict[str, Any]]:
+    match = _QUANTITIES.search(detail)
+    if not match:
+        return None
+    ordered, invoiced = _number(match.group(1)), _number(match.group(2))
+    if ordered == invoiced:
+        return None
+    shortage = invoiced < ordered
+    return _outcome(
+        "confirm_partial_delivery" if shortage else "resolve_over_delivery",
+        procedure, _branch_actions(procedure, "부분 납품" if shortage else "과다 납품"), step=2,
+        metrics={"ordered_qty": ordered, "invoiced_qty": invoiced, "difference": invoiced - ordered},
+    )
+
+
+def _budget_rule(detail: str, procedure: ProcedureRecord) -> Optional[Dict[str, Any]]:
+    match = _BUDGET.search(detail)
+    if not match:
+        return None
+    budget, used, amount = (_number(group) for group in match.groups())
+    over = used + amount - budget
+    if not budget or over <= 0:
+        return None
+    return _outcome(
+        "budget_adjustment", procedure, [], step=2,
+        metrics={"budget": budget, "used": used, "invoice_amount": amount, "over_amount": over,
+                 "usage_pct": round((used + amount) / budget * 100, 2)},
+    )
+
+
+def _tax_rule(detail: str, procedure: ProcedureRecord) -> Optional[Dict[str, Any]]:
+    rates = [float(rate) for rate in _PERCENT.findall(detail)]
+    metrics = {"expected_rate_pct": rates[0], "applied_rate_pct": rates[1]} if len(rates) >= 2 else {}
+    return _outcome("reissue_tax_invoice", procedure, [], metrics=metrics)
+
+
+def _duplicate_rule(detail: str, procedure: ProcedureRecord) -> Optional[Dict[str, Any]]:
+    original = _INVOICE_REF.search(detail)
+    po_number = _PO_NUMBER.search(detail)
+    if not original and not po_number:
+        # 무엇과 중복인지 알 수 없으면 사람이(LLM 이) 확인
+        return None
+    return _outcome(
+        "cancel_duplicate", procedure, [],
+        metrics={"original_invoice_id": original.group(1) if original else None,
+                 "po_number": po_number.group(0) if po_number else None},
+    )
+
+
+def _approver_absent_rule(detail: str, procedure: ProcedureRecord) -> Optional[Dict[str, Any]]:
+    amounts = [_number(amount) for amount in _AMOUNT.findall(detail)]
+    return _outcome("delegate_approval", procedure, [], step=2, metrics={"approval_limit": amounts[0]} if amounts else {})
+
+
+# 규정집 사유(섹션 제목) → 규칙. 여기에 없는 사유는 1단계 절차를 그대로 권장합니다.
+RULES: Dict[str, Rule] = {
+    "발주금액 불일치": _price_variance_rule,
+    "수량 불일치": _quantity_rule,
+    "예산 초과": _budget_rule,
+    "세금 계산 오류": _tax_rule,
+    "중복 인보이스": _duplicate_rule,
+    "승인자 부재": _approver_absent_rule,
+}
+
+DEFAULT_ACTIONS = {
+    "재고 부족": "assess_stock_urgency",
+    "공급업체 신용도 검토 필요": "vendor_credit_review",
+    "계약서 조건 불일치": "reconcile_contract_terms",
+    "배송정보 누락": "collect_shipping_info",
+}
+
+
+def triage_record(record: HoldRecord, table: Dict[str, ProcedureRecord], procedures: Optional[Dict[str, Any]] = None) -> TriageResult:
+    """
+    홀딩 한 건을 분류합니다. 규칙으로 결정되면 decision="auto", 아니면 decision="llm" 과 이유(note).
+    procedures 는 사유 문자열 → 절차 조회 결과 메모 (청크 안에서 재사용)
+    """
+    reason = record.get("reason") or ""
+    result: TriageResult = {
+        "invoice_id": record["id"],
+        "hold_id": record.get("hold_id"),
+        "reason": reason,
+        "org_id": record.get("org_id"),
+        "hold_date": record.get("hold_date"),
+    }
+    if procedures is None:
+        procedures = {}
+    if reason not in procedures:
+        procedures[reason] = find_procedure(table, reason)
+    procedure = procedures[reason]
+    if procedure is None:
+        # 부분 일치로 다른 사유의 규칙을 적용하지 않도록 find_procedure 는 정확히 일치하는 사유만 반환
+        result.update(decision="llm", note="규정집에 없는 사유")
+        return result
+
+    rule = RULES.get(procedure["reason"])
+    if rule is None:
+        outcome = _outcome(DEFAULT_ACTIONS.get(procedure["reason"], "follow_procedure"), procedure, [])
+    else:
+        outcome = rule(record.get("detail") or "", procedure)
+    if outcome is None:
+        result.update(decision="llm", section=procedure["section"], note="상세 설명으로 규정집 기준을 판단할 수 없음")
+        return result
+    result.update(decision="auto", section=procedure["section"], **outcome)
+    return result
+
+
+# 프로세스 풀 워커 상태 (initializer 로 한 번만 전달)
+_worker_table: Dict[str, ProcedureRecord] = {}
+
+
+def _init_worker(table: Dict[str, ProcedureRecord]) -> None:
+    global _worker_table
+    _worker_table = table
+
+
+def triage_chunk(records: List[HoldRecord], table: Optional[Dict[str, ProcedureRecord]] = None) -> List[Tuple[str, str, str]]:
+    """청크를 분류해 (decision, 사유, NDJSON 줄) 목록을 반환합니다. 직렬화까지 워커에서 끝냅니다."""
+    table = _worker_table if table is None else table
+    procedures: Dict[str, Any] = {}
+    lines = []
+    for record in records:
+        result = triage_record(record, table, procedures)
+        lines.append((result["decision"], result.get("action") or "", json.dumps(result, ensure_ascii=False, default=str)))
+    return lines
+
+
+def iter_chunks(records: Iterable[HoldRecord], chunk_rows: int) -> Iterator[List[HoldRecord]]:
+    chunk: List[HoldRecord] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_triage(
+    records: Iterable[HoldRecord],
+    output: TextIO,
+    table: Optional[Dict[str, ProcedureRecord]] = None,
+    ambiguous_output: Optional[TextIO] = None,
+    workers: Optional[int] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    레코드를 청크 단위로 분류해 입력 순서대로 output 에 기록하고 요약을 반환합니다.
+    workers=0 이면 현재 프로세스에서 실행, None 이면 CPU 수만큼 프로세스를 띄웁니다.
+    """
+    table = load_procedure_table() if table is None else table
+    summary: Dict[str, Any] = {"total": 0, "auto": 0, "llm": 0, "actions": Counter(), "chunks": 0}
+    started = time.perf_counter()
+
+    def write(lines: List[Tuple[str, str, str]]) -> None:
+        for decision, action, line in lines:
+            output.write(line + "\n")
+            summary[decision] += 1
+            if decision == "auto":
+                summary["actions"][action] += 1
+            elif ambiguous_output is not None:
+                ambiguous_output.write(line + "\n")
+        summary["total"] += len(lines)
+        summary["chunks"] += 1
+        if on_progress is not None:
+            on_progress(summary)
+
+    chunks = iter_chunks(records, max(1, chunk_rows))
+    if workers == 0:
+        for chunk in chunks:
+            write(triage_chunk(chunk, table))
+    else:
+        workers = workers or os.cpu_count() or 1
+        pending: "deque[Future]" = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(table,)) as executor:
+            for chunk in chunks:
+                pending.append(executor.submit(triage_chunk, chunk))
+                if len(pending) >= workers * PENDING_CHUNKS_PER_WORKER:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["rows_per_second"] = round(summary["total"] / elapsed, 1) if elapsed > 0 else None
+    summary["actions"] = dict(summary["actions"].most_common())
+    return summary
+
+
+def open_repository() -> HoldRepository:
+    """HOLD_DATA_SOURCE 저장소 (mock 이면 hold_mock_data 의 Mock 데이터)"""
+    from hold_datasource import create_repository_from_env
+    from hold_mock_data import create_mock_repository
+
+    return create_repository_from_env() or create_mock_repository()
+
+
+def llm_question(result: TriageResult) -> str:
+    return f"인보이스 {result['invoice_id']} 의 홀딩({result['reason']})을 규정집 기준으로 어떻게 처리해야 하나요?"
+
+
+async def resolve_with_llm(results: List[TriageResult], output: TextIO, concurrency: Optional[int] = None) -> int:
+    """판단 불가 홀딩만 에이전트(hold_resolve_mcp_cli)에 질문하고, 답변을 끝나는 순서대로 기록합니다."""
+    from agent_runner import AgentWorkerPool, run_batch
+    from hold_resolve_mcp_cli import CLI_CONCURRENCY, open_agent
+
+    concurrency = concurrency or CLI_CONCURRENCY
+    questions = [llm_question(result) for result in results]
+    answered = 0
+
+    def on_result(batch_result: Any) -> None:
+        nonlocal answered
+        record = dict(results[batch_result.index], decision="llm", question=batch_result.question)
+        if batch_result.ok:
+            record["answer"] = batch_result.response.final_output
+            answered += 1
+        else:
+            record["error"] = repr(batch_result.error)
+        output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        output.flush()
+
+    async with AgentWorkerPool(open_agent, size=concurrency) as pool:
+        await run_batch(questions, pool.run, concurrency=concurrency, on_result=on_result)
+    return answered
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="규정집 규칙으로 열린 홀딩을 일괄 분류합니다 (LLM 없이)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="HOLD_DATA_SOURCE 의 열린 홀딩 전체를 분류해 NDJSON 으로 기록")
+    run.add_argument("output", help="결과 NDJSON 경로 (- 이면 표준 출력)")
+    run.add_argument("--ambiguous", help="규칙으로 판단할 수 없는 홀딩만 따로 기록할 NDJSON 경로")
+    run.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수, 0: 현재 프로세스)")
+    run.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    run.add_argument("--rule-book", default=RULE_BOOK_PATH)
+
+    llm = commands.add_parser("llm", help="판단 불가 홀딩(--ambiguous 결과)을 에이전트에 질문")
+    llm.add_argument("input", help="run --ambiguous 로 기록한 NDJSON")
+    llm.add_argument("--output", required=True)
+    llm.add_argument("--limit", type=int, default=None, help="질문할 최대 건수")
+    llm.add_argument("--concurrency", type=int, default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "llm":
+        with open(args.input, encoding="utf-8") as f:
+            results = [json.loads(line) for line in f if line.strip()][:args.limit]
+        with open(args.output, "w", encoding="utf-8") as output:
+            answered = asyncio.run(resolve_with_llm(results, output, args.concurrency))
+        print(f"✅ {len(results)}건 중 {answered}건 답변 → {args.output}", file=sys.stderr)
+        return
+
+    table = load_procedure_table(args.rule_book)
+    repository = open_repository()
+
+    def progress(summary: Dict[str, Any]) -> None:
+        if summary["chunks"] % 10 == 0:
+            print(f"  … {summary['total']:,}건 (auto {summary['auto']:,} / llm {summary['llm']:,})", file=sys.stderr)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    ambiguous = open(args.ambiguous, "w", encoding="utf-8") if args.ambiguous else None
+    try:
+        summary = run_triage(repository.iter_records(), output, table, ambiguous, args.workers, args.chunk_rows, progress)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if ambiguous is not None:
+            ambiguous.close()
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
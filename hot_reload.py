@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+무중단 데이터/규정집 갱신 (Hot Reload)
+
+홀딩 데이터나 GuideBook.md 가 바뀔 때 MCP 서버를 재시작하지 않고 반영합니다.
+재시작하면 mcpo 의 streamable-http 세션이 끊기기 때문입니다.
+
+- 감시 대상마다 poll() 은 워커 스레드에서 실행되어 새 상태(새 스냅숏 저장소, 새 규정집 인덱스,
+  추가된 변경 로그)를 미리 만들고, install() 은 이벤트 루프에서 참조만 바꿉니다 (copy-on-write).
+  메모리 저장소의 도구는 이벤트 루프에서 실행되므로 읽기는 갱신을 기다리지 않고 항상 완성된 상태만 봅니다.
+  (블로킹 저장소의 도구는 스레드 풀에서 실행되며, 교체 전에 시작한 호출은 이전 저장소를 끝까지 사용합니다)
+- SnapshotReloadable: snapshot:/// 디렉터리가 바뀌면 새 스냅숏을 열어 교체
+  (새 스냅숏은 새 디렉터리에 만든 뒤 심볼릭 링크를 바꿔 게시하세요. 열려 있는 파일을 덮어쓰면 안 됩니다)
+- DeltaLogReloadable: HOLD_DELTA_PATH NDJSON 변경 로그에 추가된 줄만 읽어 add/release 로 적용
+  (블로킹 저장소는 워커 스레드에서 적용, 한 줄씩 offset 을 옮기고 잘못된 줄은 경고 후 건너뜀)
+    {"op": "add", "record": {"id": "INV-011", "reason": "...", ...}}
+    {"op": "release", "id": "INV-001"}
+  적용은 멱등이므로 새 스냅숏으로 교체할 때 로그 전체를 다시 적용합니다 (스냅숏에 반영됐으면 로그를 비우세요).
+- RuleBookReloadable: GuideBook.md 가 바뀌면 새 인덱스를 만들어 교체 (바뀐 청크만 재계산)
+- WatermarkReloadable: DB 저장소의 MAX(LAST_UPDATE_DATE) + 행 수가 바뀌면 (EBS 나 다른 워커/노드의 변경)
+  통계를 GROUP BY 로 다시 집계해 교체하고 세대 번호를 올려 캐시된 응답을 무효화
+"""
+import asyncio
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hold_store import HoldRepository
+
+DEFAULT_RELOAD_INTERVAL = 2.0
+# DB 워터마크 조회 주기 (AP_HOLDS_ALL 전체 MAX/COUNT 이므로 파일 확인보다 드물게)
+DEFAULT_WATERMARK_INTERVAL = 30.0
+
+FileSignature = Optional[Tuple[str, int, int]]
+
+
+def file_signature(path: str) -> FileSignature:
+    """(실제 경로, 수정 시각(ns), 크기). 심볼릭 링크를 바꾸거나 파일을 고치면 값이 바뀝니다. 없으면 None."""
+    try:
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+    except OSError:
+        return None
+    return real_path, stat.st_mtime_ns, stat.st_size
+
+
+class Reloadable(ABC):
+    """갱신 감시 대상"""
+
+    name = "reloadable"
+
+    @abstractmethod
+    def poll(self) -> Optional[Any]:
+        """워커 스레드에서 호출됩니다. 바뀐 것이 있으면 적용할 새 상태를, 없으면 None 을 반환합니다."""
+
+    @abstractmethod
+    def install(self, prepared: Any) -> None:
+        """이벤트 루프에서 호출됩니다. poll() 이 준비한 상태를 참조 교체 등 짧은 작업으로 적용합니다."""
+
+
+class DeltaLogReloadable(Reloadable):
+    """
+    NDJSON 변경 로그를 끝에서부터 따라 읽어(tail) 현재 저장소에 적용합니다.
+
+    블로킹 저장소(blocking_io: SQL 은 DB 쓰기, 스냅숏은 오버레이 갱신)는 poll() 안에서 워커 스레드로 적용하고,
+    메모리 저장소는 이벤트 루프의 읽기와 겹치지 않도록 install() 에서 적용합니다 (건당 인덱스 삽입만 하므로 짧음).
+    offset 은 한 줄을 적용할 때마다 그 줄 끝으로 옮기므로, 도중에 실패하면 남은 줄은 다음 확인에서 이어서 적용합니다.
+    JSON 이 아니거나 형식이 잘못된 줄은 경고를 출력하고 건너뛰며, 그 줄의 offset 을 skipped 에 기록합니다.
+    """
+
+    name = "delta_log"
+    # skipped 에 보관할 최근 건너뛴 줄 수
+    MAX_SKIPPED = 100
+
+    def __init__(self, path: str, get_repository: Callable[[], HoldRepository]) -> None:
+        self.path = path
+        self.get_repository = get_repository
+        self.offset = 0
+        self.applied = 0
+        self.skipped: List[Tuple[int, str]] = []
+
+    def read_lines(self, offset: int) -> Tuple[List[Tuple[int, bytes]], int]:
+        """
+        offset 이후의 완성된 줄(개행으로 끝난 줄)을 (줄 시작 offset, 줄) 목록으로 읽습니다.
+        로그가 비워졌거나 교체되었으면 처음부터 읽으며, 실제로 읽기 시작한 offset 을 함께 반환합니다.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return [], 0
+        if size < offset:
+            offset = 0
+        if size == offset:
+            return [], offset
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(size - offset)
+        lines = []
+        position = offset
+        for line in data[:data.rfind(b"\n") + 1].splitlines(keepends=True):
+            lines.append((position, line))
+            position += len(line)
+        return lines, offset
+
+    @staticmethod
+    def apply(repository: HoldRepository, operation: Dict[str, Any]) -> None:
+        """작업 한 건을 적용합니다. 형식이 잘못된 작업은 ValueError / KeyError / TypeError."""
+        if operation.get("op") == "add":
+            record = dict(operation["record"])
+            record.setdefault("status", "holding")
+            repository.add(record)
+        elif operation.get("op") == "release":
+            repository.release(operation["id"])
+        else:
+            raise ValueError(f"Unknown delta operation: {operation!r}")
+
+    def replay(self, repository: HoldRepository, offset: int) -> int:
+        """offset 이후의 줄을 모두 적용하고 마지막으로 처리한 줄 끝 offset 을 반환합니다."""
+        lines, offset = self.read_lines(offset)
+        return self.apply_lines(repository, lines, offset)
+
+    def apply_lines(
+        self,
+        repository: HoldRepository,
+        lines: List[Tuple[int, bytes]],
+        offset: int,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        읽은 줄을 순서대로 적용하고 마지막으로 처리한 줄 끝 offset 을 반환합니다 (줄이 없으면 offset 그대로).
+        on_progress 는 줄을 하나 처리할 때마다 그 끝 offset 으로 호출됩니다 (저장소 오류는 그대로 전파).
+        """
+        for line_offset, line in lines:
+            if line.strip():
+                try:
+                    operation = json.loads(line)
+                    if not isinstance(operation, dict):
+                        raise TypeError(f"expected an object, got {type(operation).__name__}")
+                    self.apply(repository, operation)
+                    self.applied += 1
+                except (ValueError, KeyError, TypeError) as e:
+                    self._skip(line_offset, e)
+            offset = line_offset + len(line)
+            if on_progress is not None:
+                on_progress(offset)
+        return offset
+
+    def _skip(self, line_offset: int, error: Exception) -> None:
+        message = f"{type(error).__name__}: {error}"
+        print(f"⚠️  {self.path} offset {line_offset}: 잘못된 변경 로그 줄을 건너뜁니다 ({message})")
+        self.skipped = (self.skipped + [(line_offset, message)])[-self.MAX_SKIPPED:]
+
+    def _advance(self, offset: int) -> None:
+        self.offset = offset
+
+    def poll(self) -> Optional[Tuple[List[Tuple[int, bytes]], int]]:
+        lines, offset = self.read_lines(self.offset)
+        if not lines and offset == self.offset:
+            return None
+        repository = self.get_repository()
+        if repository.blocking_io:
+            # offset 은 로그가 교체되었으면 0, 아니면 현재 위치 (읽기 시작 위치)
+            self._advance(offset)
+            self.apply_lines(repository, lines, offset, self._advance)
+            return [], self.offset
+        return lines, offset
+
+    def install(self, prepared: Tuple[List[Tuple[int, bytes]], int]) -> None:
+        lines, offset = prepared
+        self._advance(offset)
+        self.apply_lines(self.get_repository(), lines, offset, self._advance)
+
+
+class SnapshotReloadable(Reloadable):
+    """스냅숏 디렉터리(meta.json)가 바뀌면 새 저장소를 열고, 통계/인덱스까지 준비한 뒤 교체합니다."""
+
+    name = "snapshot"
+
+    def __init__(
+        self,
+        path: str,
+        open_repository: Callable[[str], HoldRepository],
+        prepare: Callable[[HoldRepository], Any],
+        activate: Callable[[Any], None],
+        delta_log: Optional[DeltaLogReloadable] = None,
+    ) -> None:
+        self.path = path
+        self.open_repository = open_repository
+        self.prepare = prepare
+        self.activate = activate
+        self.delta_log = delta_log
+        self.signature = file_signature(os.path.join(path, "meta.json"))
+
+    def poll(self) -> Optional[Tuple[FileSignature, Any, int]]:
+        signature = file_signature(os.path.join(self.path, "meta.json"))
+        if signature is None or signature == self.signature:
+            return None
+        repository = self.open_repository(self.path)
+        offset = 0
+        if self.delta_log is not None:
+            offset = self.delta_log.replay(repository, 0)
+        return signature, self.prepare(repository), offset
+
+    def install(self, prepared: Tuple[FileSignature, Any, int]) -> None:
+        self.signature, bundle, offset = prepared
+        self.activate(bundle)
+        if self.delta_log is not None:
+            self.delta_log.offset = offset
+
+
+class RuleBookReloadable(Reloadable):
+    """GuideBook.md 가 바뀌면 새 규정집 인덱스(+ 파생 테이블)를 만들어 교체합니다."""
+
+    name = "rule_book"
+
+    def __init__(self, path: str, build: Callable[[], Any], activate: Callable[[Any], None]) -> None:
+        self.path = path
+        self.build = build
+        self.activate = activate
+        self.signature = file_signature(path)
+
+    def poll(self) -> Optional[Tuple[FileSignature, Any]]:
+        signature = file_signature(self.path)
+        if signature is None or signature == self.signature:
+            return None
+        return signature, self.build()
+
+    def install(self, prepared: Tuple[FileSignature, Any]) -> None:
+        self.signature, built = prepared
+        self.activate(built)
+
+
+class WatermarkReloadable(Reloadable):
+    """
+    DB 저장소 워터마크(last_update_watermark)가 바뀌면 파생 상태(통계, ID 추천 인덱스)를 다시 만들어 교체합니다.
+
+    이 프로세스의 add/release 는 리스너로 바로 반영되지만, 다른 시스템이 쓴 변경은 워터마크로만 알 수 있습니다.
+    처음 확인할 때도 한 번 다시 만듭니다 (시작 시 집계와 첫 확인 사이의 변경을 놓치지 않도록).
+    """
+
+    name = "db_watermark"
+
+    def __init__(
+        self,
+        get_repository: Callable[[], HoldRepository],
+        prepare: Callable[[HoldRepository], Any],
+        activate: Callable[[Any], None],
+        interval: float = DEFAULT_WATERMARK_INTERVAL,
+    ) -> None:
+        self.get_repository = get_repository
+        self.prepare = prepare
+        self.activate = activate
+        self.interval = interval
+        self.watermark: Optional[str] = None
+        self._checked_at = float("-inf")
+
+    def poll(self) -> Optional[Tuple[str, Any]]:
+        now = time.monotonic()
+        if now - self._checked_at < self.interval:
+            return None
+        self._checked_at = now
+        repository = self.get_repository()
+        read_watermark = getattr(repository, "last_update_watermark", None)
+        if read_watermark is None:
+            return None
+        # 워터마크를 먼저 읽고 집계하므로, 집계 도중의 변경은 다음 확인에서 다시 반영됨
+        watermark = read_watermark()
+        if watermark == self.watermark:
+            return None
+        return watermark, self.prepare(repository)
+
+    def install(self, prepared: Tuple[str, Any]) -> None:
+        self.watermark, bundle = prepared
+        self.activate(bundle)
+
+
+class HotReloader:
+    """감시 대상들을 interval 초마다 확인하는 백그라운드 작업 (서빙 이벤트 루프에서 실행)"""
+
+    def __init__(self, reloadables: List[Reloadable], interval: float = DEFAULT_RELOAD_INTERVAL) -> None:
+        self.reloadables = reloadables
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._status: Dict[str, Dict[str, Any]] = {
+            reloadable.name: {"reloads": 0, "errors": 0, "last_reload_at": None, "last_error": None}
+            for reloadable in reloadables
+        }
+
+    async def check_once(self) -> int:
+        """모든 대상을 한 번 확인하고 적용한 대상 수를 반환합니다. 실패한 대상은 이전 상태를 유지합니다."""
+        applied = 0
+        for reloadable in self.reloadables:
+            status = self._status[reloadable.name]
+            try:
+                prepared = await asyncio.to_thread(reloadable.poll)
+                if prepared is None:
+                    continue
+                reloadable.install(prepared)
+            except Exception as e:
+                status["errors"] += 1
+                status["last_error"] = f"{type(e).__name__}: {e}"
+                continue
+            status["reloads"] += 1
+            status["last_reload_at"] = time.time()
+            applied += 1
+        return applied
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check_once()
+
+    def start(self) -> None:
+        """현재 이벤트 루프에서 감시 작업을 시작합니다 (이미 실행 중이면 무시)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run(), name="hot-reload")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> Dict[str, Any]:
+        return {"running": self.running, "interval": self.interval, "sources": {name: dict(value) for name, value in self._status.items()}}
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+인보이스 ID 추천 인덱스 (Invoice ID Suggestion Index)
+
+존재하지 않는 ID를 조회했을 때 전체 ID 목록 대신 가장 가까운 ID 몇 개만 돌려주기 위한 인덱스입니다.
+
+- ID 문자열 정렬 배열: 접두어 일치 / 사전순 이웃을 bisect 로 탐색
+- (숫자 접미사, ID) 정렬 배열: "INV-999", "1" 처럼 번호만 비슷한 경우 숫자 거리로 이웃 탐색
+
+후보는 두 배열에서 삽입 위치 주변의 일정 개수만 보므로, 조회 비용은 전체 ID 수와 무관합니다.
+DB/스냅숏처럼 저장소에 INVOICE_ID 순서 인덱스가 있으면(nearby_ids) 배열을 만들지 않고
+저장소에서 같은 방식으로 이웃 ID 만 조회합니다 (시작 시나 워터마크 재집계 때 전체 ID 를 읽지 않음).
+"""
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import List, Optional, Set, Tuple
+
+from hold_store import HoldListener, HoldRecord, HoldRepository
+
+DEFAULT_SUGGESTIONS = 5
+
+_TRAILING_NUMBER = re.compile(r"(\d+)\D*$")
+
+
+def _numeric_suffix(invoice_id: str) -> Optional[int]:
+    match = _TRAILING_NUMBER.search(invoice_id)
+    return int(match.group(1)) if match else None
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+class InvoiceIdSuggester(HoldListener):
+    """저장소 변경을 따라가며 유지되는 ID 추천 인덱스 (스레드 안전)"""
+
+    def __init__(self, source: Optional[HoldRepository] = None) -> None:
+        self._ids: List[str] = []
+        self._by_number: List[Tuple[int, str]] = []
+        # nearby_ids 를 지원하는 저장소면 인덱스 대신 저장소를 조회
+        self._source = source
+        # 변경 이벤트(워커 스레드의 델타 로그 등)와 추천 조회가 동시에 배열을 건드리지 않도록 보호
+        self._lock = threading.Lock()
+
+    @classmethod
+    def attach(cls, repository: HoldRepository) -> "InvoiceIdSuggester":
+        """
+        저장소가 nearby_ids 를 지원하면 저장소를 그대로 조회하고, 아니면 현재 ID 로 인덱스를 만든 뒤
+        변경 이벤트를 구독합니다. 기동 훅/핫 리로드 워커 스레드에서 호출되므로 요청 경로에서 인덱스를 만들지 않습니다.
+        """
+        if repository.nearby_ids("", 0) is not None:
+            return cls(repository)
+        suggester = cls()
+        # 인덱스를 만드는 동안 들어온 이벤트는 잠금을 기다렸다가 만든 인덱스에 반영
+        with suggester._lock:
+            repository.subscribe(suggester)
+            suggester._ids = sorted(set(repository.ids()))
+            suggester._by_number = sorted(
+                (number, invoice_id)
+                for invoice_id in suggester._ids
+                if (number := _numeric_suffix(invoice_id)) is not None
+            )
+        return suggester
+
+    def __len__(self) -> int:
+        if self._source is not None:
+            return len(self._source)
+        return len(self._ids)
+
+    def on_hold_added(self, record: HoldRecord) -> None:
+        invoice_id = record["id"]
+        with self._lock:
+            position = bisect_left(self._ids, invoice_id)
+            if position < len(self._ids) and self._ids[position] == invoice_id:
+                return
+            self._ids.insert(position, invoice_id)
+            number = _numeric_suffix(invoice_id)
+            if number is not None:
+                insort(self._by_number, (number, invoice_id))
+
+    def on_hold_released(self, record: HoldRecord) -> None:
+        invoice_id = record["id"]
+        with self._lock:
+            position = bisect_left(self._ids, invoice_id)
+            if position < len(self._ids) and self._ids[position] == invoice_id:
+                del self._ids[position]
+            number = _numeric_suffix(invoice_id)
+            if number is not None:
+                position = bisect_left(self._by_number, (number, invoice_id))
+                if position < len(self._by_number) and self._by_number[position] == (number, invoice_id):
+                    del self._by_number[position]
+
+    def _indexed_candidates(self, keys: Set[str], number: Optional[int], k: int) -> Set[str]:
+        candidates = set()
+        with self._lock:
+            for key in keys:
+                position = bisect_left(self._ids, key)
+                # 접두어 일치 구간은 삽입 위치부터 연속되므로 앞쪽 k개만, 사전순 이웃은 앞뒤 k개
+                candidates.update(self._ids[max(0, position - k):position + k])
+            if number is not None:
+                position = bisect_left(self._by_number, (number, ""))
+                candidates.update(invoice_id for _, invoice_id in self._by_number[max(0, position - k):position + k])
+        return candidates
+
+    def _repository_candidates(self, keys: Set[str], number: Optional[int], k: int) -> Set[str]:
+        candidates = set()
+        for key in keys:
+            candidates.update(self._source.nearby_ids(key, k))
+        if number is not None:
+            # 번호로 찾는 이웃: 사전순 이웃 ID 의 접두어와 자릿수에 번호를 넣은 키로 다시 조회 (INV-1 → INV-001)
+            templates = {str(number)}
+            for invoice_id in candidates:
+                match = _TRAILING_NUMBER.search(invoice_id)
+                if match:
+                    templates.add(invoice_id[:match.start(1)] + str(number).zfill(len(match.group(1))))
+            for key in templates - keys:
+                candidates.update(self._source.nearby_ids(key, k))
+        return candidates
+
+    def suggest(self, query: str, k: int = DEFAULT_SUGGESTIONS) -> List[str]:
+        """query 와 가장 가까운 ID를 최대 k개 반환합니다 (접두어 일치 > 공통 접두어 길이 > 숫자 거리)."""
+        if k <= 0:
+            return []
+        query = query.strip()
+        normalized = query.upper()
+        number = _numeric_suffix(query)
+
+        if self._source is not None:
+            candidates = self._repository_candidates({query, normalized}, number, k)
+        else:
+            candidates = self._indexed_candidates({query, normalized}, number, k)
+
+        def score(invoice_id: str) -> Tuple:
+            upper_id = invoice_id.upper()
+            candidate_number = _numeric_suffix(invoice_id)
+            number_distance = (
+                abs(candidate_number - number)
+                if number is not None and candidate_number is not None
+                else float("inf")
+            )
+            return (
+                not upper_id.startswith(normalized),
+                number_distance,
+                -_common_prefix_length(upper_id, normalized),
+                invoice_id,
+            )
+
+        return sorted(candidates, key=score)[:k]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+도구 응답 축약 (Payload Compaction)
+
+도구 응답은 그대로 LLM 컨텍스트에 들어가므로, 같은 정보를 더 적은 토큰으로 전달하는 옵션을 제공합니다.
+
+- fields: 항목에서 필요한 필드만 요청한 순서대로 남김 (projection)
+- max_text_chars: 긴 문자열(예: 한국어 detail 설명)을 잘라 끝에 "…" 표시 (중첩된 값 포함)
+- output_format="table": 항목마다 키를 반복하지 않고 {"columns": [...], "rows": [[...], ...]} 로 표현
+- 원래 응답 대비 바이트/토큰(schema_context.estimate_tokens 근사) 절감량을 savings 로 보고
+
+응답 모델과 무관하게 model_dump(mode="json") 결과(dict)만 다룹니다.
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from schema_context import estimate_tokens
+
+OUTPUT_FORMATS = ("json", "table")
+TRUNCATION_MARK = "…"
+MIN_TEXT_CHARS = 8
+
+
+class PayloadOptionError(ValueError):
+    """잘못된 축약 옵션 (알 수 없는 필드, 형식 등)"""
+
+
+def wants_compaction(fields: Optional[Sequence[str]], max_text_chars: Optional[int], output_format: str) -> bool:
+    """축약 옵션이 하나라도 지정되었는지 (아니면 원래 응답을 그대로 사용)"""
+    return bool(fields) or max_text_chars is not None or output_format != "json"
+
+
+def dumps(value: Any) -> str:
+    """model_dump_json 과 같은 모양(공백 없음, 한글 그대로)의 JSON 문자열"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def truncate_text(value: Any, max_chars: int) -> Any:
+    """문자열을 max_chars 글자(표시 포함)로 자릅니다. dict/list 안의 문자열도 자릅니다."""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars - len(TRUNCATION_MARK)] + TRUNCATION_MARK
+    if isinstance(value, dict):
+        return {key: truncate_text(item, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        return [truncate_text(item, max_chars) for item in value]
+    return value
+
+
+def _validate(
+    available_fields: Sequence[str],
+    fields: Optional[Sequence[str]],
+    max_text_chars: Optional[int],
+    output_format: str,
+) -> List[str]:
+    if output_format not in OUTPUT_FORMATS:
+        raise PayloadOptionError(f"Unknown output_format: {output_format!r} (use one of {', '.join(OUTPUT_FORMATS)})")
+    if max_text_chars is not None and max_text_chars < MIN_TEXT_CHARS:
+        raise PayloadOptionError(f"max_text_chars must be at least {MIN_TEXT_CHARS}")
+    selected = list(dict.fromkeys(fields)) if fields else list(available_fields)
+    unknown = [field for field in selected if field not in available_fields]
+    if unknown:
+        raise PayloadOptionError(f"Unknown fields: {', '.join(unknown)} (available: {', '.join(available_fields)})")
+    return selected
+
+
+def payload_savings(original: Dict[str, Any], compacted: Dict[str, Any]) -> Dict[str, Any]:
+    """원래 응답 대비 바이트/토큰 절감량"""
+    original_text, text = dumps(original), dumps(compacted)
+    original_tokens, tokens = estimate_tokens(original_text), estimate_tokens(text)
+    original_bytes, size = len(original_text.encode("utf-8")), len(text.encode("utf-8"))
+    return {
+        "original_bytes": original_bytes,
+        "bytes": size,
+        "saved_bytes": original_bytes - size,
+        "original_tokens": original_tokens,
+        "tokens": tokens,
+        "saved_tokens": original_tokens - tokens,
+        "saved_ratio": round((original_tokens - tokens) / original_tokens, 3) if original_tokens else 0.0,
+    }
+
+
+def compact_payload(
+    payload: Dict[str, Any],
+    list_key: Optional[str],
+    available_fields: Sequence[str],
+    fields: Optional[Sequence[str]] = None,
+    max_text_chars: Optional[int] = None,
+    output_format: str = "json",
+) -> Dict[str, Any]:
+    """
+    응답 dict 를 축약합니다.
+
+    list_key 가 있으면 payload[list_key] 의 항목들을 축약하고(나머지 키는 그대로),
+    없으면 payload 자체를 한 항목으로 보고 {"item": ...} 으로 반환합니다 (table 형식 불가).
+    결과에는 savings(절감량)가 추가됩니다.
+    """
+    selected = _validate(available_fields, fields, max_text_chars, output_format)
+    if list_key is None and output_format == "table":
+        raise PayloadOptionError("output_format='table' is only available for list results")
+
+    def shrink(item: Dict[str, Any]) -> Dict[str, Any]:
+        projected = {field: item.get(field) for field in selected}
+        return truncate_text(projected, max_text_chars) if max_text_chars is not None else projected
+
+    if list_key is None:
+        compacted: Dict[str, Any] = {"item": shrink(payload)}
+    else:
+        compacted = {key: value for key, value in payload.items() if key != list_key}
+        items = [shrink(item) for item in payload[list_key]]
+        if output_format == "table":
+            compacted["columns"] = selected
+            compacted["rows"] = [[item[field] for field in selected] for item in items]
+        else:
+            compacted["items"] = items
+    compacted["savings"] = payload_savings(payload, compacted)
+    return compacted
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+MCP 도구 응답 캐시 (Pre-serialized Response Cache)
+
+도구 이름 + 인자를 키로, 이미 직렬화된 JSON 텍스트와 구조화 응답(dict)을 보관합니다.
+같은 질의가 반복되면 Pydantic 모델 생성/검증/직렬화를 건너뛰고 저장된 결과를 그대로 돌려줍니다.
+
+- 세대(generation) 무효화: 저장소가 변경될 때마다 증가하는 세대 번호가 다르면 미스 처리
+- TTL 만료 + LRU 제거 (최대 항목 수 초과 시 가장 오래 사용되지 않은 항목부터)
+- 히트/미스/제거/만료 지표
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """직렬화가 끝난 도구 응답"""
+    text: str                        # 도구 응답 TextContent 에 그대로 들어갈 JSON
+    structured: Dict[str, Any]       # MCP structuredContent
+    generation: int
+    expires_at: float
+
+
+def make_cache_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """도구 이름과 인자로 결정적인 캐시 키를 만듭니다."""
+    return tool_name + ":" + json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class ResponseCache:
+    """세대 번호 + TTL + LRU 기반 응답 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str, generation: int) -> Optional[CachedResponse]:
+        """현재 세대의 유효한 항목이면 반환하고, 아니면 제거 후 None 을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.generation != generation:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, generation: int, text: str, structured: Dict[str, Any]) -> CachedResponse:
+        entry = CachedResponse(
+            text=text,
+            structured=structured,
+            generation=generation,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """히트/미스 등 캐시 지표"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "cached_bytes": sum(len(entry.text.encode("utf-8")) for entry in self._entries.values()),
+            }
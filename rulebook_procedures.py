@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+규정집 사유 → 처리 절차 조인 테이블
+
+GuideBook.md 의 번호가 붙은 ## 섹션(예: "## 1. 발주금액 불일치")을 한 번 파싱하여
+사유별 {키워드, 발생원인, 위험도, 담당자, 단계별 절차/처리시간, 관련 규정} 구조로 캐시합니다.
+HOLDING_REASON_DETAILS 의 사유 문자열과 섹션 제목이 1:1 로 대응합니다.
+"""
+import difflib
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from rulebook_search import RuleBookChunk
+
+ProcedureRecord = Dict[str, Any]
+
+_NUMBERED_SECTION = re.compile(r"^\d+\.\s*(.+)$")
+_STEP_HEADING = re.compile(r"^####\s*(\d+)단계:\s*(.+?)(?:\s*\(처리시간:\s*([^)]+)\))?\s*$")
+_FIELD = re.compile(r"^-\s*\*\*(.+?)\*\*:\s*(.+)$")
+_LABEL = re.compile(r"^\*\*(.+?)\*\*:?\s*(.*)$")
+
+
+def _strip_markup(text: str) -> str:
+    return text.replace("**", "").strip()
+
+
+def _parse_definition(text: str) -> Dict[str, Any]:
+    """문제 정의 청크에서 키워드/발생원인/위험도를 추출합니다."""
+    result: Dict[str, Any] = {"keywords": [], "cause": None, "risk": None}
+    for line in text.splitlines():
+        match = _FIELD.match(line.strip())
+        if not match:
+            continue
+        name, value = match.groups()
+        if name == "키워드":
+            result["keywords"] = [keyword.strip() for keyword in value.split(",") if keyword.strip()]
+        elif name == "발생원인":
+            result["cause"] = value.strip()
+        elif name == "위험도":
+            result["risk"] = value.strip()
+    return result
+
+
+def _parse_steps(text: str) -> List[Dict[str, Any]]:
+    """해결 절차 청크를 #### N단계 단위로 나눕니다."""
+    steps: List[Dict[str, Any]] = []
+    label = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        step_match = _STEP_HEADING.match(line)
+        if step_match:
+            number, title, processing_time = step_match.groups()
+            steps.append({
+                "step": int(number),
+                "title": title.strip(),
+                "processing_time": processing_time.strip() if processing_time else None,
+                "owner": None,
+                "actions": [],
+            })
+            label = None
+            continue
+        if not steps or not line:
+            continue
+        label_match = _LABEL.match(line)
+        if label_match:
+            name, value = label_match.groups()
+            if name == "담당자":
+                steps[-1]["owner"] = value.strip()
+                label = None
+            else:
+                label = name.strip()
+            continue
+        if line.startswith("- "):
+            action = _strip_markup(line[2:])
+            steps[-1]["actions"].append(f"{label}: {action}" if label else action)
+    return steps
+
+
+def _parse_regulations(text: str) -> List[str]:
+    return [_strip_markup(line.strip()[2:]) for line in text.splitlines() if line.strip().startswith("- ")]
+
+
+def build_procedure_table(chunks: Iterable[RuleBookChunk]) -> Dict[str, ProcedureRecord]:
+    """규정집 청크에서 사유 → 처리 절차 테이블을 만듭니다."""
+    table: Dict[str, ProcedureRecord] = {}
+    for chunk in chunks:
+        match = _NUMBERED_SECTION.match(chunk.section)
+        if not match:
+            continue
+        reason = match.group(1).strip()
+        procedure = table.setdefault(reason, {
+            "reason": reason,
+            "section": chunk.section,
+            "keywords": [],
+            "cause": None,
+            "risk": None,
+            "owner": None,
+            "steps": [],
+            "regulations": [],
+        })
+        if chunk.heading == "문제 정의":
+            procedure.update(_parse_definition(chunk.text))
+        elif chunk.heading == "해결 절차":
+            procedure["steps"] = _parse_steps(chunk.text)
+            procedure["owner"] = next((step["owner"] for step in procedure["steps"] if step["owner"]), None)
+        elif chunk.heading == "관련 규정":
+            procedure["regulations"] = _parse_regulations(chunk.text)
+    return table
+
+
+def _compact(text: str) -> str:
+    return re.sub(r"\s+", "", text)
+
+
+def find_procedure(table: Dict[str, ProcedureRecord], reason: str) -> Optional[ProcedureRecord]:
+    """
+    사유 문자열로 절차를 찾습니다. 공백 차이(예: "중복인보이스")만 허용하고 부분 일치는 하지 않습니다.
+    ("불일치" 가 "발주금액 불일치" 절차로 잘못 연결되지 않도록)
+    """
+    if reason in table:
+        return table[reason]
+    compact = _compact(reason)
+    if not compact:
+        return None
+    for name, procedure in table.items():
+        if _compact(name) == compact:
+            return procedure
+    return None
+
+
+def suggest_procedures(table: Dict[str, ProcedureRecord], reason: str, limit: int = 5) -> List[str]:
+    """절차를 찾지 못한 사유에 대해 부분 일치하거나 비슷한 사유 이름을 제안합니다 (없으면 전체 사유)."""
+    compact = _compact(reason)
+    names = list(table)
+    partial = [name for name in names if compact and (compact in _compact(name) or _compact(name) in compact)]
+    close = difflib.get_close_matches(reason, names, n=limit, cutoff=0.4)
+    suggestions = list(dict.fromkeys(partial + close))
+    return (suggestions or names)[:limit]
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+규정집(rule_book/GuideBook.md) 검색 인덱스
+
+GuideBook 을 ##/### 제목 단위 청크로 나누고 BM25 키워드 인덱스를 만듭니다.
+NumPy 가 설치되어 있으면 로컬 임베딩(문자 n-gram 해싱 벡터) 인덱스를 함께 만들어
+코사인 유사도(행렬-벡터 곱 한 번)로 점수를 보정합니다.
+
+- 인덱스는 .cache/rulebook_index.json 에 저장되며, 서버 시작 시 파일 해시가 같으면 그대로 재사용
+- 마크다운이 바뀌면 체크섬이 바뀐 청크만 다시 토큰화/임베딩 (증분 재구성)
+- 한국어 복합어("단가차이" / "단가 차이")를 위해 단어 토큰 + 문자 bigram 을 함께 사용
+"""
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# 임베딩 인덱스는 선택 사항. numpy 는 첫 검색 때 가져옴 (서버 기동 시간 단축)
+HAS_NUMPY = find_spec("numpy") is not None
+
+
+def _numpy() -> Any:
+    import numpy
+
+    return numpy
+
+RULE_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rule_book", "GuideBook.md")
+INDEX_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "rulebook_index.json")
+INDEX_VERSION = 1
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+EMBEDDING_DIM = 512
+EMBEDDING_WEIGHT = 0.3
+
+# 검색 대상에서 제외할 ## 섹션
+_SKIP_SECTIONS = {"목차", "문서 이력"}
+_HEADING = re.compile(r"^(#{2,3})\s+(.*)$")
+_WORD = re.compile(r"[0-9a-zA-Z가-힣]+")
+
+
+@dataclass
+class RuleBookChunk:
+    """규정집 청크 (## 섹션 아래의 ### 단위)"""
+    chunk_id: str
+    section: str                     # ## 제목 (예: "1. 발주금액 불일치")
+    heading: str                     # ### 제목 (예: "해결 절차"), 섹션 도입부면 ""
+    text: str
+    checksum: str
+    tokens: Dict[str, int] = field(default_factory=dict)
+    vector: Optional[List[float]] = None
+
+    @property
+    def title(self) -> str:
+        return f"{self.section} > {self.heading}" if self.heading else self.section
+
+
+def parse_sections(markdown: str) -> List[RuleBookChunk]:
+    """마크다운을 ##/### 제목 기준 청크로 나눕니다. #### 이하는 상위 청크 본문에 포함됩니다."""
+    chunks: List[RuleBookChunk] = []
+    section, heading, lines = "", "", []
+
+    def flush() -> None:
+        # 섹션 구분선(---)은 본문에서 제외
+        text = "\n".join(line for line in lines if line.strip() != "---").strip()
+        if section and section not in _SKIP_SECTIONS and text:
+            chunk_id = f"{section}#{heading}" if heading else section
+            checksum = hashlib.sha1(f"{section}\n{heading}\n{text}".encode("utf-8")).hexdigest()
+            chunks.append(RuleBookChunk(chunk_id, section, heading, text, checksum))
+
+    for line in markdown.splitlines():
+        match = _HEADING.match(line)
+        if match:
+            flush()
+            level, title = match.groups()
+            if level == "##":
+                section, heading = title.strip(), ""
+            else:
+                heading = title.strip()
+            lines = []
+        else:
+            lines.append(line)
+    flush()
+    return chunks
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 단어 토큰 + 두 글자 이상 단어의 문자 bigram"""
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        tokens.append(word)
+        if len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def hashed_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """문자 3-gram 을 해싱한 L2 정규화 벡터 (외부 모델 없이 쓰는 로컬 임베딩)"""
+    vector = [0.0] * dim
+    compact = re.sub(r"\s+", " ", text.lower())
+    for i in range(len(compact) - 2):
+        digest = hashlib.md5(compact[i:i + 3].encode("utf-8")).digest()
+        vector[int.from_bytes(digest[:4], "little") % dim] += 1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+class RuleBookIndex:
+    """BM25 + (선택) 임베딩 코사인 유사도 하이브리드 검색 인덱스"""
+
+    def __init__(
+        self,
+        path: str = RULE_BOOK_PATH,
+        cache_path: Optional[str] = INDEX_CACHE_PATH,
+        embed: Optional[Callable[[str], List[float]]] = hashed_embedding,
+    ) -> None:
+        self.path = path
+        self.cache_path = cache_path
+        self.embed = embed if HAS_NUMPY else None
+        self.file_hash = ""
+        self.mtime = 0.0
+        self.chunks: List[RuleBookChunk] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._idf: Dict[str, float] = {}
+        self._lengths: List[int] = []
+        self._avg_length = 0.0
+        self._matrix = None
+        self.rebuilt_chunks = 0
+
+    @classmethod
+    def load_or_build(cls, path: str = RULE_BOOK_PATH, cache_path: Optional[str] = INDEX_CACHE_PATH, **kwargs) -> "RuleBookIndex":
+        """캐시된 인덱스를 불러오고, 마크다운이 바뀌었으면 바뀐 청크만 다시 만듭니다."""
+        index = cls(path, cache_path, **kwargs)
+        index.refresh(force=True)
+        return index
+
+    def refresh(self, force: bool = False) -> bool:
+        """마크다운 파일이 바뀌었으면 인덱스를 증분 재구성합니다. 재구성했으면 True."""
+        mtime = os.path.getmtime(self.path)
+        if not force and mtime == self.mtime:
+            return False
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        file_hash = hashlib.sha256(raw).hexdigest()
+        self.mtime = mtime
+        if not force and file_hash == self.file_hash:
+            return False
+
+        cached = {chunk.checksum: chunk for chunk in self.chunks} or self._load_cached_chunks()
+        chunks = parse_sections(raw.decode("utf-8"))
+        self.rebuilt_chunks = 0
+        for chunk in chunks:
+            previous = cached.get(chunk.checksum)
+            if previous is not None and (self.embed is None or previous.vector is not None):
+                chunk.tokens, chunk.vector = previous.tokens, previous.vector
+                continue
+            chunk.tokens = dict(Counter(tokenize(f"{chunk.section} {chunk.heading} {chunk.text}")))
+            if self.embed is not None:
+                chunk.vector = self.embed(f"{chunk.section} {chunk.heading} {chunk.text}")
+            self.rebuilt_chunks += 1
+
+        self.file_hash = file_hash
+        self.chunks = chunks
+        self._build_statistics()
+        if self.rebuilt_chunks or not cached:
+            self._save()
+        return True
+
+    def _build_statistics(self) -> None:
+        """청크별 토큰 빈도로 역색인, IDF, 임베딩 행렬을 계산합니다."""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths = []
+        for position, chunk in enumerate(self.chunks):
+            self._lengths.append(sum(chunk.tokens.values()))
+            for token, frequency in chunk.tokens.items():
+                postings.setdefault(token, []).append((position, frequency))
+        total = len(self.chunks)
+        self._postings = postings
+        self._idf = {
+            token: math.log(1 + (total - len(entries) + 0.5) / (len(entries) + 0.5))
+            for token, entries in postings.items()
+        }
+        self._avg_length = (sum(self._lengths) / total) if total else 0.0
+        # 임베딩 행렬은 첫 검색 때 만듦 (_embedding_matrix)
+        self._matrix = None
+
+    def _embedding_matrix(self) -> Any:
+        if self._matrix is None:
+            numpy = _numpy()
+            self._matrix = numpy.asarray([chunk.vector for chunk in self.chunks], dtype=numpy.float32)
+        return self._matrix
+
+    def _load_cached_chunks(self) -> Dict[str, RuleBookChunk]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        return {item["checksum"]: RuleBookChunk(**item) for item in data.get("chunks", [])}
+
+    def _save(self) -> None:
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "file_hash": self.file_hash,
+                "chunks": [asdict(chunk) for chunk in self.chunks],
+            }, f, ensure_ascii=False)
+        os.replace(temp_path, self.cache_path)
+
+    def _bm25_scores(self, query_tokens: Sequence[str]) -> List[float]:
+        scores = [0.0] * len(self.chunks)
+        for token in set(query_tokens):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            for position, frequency in self._postings[token]:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[position] / self._avg_length)
+                scores[position] += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[RuleBookChunk, float]]:
+        """질의와 가장 관련 있는 청크 top_k 개를 (청크, 점수) 로 반환합니다."""
+        if not self.chunks:
+            return []
+        scores = self._bm25_scores(tokenize(query))
+        best = max(scores) or 1.0
+        combined = [score / best for score in scores]
+
+        if self.embed is not None:
+            numpy = _numpy()
+            query_vector = numpy.asarray(self.embed(query), dtype=numpy.float32)
+            similarities = self._embedding_matrix() @ query_vector
+            combined = list((1 - EMBEDDING_WEIGHT) * numpy.asarray(combined) + EMBEDDING_WEIGHT * similarities)
+
+        ranked = sorted(range(len(self.chunks)), key=lambda position: combined[position], reverse=True)
+        return [(self.chunks[position], float(combined[position])) for position in ranked[:top_k] if combined[position] > 0]
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+SQL 도구용 스키마 컨텍스트 축소 (Schema Pruning)
+
+INLINE_DATABASE_SCHEMA 의 DDL 과 INLINE_TABLE_DESC 의 컬럼 설명을 한 번만 파싱해 두고,
+질문에 필요한 테이블/컬럼만 남긴 간결한 DDL 을 만듭니다.
+
+- 기본 테이블(첫 번째 CREATE TABLE)은 항상 포함, 나머지 테이블은 질문이 그 테이블에만 있는
+  컬럼/설명 키워드나 테이블 키워드("invoice details" 등)를 언급할 때만 포함
+- 컬럼: 핵심 컬럼(core_columns, 없으면 NOT NULL 컬럼) + 테이블 간 조인 키 + 질문 키워드와 일치하는 컬럼
+- ATTRIBUTE1-15, GLOBAL_ATTRIBUTE1-20, MRC_* 같은 플렉스필드/잡음 컬럼은 이름으로 직접 언급될 때만 포함
+- "Standard Who column" 같은 일반 설명, BYTE/DEFAULT NULL 같은 수식어는 출력에서 제외
+- estimate_tokens 로 전체 DDL 대비 절감량을 계산
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+_CREATE_TABLE = re.compile(r"CREATE\s+TABLE\s+([\w.\"]+)\s*\(", re.IGNORECASE)
+_DESCRIPTION = re.compile(r'"(\w+)"\."(\w+)"\s+\'([^\']*)\'')
+_PRIMARY_KEY = re.compile(r"PRIMARY\s+KEY\s*\(([^)]*)\)", re.IGNORECASE)
+_TOKEN_PIECE = re.compile(r"[A-Za-z]+|\d+|[가-힣]+|[^\sA-Za-z\d가-힣]")
+_WORD = re.compile(r"[0-9a-zA-Z가-힣]+")
+_IDENTIFIER = re.compile(r"\w+")
+_TYPE_SUFFIX = re.compile(r"\s+(?:NOT\s+NULL|DEFAULT|NULL)\b", re.IGNORECASE)
+_IGNORED_PARTS = {"id", "code", "by", "flag"}
+_NOISE_COLUMN = re.compile(
+    r"^(GLOBAL_)?ATTRIBUTE\d+$|^MRC_|^USSGL_|^REFERENCE_KEY\d$|^REMITTANCE_MESSAGE\d$|^REFERENCE_\d$"
+)
+_GENERIC_DESCRIPTIONS = {"standard who column", "no longer used"}
+
+# 한국어 질문 키워드 → 컬럼 이름 조각
+KEYWORD_SYNONYMS: Dict[str, List[str]] = {
+    "홀딩": ["hold"], "보류": ["hold"], "해제": ["release"], "사유": ["reason"], "이유": ["reason"],
+    "금액": ["amount"], "공급사": ["vendor", "supplier"], "거래처": ["vendor", "supplier"],
+    "날짜": ["date"], "일자": ["date"], "조직": ["org"], "통화": ["currency"], "지급": ["payment", "paid"],
+    "세금": ["tax"], "승인": ["approval"], "발주": ["po"], "상태": ["status"], "상세": ["details"],
+    "라인": ["line"], "담당자": ["held", "by"],
+}
+
+# 테이블 이름에 드러나지 않는 테이블 선택 키워드 (질문에 구문이 그대로 포함되면 선택)
+TABLE_KEYWORDS: Dict[str, List[str]] = {
+    "AP_INVOICES": ["invoice details", "invoice detail", "invoice info", "invoice amount",
+                    "인보이스 상세", "인보이스 정보", "인보이스 금액", "송장"],
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """LLM 토큰 수 근사치 (영문 단어/숫자/한글 덩어리/기호 단위)"""
+    return len(_TOKEN_PIECE.findall(text))
+
+
+@dataclass
+class SchemaColumn:
+    name: str
+    data_type: str
+    not_null: bool = False
+    description: str = ""
+
+
+@dataclass
+class SchemaTable:
+    name: str
+    columns: Dict[str, SchemaColumn] = field(default_factory=dict)
+    primary_key: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SchemaSelection:
+    """질문 하나에 대해 고른 테이블/컬럼과 간결한 DDL, 토큰 절감량"""
+    question: str
+    columns: Dict[str, List[str]]
+    schema: str
+    tokens: int
+    full_tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.full_tokens - self.tokens
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "tables": list(self.columns),
+            "columns": sum(len(columns) for columns in self.columns.values()),
+            "schema_tokens": self.tokens,
+            "full_schema_tokens": self.full_tokens,
+            "saved_tokens": self.saved_tokens,
+            "saved_ratio": round(self.saved_tokens / self.full_tokens, 3) if self.full_tokens else 0.0,
+        }
+
+
+def _split_top_level(body: str) -> List[str]:
+    """괄호 밖의 콤마로 컬럼 정의를 나눕니다 (NUMBER(15,0) 보호)."""
+    items, depth, current = [], 0, []
+    for char in body:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            items.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    items.append("".join(current))
+    return [item.strip() for item in items if item.strip()]
+
+
+def _table_body(ddl: str, start: int) -> str:
+    depth = 1
+    for position in range(start, len(ddl)):
+        if ddl[position] == "(":
+            depth += 1
+        elif ddl[position] == ")":
+            depth -= 1
+            if depth == 0:
+                return ddl[start:position]
+    return ddl[start:]
+
+
+def _name_parts(name: str) -> Set[str]:
+    parts = set(name.lower().split("_"))
+    return parts | {part.rstrip("s") for part in parts}
+
+
+def _question_keywords(question: str) -> Set[str]:
+    keywords = set()
+    for word in _WORD.findall(question.lower()):
+        keywords.update({word, word.rstrip("s")})
+        if word.endswith("ing") and len(word) > 5:
+            keywords.add(word[:-3])
+        for korean, synonyms in KEYWORD_SYNONYMS.items():
+            if korean in word:
+                keywords.update(synonyms)
+    return keywords
+
+
+class SchemaContext:
+    """파싱된 스키마와 질문별 컬럼 선택기"""
+
+    def __init__(self, tables: Dict[str, SchemaTable], full_schema: str, core_columns: Optional[Dict[str, Sequence[str]]] = None) -> None:
+        self.tables = tables
+        self.full_schema = full_schema
+        self.full_tokens = estimate_tokens(full_schema)
+        self.core_columns = {table: list(columns) for table, columns in (core_columns or {}).items()}
+        self.primary_table = next(iter(tables), None)
+
+    @classmethod
+    def parse(cls, ddl: str, descriptions: str = "", core_columns: Optional[Dict[str, Sequence[str]]] = None) -> "SchemaContext":
+        tables: Dict[str, SchemaTable] = {}
+        for match in _CREATE_TABLE.finditer(ddl):
+            name = match.group(1).replace('"', "").split(".")[-1].upper()
+            table = SchemaTable(name)
+            for item in _split_top_level(_table_body(ddl, match.end())):
+                if item.upper().startswith("CONSTRAINT") or item.upper().startswith("PRIMARY KEY"):
+                    key = _PRIMARY_KEY.search(item)
+                    if key:
+                        table.primary_key = [column.strip().strip('"').upper() for column in key.group(1).split(",")]
+                    continue
+                pieces = item.split(None, 1)
+                column_name = pieces[0].strip('"').upper()
+                rest = pieces[1] if len(pieces) > 1 else ""
+                data_type = _TYPE_SUFFIX.split(rest, maxsplit=1)[0]
+                data_type = re.sub(r"\s+(BYTE|CHAR)\)", ")", data_type).strip()
+                table.columns[column_name] = SchemaColumn(column_name, data_type, "NOT NULL" in item.upper())
+            tables[name] = table
+
+        for table_name, column_name, text in _DESCRIPTION.findall(descriptions):
+            column = tables.get(table_name.upper(), SchemaTable("")).columns.get(column_name.upper())
+            if column is not None and text.strip().lower() not in _GENERIC_DESCRIPTIONS:
+                column.description = text.strip()
+        return cls(tables, ddl, core_columns)
+
+    @staticmethod
+    def _vocabulary(column: SchemaColumn) -> Set[str]:
+        description_words = {word.rstrip("s") for word in _WORD.findall(column.description.lower())}
+        return (_name_parts(column.name) | description_words) - _IGNORED_PARTS
+
+    def _matching_columns(self, table: SchemaTable, keywords: Set[str], identifiers: Set[str]) -> Set[str]:
+        """이름이 그대로 언급됐거나 (잡음 컬럼이 아니면서) 이름 조각/설명이 키워드와 겹치는 컬럼"""
+        matched = set()
+        for column in table.columns.values():
+            if column.name.lower() in identifiers:
+                matched.add(column.name)
+            elif not _NOISE_COLUMN.search(column.name) and keywords & self._vocabulary(column):
+                matched.add(column.name)
+        return matched
+
+    def select_columns(self, question: str) -> Dict[str, List[str]]:
+        """질문에 필요한 {테이블: [컬럼]} 을 DDL 순서대로 반환합니다."""
+        if self.primary_table is None:
+            return {}
+        keywords = _question_keywords(question)
+        lowered = question.lower()
+        identifiers = set(_IDENTIFIER.findall(lowered))
+        primary = self.tables[self.primary_table]
+        # 기본 테이블에도 있는 단어("invoice" 등)는 다른 테이블을 고르는 근거가 되지 않음
+        distinctive = keywords - set().union(*(self._vocabulary(column) for column in primary.columns.values()))
+
+        matched = {self.primary_table: self._matching_columns(primary, keywords, identifiers)}
+        selected = [self.primary_table]
+        for name, table in self.tables.items():
+            if name == self.primary_table:
+                continue
+            matched[name] = self._matching_columns(table, distinctive, identifiers) - set(primary.columns)
+            mentioned = name.lower() in lowered or any(phrase in lowered for phrase in TABLE_KEYWORDS.get(name, []))
+            if mentioned or matched[name]:
+                selected.append(name)
+
+        # 선택된 테이블 사이에 이름이 같은 *_ID 컬럼은 조인 키로 유지
+        join_keys: Set[str] = set()
+        for position, name in enumerate(selected):
+            for other in selected[position + 1:]:
+                shared = set(self.tables[name].columns) & set(self.tables[other].columns)
+                join_keys.update(column for column in shared if column.endswith("_ID"))
+
+        result: Dict[str, List[str]] = {}
+        for name in selected:
+            table = self.tables[name]
+            core = set(self.core_columns.get(name) or [c.name for c in table.columns.values() if c.not_null])
+            keep = core | set(table.primary_key) | (join_keys & set(table.columns)) | matched[name]
+            result[name] = [column for column in table.columns if column in keep]
+        return result
+
+    def render(self, columns: Dict[str, List[str]]) -> str:
+        """선택된 컬럼만으로 간결한 DDL 을 만듭니다 (설명은 SQL 주석)."""
+        blocks = []
+        for name, column_names in columns.items():
+            table = self.tables[name]
+            lines = []
+            for position, column_name in enumerate(column_names):
+                column = table.columns[column_name]
+                line = f"  {column.name} {column.data_type}"
+                if position < len(column_names) - 1 or table.primary_key:
+                    line += ","
+                if column.description:
+                    line += f" -- {column.description}"
+                lines.append(line)
+            if table.primary_key:
+                lines.append(f"  PRIMARY KEY ({', '.join(table.primary_key)})")
+            blocks.append(f"CREATE TABLE {name} (\n" + "\n".join(lines) + "\n);")
+        return "\n\n".join(blocks) + "\n"
+
+    def select(self, question: str) -> SchemaSelection:
+        columns = self.select_columns(question)
+        schema = self.render(columns)
+        return SchemaSelection(question, columns, schema, estimate_tokens(schema), self.full_tokens)
+
+    def select_many(self, questions: Iterable[str]) -> SchemaSelection:
+        """여러 질문에 필요한 컬럼의 합집합으로 하나의 간결한 DDL 을 만듭니다."""
+        merged: Dict[str, Set[str]] = {}
+        questions = list(questions)
+        for question in questions:
+            for name, column_names in self.select_columns(question).items():
+                merged.setdefault(name, set()).update(column_names)
+        columns = {
+            name: [column for column in self.tables[name].columns if column in merged[name]]
+            for name in self.tables if name in merged
+        }
+        schema = self.render(columns)
+        return SchemaSelection(" | ".join(questions), columns, schema, estimate_tokens(schema), self.full_tokens)
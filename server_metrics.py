@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+MCP 도구 계측 (Tool Metrics Middleware)
+
+FastMCP 미들웨어로 모든 도구 호출을 감싸 도구별로 다음을 집계합니다.
+
+- 호출 수, 예외 수, ErrorResponse(구조화 응답의 "error") 반환 수, 진행 중인 호출 수
+- 히스토그램: 전체 처리 시간, 실행 시간, 직렬화 시간, 응답 크기(TextContent UTF-8 바이트)
+  직렬화 시간은 도구가 record_serialization() 으로 알려 준 만큼이며(cached_response 의 Pydantic 직렬화),
+  실행 시간 = 전체 - 직렬화 입니다.
+- 느린 호출(slow_call_seconds 이상): 최근 목록 보관 + on_slow_call 훅 호출
+- 선택: profile_sample_rate 비율로 샘플링 프로파일러(pyinstrument)를 붙이고, 느린 호출의 리포트만 저장
+
+지표는 render_prometheus() (Prometheus 텍스트 형식)와 snapshot() (dict) 로 내보냅니다.
+"""
+import contextvars
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+DEFAULT_SLOW_CALL_SECONDS = 1.0
+MAX_SLOW_CALLS = 50
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "profiles")
+
+# 현재 도구 호출에서 측정된 직렬화 시간 (도구 → 미들웨어 전달용)
+_serialization_seconds: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "tool_serialization_seconds", default=None
+)
+
+
+def record_serialization(seconds: float) -> None:
+    """도구 안에서 측정한 직렬화 시간을 현재 호출의 지표에 더합니다 (계측 중이 아니면 무시)."""
+    spent = _serialization_seconds.get()
+    if spent is not None:
+        spent.append(seconds)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 과 같은 의미)"""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction: float) -> float:
+        """버킷 경계로 근사한 분위수 (대시보드/요약용)"""
+        if not self.count:
+            return 0.0
+        target = math.ceil(fraction * self.count)
+        seen = 0
+        for position, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[position] if position < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class ToolStats:
+    """도구 하나의 지표"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.error_responses = 0
+        self.in_flight = 0
+        self.total = Histogram(LATENCY_BUCKETS)
+        self.execution = Histogram(LATENCY_BUCKETS)
+        self.serialization = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_responses": self.error_responses,
+            "in_flight": self.in_flight,
+            "total_seconds": self.total.snapshot(),
+            "execution_seconds": self.execution.snapshot(),
+            "serialization_seconds": self.serialization.snapshot(),
+            "response_bytes": self.response_bytes.snapshot(),
+        }
+
+
+def _response_bytes(result: Any) -> int:
+    return sum(len(block.text.encode("utf-8")) for block in getattr(result, "content", None) or [] if hasattr(block, "text"))
+
+
+def _is_error_response(result: Any) -> bool:
+    structured = getattr(result, "structured_content", None)
+    if not isinstance(structured, dict):
+        return False
+    if "result" in structured and isinstance(structured["result"], dict):
+        structured = structured["result"]
+    return "error" in structured
+
+
+class ToolMetricsMiddleware(Middleware):
+    """모든 도구 호출을 계측하는 FastMCP 미들웨어 (mcp.add_middleware 로 등록)"""
+
+    def __init__(
+        self,
+        slow_call_seconds: float = DEFAULT_SLOW_CALL_SECONDS,
+        profile_sample_rate: float = 0.0,
+        profile_dir: str = PROFILE_DIR,
+    ) -> None:
+        self.slow_call_seconds = slow_call_seconds
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_dir = profile_dir
+        self.started_at = time.time()
+        self.on_slow_call: List[Callable[[Dict[str, Any]], None]] = []
+        self.slow_calls: Deque[Dict[str, Any]] = deque(maxlen=MAX_SLOW_CALLS)
+        self._tools: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ToolMetricsMiddleware":
+        """TOOL_SLOW_CALL_SECONDS / TOOL_PROFILE_SAMPLE_RATE / TOOL_PROFILE_DIR 환경 변수로 만듭니다."""
+        return cls(
+            slow_call_seconds=float(os.getenv("TOOL_SLOW_CALL_SECONDS", str(DEFAULT_SLOW_CALL_SECONDS))),
+            profile_sample_rate=float(os.getenv("TOOL_PROFILE_SAMPLE_RATE", "0")),
+            profile_dir=os.getenv("TOOL_PROFILE_DIR", PROFILE_DIR),
+        )
+
+    def _stats(self, tool: str) -> ToolStats:
+        stats = self._tools.get(tool)
+        if stats is None:
+            stats = self._tools.setdefault(tool, ToolStats())
+        return stats
+
+    def _start_profiler(self) -> Any:
+        if self.profile_sample_rate <= 0 or random.random() >= self.profile_sample_rate:
+            return None
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️  TOOL_PROFILE_SAMPLE_RATE 를 사용하려면 'uv sync --extra profiling' 가 필요합니다. 프로파일링을 끕니다.", file=sys.stderr)
+            self.profile_sample_rate = 0.0
+            return None
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        return profiler
+
+    def _save_profile(self, profiler: Any, tool: str) -> Optional[str]:
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{tool}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profiler.output_text(unicode=True))
+        return path
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: Callable) -> Any:
+        tool = context.message.name
+        with self._lock:
+            stats = self._stats(tool)
+            stats.in_flight += 1
+        spent: List[float] = []
+        token = _serialization_seconds.set(spent)
+        profiler = self._start_profiler()
+        started = time.perf_counter()
+        result = None
+        error: Optional[BaseException] = None
+        try:
+            result = await call_next(context)
+            return result
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            _serialization_seconds.reset(token)
+            if profiler is not None:
+                profiler.stop()
+            serialization = sum(spent)
+            with self._lock:
+                stats.in_flight -= 1
+                stats.calls += 1
+                stats.total.observe(elapsed)
+                stats.execution.observe(max(elapsed - serialization, 0.0))
+                stats.serialization.observe(serialization)
+                if error is not None:
+                    stats.errors += 1
+                else:
+                    stats.response_bytes.observe(_response_bytes(result))
+                    if _is_error_response(result):
+                        stats.error_responses += 1
+            if elapsed >= self.slow_call_seconds:
+                self._report_slow_call(tool, context.message.arguments, elapsed, serialization, error, profiler)
+
+    def _report_slow_call(
+        self,
+        tool: str,
+        arguments: Optional[Dict[str, Any]],
+        elapsed: float,
+        serialization: float,
+        error: Optional[BaseException],
+        profiler: Any,
+    ) -> None:
+        event = {
+            "tool": tool,
+            "arguments": arguments or {},
+            "seconds": round(elapsed, 4),
+            "serialization_seconds": round(serialization, 4),
+            "error": None if error is None else f"{type(error).__name__}: {error}",
+            "at": time.time(),
+            "profile": self._save_profile(profiler, tool) if profiler is not None else None,
+        }
+        self.slow_calls.append(event)
+        for hook in self.on_slow_call:
+            try:
+                hook(event)
+            except Exception as e:
+                print(f"⚠️  on_slow_call 훅 실패: {e}", file=sys.stderr)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """도구별 지표와 최근 느린 호출 목록"""
+        with self._lock:
+            tools = {tool: stats.snapshot() for tool, stats in sorted(self._tools.items())}
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "slow_call_seconds": self.slow_call_seconds,
+            "tools": tools,
+            "slow_calls": list(self.slow_calls),
+        }
+
+    def render_prometheus(
+        self,
+        extra_gauges: Optional[Dict[str, float]] = None,
+        extra_counters: Optional[Dict[str, float]] = None,
+    ) -> str:
+        """Prometheus 텍스트 노출 형식 (text/plain; version=0.0.4). 누적 값(*_total)은 extra_counters 로 넘깁니다."""
+        lines = [
+            "# HELP mcp_tool_calls_total MCP tool calls",
+            "# TYPE mcp_tool_calls_total counter",
+        ]
+        with self._lock:
+            tools = sorted(self._tools.items())
+            for tool, stats in tools:
+                lines.append(f'mcp_tool_calls_total{{tool="{tool}"}} {stats.calls}')
+            lines += ["# HELP mcp_tool_errors_total MCP tool failures", "# TYPE mcp_tool_errors_total counter"]
+            for tool, stats in tools:
+                lines.append(f'mcp_tool_errors_total{{tool="{tool}",kind="exception"}} {stats.errors}')
+                lines.append(f'mcp_tool_errors_total{{tool="{tool}",kind="error_response"}} {stats.error_responses}')
+            lines += ["# HELP mcp_tool_in_flight MCP tool calls in progress", "# TYPE mcp_tool_in_flight gauge"]
+            for tool, stats in tools:
+                lines.append(f'mcp_tool_in_flight{{tool="{tool}"}} {stats.in_flight}')
+            lines += ["# HELP mcp_tool_duration_seconds MCP tool call duration by phase", "# TYPE mcp_tool_duration_seconds histogram"]
+            for tool, stats in tools:
+                for phase, histogram in (("total", stats.total), ("execution", stats.execution), ("serialization", stats.serialization)):
+                    lines += _histogram_lines("mcp_tool_duration_seconds", f'tool="{tool}",phase="{phase}"', histogram)
+            lines += ["# HELP mcp_tool_response_bytes MCP tool response text size", "# TYPE mcp_tool_response_bytes histogram"]
+            for tool, stats in tools:
+                lines += _histogram_lines("mcp_tool_response_bytes", f'tool="{tool}"', stats.response_bytes)
+        for name, value in (extra_gauges or {}).items():
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+        for name, value in (extra_counters or {}).items():
+            lines += [f"# TYPE {name} counter", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
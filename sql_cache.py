@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+자연어 → SQL 2단계 캐시 (NL-to-SQL Cache)
+
+같은 질문이 반복될 때 AgenticSqlTool 의 SQL 생성/자기 수정(LLM 왕복)을 건너뛰기 위한 캐시입니다.
+
+- 1단계(L1): 정규화한 질문 → 에이전트가 생성한 SQL (스키마 지문이 키에 포함, 긴 TTL)
+- 2단계(L2): SQL + 바인드 값 → 결과 행 (짧은 TTL).
+  AP_HOLDS_ALL 워터마크(MAX(LAST_UPDATE_DATE) + 행 수)가 바뀌면 세대 번호를 올려 전부 무효화
+- 생성된 SQL 의 문자열 리터럴은 바인드 변수로 바꿔 실행하므로, 값만 다른 질문들도
+  드라이버 statement cache 를 공유합니다.
+- 읽기 전용 단일 SELECT/WITH 문만 캐시/실행합니다.
+- 미스일 때 SQL 과 결과 행은 에이전트 응답(SQL 도구의 실행 트레이스)에서 가져옵니다 (extract_sql / extract_sql_result).
+
+두 단계 모두 response_cache.ResponseCache (세대 + TTL + LRU)를 사용합니다.
+"""
+import json
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from response_cache import ResponseCache, make_cache_key
+
+DEFAULT_SQL_TTL_SECONDS = 24 * 3600.0
+DEFAULT_ROWS_TTL_SECONDS = 300.0
+DEFAULT_WATERMARK_INTERVAL = 5.0
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_WRITE_KEYWORDS = re.compile(
+    r"\b(insert|update|delete|merge|drop|alter|create|truncate|grant|revoke|begin|declare|execute|call|lock)\b",
+    re.IGNORECASE,
+)
+# 이 키워드 뒤의 리터럴은 바인드 변수로 바꿀 수 없음 (예: INTERVAL '1' DAY, DATE '2024-01-01')
+_TYPED_LITERAL_PREFIX = re.compile(r"\b(interval|date|timestamp)\s*$", re.IGNORECASE)
+_FENCED_SQL = re.compile(r"```sql\s*(.+?)```", re.DOTALL | re.IGNORECASE)
+_RESULT_KEY = re.compile(r"result|rows|records", re.IGNORECASE)
+_QUOTES = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+
+
+def normalize_question(question: str) -> str:
+    """대소문자/공백/따옴표/끝 문장부호 차이를 없앤 질문 키"""
+    text = unicodedata.normalize("NFKC", question).translate(_QUOTES).lower()
+    return re.sub(r"\s+", " ", text).strip(" .?!;")
+
+
+def _strip_sql(sql: str) -> str:
+    return _COMMENT.sub(" ", sql).strip().rstrip(";").strip()
+
+
+def is_read_only_sql(sql: str) -> bool:
+    """주석/문자열을 제외하고 단일 SELECT(또는 WITH ... SELECT) 문인지 확인합니다."""
+    body = _STRING_LITERAL.sub("''", _strip_sql(sql))
+    if ";" in body or not re.match(r"(select|with)\b", body, re.IGNORECASE):
+        return False
+    return _WRITE_KEYWORDS.search(body) is None
+
+
+def parameterize_sql(sql: str) -> Tuple[str, Dict[str, str]]:
+    """문자열 리터럴을 :p1, :p2 ... 바인드 변수로 바꿉니다."""
+    sql = _strip_sql(sql)
+    binds: Dict[str, str] = {}
+    parts: List[str] = []
+    position = 0
+    for match in _STRING_LITERAL.finditer(sql):
+        parts.append(sql[position:match.start()])
+        if _TYPED_LITERAL_PREFIX.search(sql, 0, match.start()):
+            parts.append(match.group(0))
+        else:
+            name = f"p{len(binds) + 1}"
+            binds[name] = match.group(0)[1:-1].replace("''", "'")
+            parts.append(":" + name)
+        position = match.end()
+    parts.append(sql[position:])
+    return "".join(parts), binds
+
+
+def _decode_json_text(value: str) -> Any:
+    """도구 실행 트레이스의 output 처럼 JSON 으로 직렬화된 문자열이면 풀어서 반환합니다 (아니면 None)."""
+    text = value.strip()
+    if text[:1] in ("{", "["):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+    return None
+
+
+def _iter_sql_candidates(value: Any, key: str = "") -> Iterator[str]:
+    if isinstance(value, dict):
+        for child_key, child in value.items():
+            yield from _iter_sql_candidates(child, str(child_key))
+    elif isinstance(value, list):
+        for child in value:
+            yield from _iter_sql_candidates(child, key)
+    elif isinstance(value, str):
+        decoded = _decode_json_text(value)
+        if decoded is not None:
+            yield from _iter_sql_candidates(decoded, key)
+            return
+        if "sql" in key.lower():
+            yield value
+        yield from (match.strip() for match in _FENCED_SQL.findall(value))
+
+
+def _iter_result_sets(value: Any, key: str = "") -> Iterator[Tuple[List[str], List[List[Any]]]]:
+    """{"columns": [...], "rows": [...]} 또는 결과 키(result/rows/records) 아래의 dict 목록을 (컬럼, 행) 으로 찾습니다."""
+    if isinstance(value, str):
+        decoded = _decode_json_text(value)
+        if decoded is not None:
+            yield from _iter_result_sets(decoded, key)
+    elif isinstance(value, dict):
+        columns, rows = value.get("columns"), value.get("rows")
+        if isinstance(columns, list) and isinstance(rows, list):
+            names = [str(column.get("name")) if isinstance(column, dict) else str(column) for column in columns]
+            yield names, [[row.get(name) for name in names] if isinstance(row, dict) else list(row) for row in rows]
+            return
+        for child_key, child in value.items():
+            yield from _iter_result_sets(child, str(child_key))
+    elif isinstance(value, list):
+        if _RESULT_KEY.search(key) and all(isinstance(item, dict) for item in value):
+            names = list(value[0]) if value else []
+            yield names, [[item.get(name) for name in names] for item in value]
+            return
+        for child in value:
+            yield from _iter_result_sets(child, key)
+
+
+def extract_sql(response: Any) -> Optional[str]:
+    """
+    에이전트 실행 결과(RunResponse)의 원본 응답/트레이스에서 SQL 도구가 생성한 SQL 을 찾습니다.
+    자기 수정으로 여러 번 생성됐다면 마지막(최종) SQL 을 반환합니다.
+    """
+    found = None
+    for raw_response in getattr(response, "raw_responses", []):
+        for candidate in _iter_sql_candidates(getattr(raw_response, "raw_data", None)):
+            if is_read_only_sql(candidate):
+                found = candidate
+    return _strip_sql(found) if found else None
+
+
+def extract_sql_result(response: Any) -> Optional[Tuple[List[str], List[List[Any]]]]:
+    """
+    SQL 도구가 원격에서 실행한 결과(컬럼, 행)를 에이전트 실행 결과에서 찾습니다.
+    여러 번 실행됐다면 마지막 결과를, 결과가 응답에 없으면 None 을 반환합니다.
+    """
+    found = None
+    for raw_response in getattr(response, "raw_responses", []):
+        for result in _iter_result_sets(getattr(raw_response, "raw_data", None)):
+            found = result
+    return found
+
+
+class NLSqlCache:
+    """질문 → SQL (L1), SQL + 바인드 → 결과 행 (L2) 캐시 (스레드 안전)"""
+
+    def __init__(
+        self,
+        schema_fingerprint: str = "",
+        sql_ttl_seconds: float = DEFAULT_SQL_TTL_SECONDS,
+        rows_ttl_seconds: float = DEFAULT_ROWS_TTL_SECONDS,
+        max_entries: int = 1024,
+        watermark_interval: float = DEFAULT_WATERMARK_INTERVAL,
+    ) -> None:
+        self.schema_fingerprint = schema_fingerprint
+        self.watermark_interval = watermark_interval
+        self._sql = ResponseCache(max_entries=max_entries, ttl_seconds=sql_ttl_seconds)
+        self._rows = ResponseCache(max_entries=max_entries, ttl_seconds=rows_ttl_seconds)
+        self._lock = threading.Lock()
+        self._watermark: Optional[str] = None
+        self._watermark_checked_at = 0.0
+        self.generation = 0
+
+    def _sql_key(self, question: str) -> str:
+        return make_cache_key("nl_sql", {"question": normalize_question(question), "schema": self.schema_fingerprint})
+
+    def lookup_sql(self, question: str) -> Optional[str]:
+        entry = self._sql.get(self._sql_key(question), 0)
+        return entry.text if entry is not None else None
+
+    def remember_sql(self, question: str, sql: str) -> None:
+        if is_read_only_sql(sql):
+            self._sql.put(self._sql_key(question), 0, _strip_sql(sql), {})
+
+    def forget_sql(self, question: str) -> None:
+        """캐시된 SQL 이 더 이상 실행되지 않을 때(스키마 변경 등) 제거합니다."""
+        self._sql.discard(self._sql_key(question))
+
+    def check_watermark(self, fetch_watermark: Callable[[], str]) -> int:
+        """
+        watermark_interval 초마다 DB 워터마크를 확인하고, 바뀌었으면 L2 세대를 올립니다.
+        현재 세대 번호를 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._watermark is not None and now - self._watermark_checked_at < self.watermark_interval:
+                return self.generation
+            watermark = fetch_watermark()
+            self._watermark_checked_at = now
+            if watermark != self._watermark:
+                if self._watermark is not None:
+                    self.generation += 1
+                self._watermark = watermark
+            return self.generation
+
+    def get_rows(self, sql: str, binds: Dict[str, Any], generation: int) -> Optional[Dict[str, Any]]:
+        entry = self._rows.get(make_cache_key(sql, binds), generation)
+        return entry.structured if entry is not None else None
+
+    def put_rows(self, sql: str, binds: Dict[str, Any], generation: int, columns: List[str], rows: List[Any]) -> Dict[str, Any]:
+        structured = {"columns": columns, "rows": [list(row) for row in rows]}
+        text = json.dumps(structured, ensure_ascii=False, default=str)
+        return self._rows.put(make_cache_key(sql, binds), generation, text, structured).structured
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"sql": self._sql.metrics(), "rows": self._rows.metrics(), "generation": self.generation}
@@ -1,7 +1,19 @@
 import asyncio
+import hashlib
 import os
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, List, Optional
 from dotenv import load_dotenv
+from agent_runner import BatchResult, run_batch, run_in_worker_thread
+from hold_datasource import HOLD_COLUMNS, create_sql_tool_repository_from_env
+from schema_context import SchemaContext, SchemaSelection
+from sql_cache import NLSqlCache, extract_sql, extract_sql_result, parameterize_sql
+from tracing import Tracer, format_summary, instrument_agent
 from oci.addons.adk import Agent, AgentClient
+from oci.addons.adk.run.response import RunResponse
 
 from oci.addons.adk.run.types import InlineInputLocation, ObjectStorageInputLocation
 from oci.addons.adk.tool.prebuilt.agentic_sql_tool import AgenticSqlTool, SqlDialect, ModelSize
@@ -302,52 +314,343 @@ CREATE TABLE AP_INVOICES (
 # REGION=ap-osaka-1
 # PROFILE=osaka
 
-async def main():
-    agent_endpoint_id=os.getenv("AGENT_ENDPOINT_ID")
-    region=os.getenv("REGION")
-    profile=os.getenv("PROFILE")
-    
-    client = AgentClient(auth_type="api_key", profile=profile, region=region)
+DB_TOOL_CONNECTION_ID = os.getenv(
+    "DB_TOOL_CONNECTION_ID",
+    "ocid1.databasetoolsconnection.oc1.ap-osaka-1.amaaaaaarykjadqa7ni7qmam45tfm55omynvz5sxrakmy25w37nf7mdajfxq"
+)
+
+SQL_TOOL_CUSTOM_INSTRUCTIONS = "selected columns : invoice_id, line_location_id, hold_lookup_code, last_update_date, last_updated_by, held_by, hold_date, hold_reason, release_lookup_code, release_reason, org_id, responsibility_id, rcv_transaction_id, hold_details, line_number, hold_id, wf_status, validation_request_id"
+
+# DDL/컬럼 설명은 한 번만 파싱. AP_HOLDS_ALL 핵심 컬럼은 custom_instructions 와 같은 목록
+SCHEMA_CONTEXT = SchemaContext.parse(INLINE_DATABASE_SCHEMA, INLINE_TABLE_DESC, core_columns={"AP_HOLDS_ALL": HOLD_COLUMNS})
+
+# TRACE_FILE / OTEL_EXPORTER_OTLP_ENDPOINT 가 없으면 메모리에만 기록 (턴 요약용)
+tracer = Tracer.from_env("sqltool-call")
+
+# ICL 예제 질문 외에 자주 묻는 AP_INVOICES 항목
+SQL_TOOL_SCHEMA_TOPICS = [
+    "invoice amount, amount paid, tax amount and currency",
+    "vendor and vendor site",
+    "invoice date, gl date and terms",
+    "approval status, payment status and description",
+]
+
+# SQL 도구 스키마는 도구 등록 시점에 고정되므로, ICL 예제 질문 + 주제들에 필요한 컬럼의 합집합으로 축소한 DDL 을 등록
+# (SQL_TOOL_SCHEMA=full 이면 전체 DDL)
+TOOL_SCHEMA: SchemaSelection = SCHEMA_CONTEXT.select_many(
+    re.findall(r"^Question:\s*(.+)$", INLINE_ICL_EXAMPLES, re.MULTILINE) + SQL_TOOL_SCHEMA_TOPICS
+)
+if os.getenv("SQL_TOOL_SCHEMA", "pruned") == "full":
+    TOOL_SCHEMA = SchemaSelection("", {}, INLINE_DATABASE_SCHEMA, SCHEMA_CONTEXT.full_tokens, SCHEMA_CONTEXT.full_tokens)
 
-    sql_tool_with_inline_schema = AgenticSqlTool(
+
+def schema_report(question: str) -> dict:
+    """질문별 스키마 선택 결과와 토큰 절감량 (등록된 스키마가 질문에 필요한 컬럼을 모두 포함하는지 포함)"""
+    selection = SCHEMA_CONTEXT.select(question)
+    registered = TOOL_SCHEMA.columns
+    uncovered = [
+        f"{table}.{column}"
+        for table, columns in selection.columns.items()
+        for column in columns
+        if registered and column not in registered.get(table, [])
+    ]
+    return {
+        **selection.report(),
+        "sent_schema_tokens": TOOL_SCHEMA.tokens,
+        "sent_saved_tokens": TOOL_SCHEMA.saved_tokens,
+        "uncovered_columns": uncovered,
+    }
+
+
+def build_sql_tool(database_schema: str = TOOL_SCHEMA.schema) -> AgenticSqlTool:
+    """AP 홀딩 질의용 AgenticSqlTool 을 만듭니다."""
+    return AgenticSqlTool(
         name="get_invoice_holdings",
         description="Use this tool to answer questions about invoice holds.",
-        database_schema=InlineInputLocation(content=INLINE_DATABASE_SCHEMA),
+        database_schema=InlineInputLocation(content=database_schema),
         model_size=ModelSize.LARGE,
         dialect=SqlDialect.ORACLE_SQL,
-        db_tool_connection_id="ocid1.databasetoolsconnection.oc1.ap-osaka-1.amaaaaaarykjadqa7ni7qmam45tfm55omynvz5sxrakmy25w37nf7mdajfxq",
+        db_tool_connection_id=DB_TOOL_CONNECTION_ID,
         enable_sql_execution=True,
         enable_self_correction=True,
         #icl_examples=ObjectStorageInputLocation(namespace_name="namespace", bucket_name="bucket", prefix="_sql.icl_examples.txt"),
-        custom_instructions="selected columns : invoice_id, line_location_id, hold_lookup_code, last_update_date, last_updated_by, held_by, hold_date, hold_reason, release_lookup_code, release_reason, org_id, responsibility_id, rcv_transaction_id, hold_details, line_number, hold_id, wf_status, validation_request_id"
+        custom_instructions=SQL_TOOL_CUSTOM_INSTRUCTIONS
     )
 
+
+def build_agent(client: Optional[AgentClient] = None) -> Agent:
+    """환경 변수(.env)의 설정으로 SQL 도구가 연결된 Agent 를 만듭니다."""
+    if client is None:
+        client = AgentClient(auth_type="api_key", profile=os.getenv("PROFILE"), region=os.getenv("REGION"))
     agent = Agent(
         client=client,
-        agent_endpoint_id=agent_endpoint_id,
+        agent_endpoint_id=os.getenv("AGENT_ENDPOINT_ID"),
         instructions="Use the tools to answer the questions.",
 
-        tools=[sql_tool_with_inline_schema]
+        tools=[build_sql_tool()]
     )
+    # chat 호출(원격 SQL 도구의 SQL 생성/실행 포함)을 llm span 으로 기록
+    return instrument_agent(agent, tracer)
+
+
+@dataclass
+class PooledAgent:
+    """풀에 보관되는 Agent 와 상태 정보"""
+    agent: Agent
+    created_at: float = field(default_factory=time.monotonic)
+    last_checked_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    broken: bool = False
+
+
+class AgentPool:
+    """
+    미리 설정해 둔 Agent/AgentClient 를 재사용하는 풀
+
+    AgentClient 는 인증 정보와 OCI SDK 클라이언트(내부 HTTP 커넥션 풀)를 가지므로,
+    요청마다 새로 만들지 않고 슬롯별로 재사용합니다. 한 슬롯은 한 번에 한 요청만 사용합니다.
+
+    - 헬스 체크: 마지막 확인 후 health_check_interval 초가 지난 슬롯은 엔드포인트 조회로 확인
+    - 재활용: max_uses 회 사용했거나 max_age 초가 지났거나 오류가 난 슬롯은 새로 만듦
+    """
+
+    def __init__(
+        self,
+        size: int = int(os.getenv("AGENT_POOL_SIZE", "4")),
+        max_uses: int = 500,
+        max_age: float = 1800.0,
+        health_check_interval: float = 300.0,
+        agent_factory: Callable[[], Agent] = build_agent,
+        setup_tools: bool = False,
+    ) -> None:
+        self.size = size
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        self.agent_factory = agent_factory
+        self.setup_tools = setup_tools
+        self._idle: "asyncio.Queue[PooledAgent]" = asyncio.Queue()
+        self._started = False
+
+    async def start(self) -> "AgentPool":
+        """슬롯을 미리 만들어 둡니다 (인증/클라이언트 초기화는 블로킹이므로 스레드에서 병렬 수행)."""
+        if self._started:
+            return self
+        slots = await asyncio.gather(*(self._create() for _ in range(self.size)))
+        if self.setup_tools:
+            # 원격 도구 등록은 엔드포인트당 한 번이면 충분
+            await asyncio.to_thread(slots[0].agent.setup)
+        for slot in slots:
+            self._idle.put_nowait(slot)
+        self._started = True
+        return self
+
+    async def _create(self) -> PooledAgent:
+        return PooledAgent(agent=await asyncio.to_thread(self.agent_factory))
+
+    async def _is_healthy(self, slot: PooledAgent) -> bool:
+        now = time.monotonic()
+        if slot.broken or slot.uses >= self.max_uses or now - slot.created_at >= self.max_age:
+            return False
+        if now - slot.last_checked_at < self.health_check_interval:
+            return True
+        try:
+            await asyncio.to_thread(
+                slot.agent.client.get_agent_endpoint_details, slot.agent.agent_endpoint_id
+            )
+        except Exception:
+            return False
+        slot.last_checked_at = now
+        return True
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Agent]:
+        """사용 가능한 Agent 를 빌려옵니다. 모든 슬롯이 사용 중이면 반납될 때까지 기다립니다."""
+        if not self._started:
+            await self.start()
+        slot = await self._idle.get()
+        try:
+            if not await self._is_healthy(slot):
+                slot = await self._create()
+        except BaseException:
+            self._idle.put_nowait(slot)
+            raise
+        try:
+            yield slot.agent
+        except BaseException:
+            # 오류/타임아웃이 난 슬롯은 재사용하지 않음 (타임아웃이면 스레드가 아직 사용 중일 수 있음)
+            slot.broken = True
+            raise
+        finally:
+            slot.uses += 1
+            self._idle.put_nowait(slot)
+
+    async def run(self, question: str, **kwargs: Any) -> RunResponse:
+        """풀의 Agent 로 질문 하나를 처리합니다 (블로킹 호출은 워커 스레드에서 실행)."""
+        async with self.acquire() as agent:
+            return await run_in_worker_thread(agent, question, **kwargs)
 
-    # 2개의 질문을 차례로 질의하고 답변받음
-    # input_msg ="홀딩된 인보이스 목록을 보여줘, hold 이유도 포함하여  20건 만 보여주고 hold_date으로 descending 해줘" 
-    input_msg ="list first 10 records in ap_holds_all where release_reason is null " 
-    input_msg ="list first 10 records in ap_holds_all where release_reason is null and hold_loook_code in ('QTY ORD', 'QTY  REC', 'PRICE', 'AMT ORG');"
-    input_msg =" get invoice holding list first 10 records"
-    print(f"Running: {input_msg}")
-    response = await agent.run_async(input_msg)
-    
-    response.pretty_print()
-    #print(f"답변: \n{response.messages}")
+    async def run_many(self, questions: List[str], **batch_options: Any) -> List[BatchResult]:
+        """
+        여러 질문을 풀 크기만큼 동시에 실행하고 입력 순서대로 결과를 반환합니다.
+        batch_options 는 agent_runner.run_batch 옵션(timeout, max_retries, backoff, on_result)입니다.
+        """
+        batch_options.setdefault("concurrency", self.size)
+        return await run_batch(questions, self.run, **batch_options)
 
+
+@dataclass
+class SqlAnswer:
+    """
+    질문 하나의 답변. cache 는 "miss"(에이전트 실행), "sql"(L1 히트, DB 직접 실행), "rows"(L2 히트)
+
+    sql / columns / rows 는 캐시 여부와 관계없이 같은 모양입니다 (미스면 SQL 도구가 실행한 결과를 응답에서 가져옴).
+    response(에이전트의 자연어 답변)와 schema 는 미스일 때만 있고, 읽기 전용 연결이 없거나
+    응답에서 SQL/결과 행을 찾지 못했으면 미스 답변의 rows 는 비어 있습니다.
+    """
+    question: str
+    cache: str
+    sql: Optional[str] = None
+    columns: List[str] = field(default_factory=list)
+    rows: List[List[Any]] = field(default_factory=list)
+    response: Optional[RunResponse] = None
+    schema: dict = field(default_factory=dict)
+    # 턴 시간 분해 (tracing.summarize_spans: total / llm / sql / other 초)
+    trace: dict = field(default_factory=dict)
+
+    def pretty_print(self) -> None:
+        if self.response is not None:
+            self.response.pretty_print()
+            return
+        print(f"[cache:{self.cache}] {self.sql}")
+        print(" | ".join(self.columns))
+        for row in self.rows:
+            print(" | ".join("" if value is None else str(value) for value in row))
+
+
+class CachedSqlAgent:
+    """
+    AgentPool 앞에 NL→SQL 2단계 캐시를 둔 질의기
+
+    처음 보는 질문은 에이전트가 SQL 생성/자기 수정/실행을 하고, 응답에서 최종 SQL 을 L1 에 기억합니다.
+    같은 질문이 다시 오면 LLM 을 거치지 않고 기억한 SQL 을 직접 실행하며(L2 캐시 사용),
+    실행에 실패하면 L1 항목을 버리고 에이전트로 되돌아갑니다.
+
+    SQL 은 MCP 서버의 HOLD_DATA_SOURCE 가 아니라 SQL 도구와 같은 읽기 전용 계정(SQL_TOOL_DATA_SOURCE,
+    DB 수준 READ ONLY)에서만 실행합니다. 설정되지 않았으면 캐시 없이 에이전트만 사용합니다.
+
+    미스일 때는 SQL 도구가 이미 실행한 결과 행을 응답에서 가져와 L2 에 넣으므로 같은 SQL 을 다시 실행하지 않습니다.
+    verify_on_miss(SQL_CACHE_VERIFY_ON_MISS=1)이면 기억하기 전에 읽기 전용 연결에서 한 번 더 실행해
+    실행되는 SQL 만 기억하고, 그 결과를 답변에 씁니다 (DB 왕복 1회 추가).
+    """
+
+    def __init__(
+        self,
+        pool: AgentPool,
+        repository: Any = None,
+        cache: Optional[NLSqlCache] = None,
+        verify_on_miss: bool = os.getenv("SQL_CACHE_VERIFY_ON_MISS", "0") == "1",
+    ) -> None:
+        self.pool = pool
+        self.verify_on_miss = verify_on_miss
+        self.repository = repository if repository is not None else create_sql_tool_repository_from_env()
+        if not getattr(self.repository, "read_only", False) or not hasattr(self.repository, "select"):
+            self.repository = None
+        self.cache = cache or NLSqlCache(schema_fingerprint=hashlib.sha1(
+            (TOOL_SCHEMA.schema + SQL_TOOL_CUSTOM_INSTRUCTIONS).encode("utf-8")
+        ).hexdigest())
+
+    def _execute_cached(self, question: str, sql: str) -> SqlAnswer:
+        with tracer.span("sql.execute", category="sql") as span:
+            answer = self._execute_cached_sql(question, sql)
+            span.set(cache=answer.cache, rows=len(answer.rows))
+            return answer
+
+    def _execute_cached_sql(self, question: str, sql: str) -> SqlAnswer:
+        statement, binds = parameterize_sql(sql)
+        generation = self.cache.check_watermark(self.repository.last_update_watermark)
+        cached = self.cache.get_rows(statement, binds, generation)
+        if cached is not None:
+            return SqlAnswer(question, "rows", sql, cached["columns"], cached["rows"])
+        columns, rows = self.repository.select(statement, binds)
+        stored = self.cache.put_rows(statement, binds, generation, columns, rows)
+        return SqlAnswer(question, "sql", sql, stored["columns"], stored["rows"])
+
+    async def ask(self, question: str) -> SqlAnswer:
+        with tracer.span("sql.turn", question=question) as span:
+            answer = await self._ask(question)
+            span.set(cache=answer.cache)
+        if span.parent_id is None:
+            answer.trace = tracer.summarize(span.trace_id)
+        return answer
+
+    async def _ask(self, question: str) -> SqlAnswer:
+        if self.repository is not None:
+            sql = self.cache.lookup_sql(question)
+            if sql is not None:
+                try:
+                    return await asyncio.to_thread(self._execute_cached, question, sql)
+                except Exception:
+                    self.cache.forget_sql(question)
+
+        with tracer.span("sql.generate"):
+            response = await self.pool.run(question)
+        sql = extract_sql(response)
+        answer = SqlAnswer(question, "miss", sql, response=response, schema=schema_report(question))
+        if sql is None or self.repository is None:
+            return answer
+        if self.verify_on_miss:
+            try:
+                executed = await asyncio.to_thread(self._execute_cached, question, sql)
+            except Exception:
+                # 읽기 전용 연결에서 실행되지 않는 SQL 은 기억하지 않음
+                return answer
+            answer.columns, answer.rows = executed.columns, executed.rows
+        else:
+            result = extract_sql_result(response)
+            if result is not None:
+                answer.columns, answer.rows = await asyncio.to_thread(self._store_result, sql, *result)
+        # 검증하지 않은 SQL 이 나중에 실행되지 않으면 L1 히트 때 버리고 에이전트로 되돌아감
+        self.cache.remember_sql(question, sql)
+        return answer
+
+    def _store_result(self, sql: str, columns: List[str], rows: List[Any]) -> tuple:
+        """SQL 도구가 실행한 결과를 L2 에 넣고 (컬럼, 행) 을 반환합니다."""
+        statement, binds = parameterize_sql(sql)
+        generation = self.cache.check_watermark(self.repository.last_update_watermark)
+        stored = self.cache.put_rows(statement, binds, generation, columns, rows)
+        return stored["columns"], stored["rows"]
+
+    async def ask_many(self, questions: List[str], **batch_options: Any) -> List[BatchResult]:
+        batch_options.setdefault("concurrency", self.pool.size)
+        return await run_batch(questions, self.ask, **batch_options)
+
+
+async def main():
+    pool = await AgentPool(size=2).start()
+    agent = CachedSqlAgent(pool)
+
+    # 2개의 질문을 동시에 질의하고 입력 순서대로 답변받음
+    # "홀딩된 인보이스 목록을 보여줘, hold 이유도 포함하여  20건 만 보여주고 hold_date으로 descending 해줘"
+    # "list first 10 records in ap_holds_all where release_reason is null and hold_loook_code in ('QTY ORD', 'QTY  REC', 'PRICE', 'AMT ORG');"
     # invoice_id: 13193
-    #input_msg ="list  first 10 records in ap_holds_all where release_reason is null and invoice_id='13193' " 
-    
-    input_msg ="list details invoice holding info for invoice_id='81882'  " 
-    print(f"Running: {input_msg}")
-    response = await agent.run_async(input_msg)
-    response.pretty_print()
+    # "list  first 10 records in ap_holds_all where release_reason is null and invoice_id='13193' "
+    questions = [
+        " get invoice holding list first 10 records",
+        "list details invoice holding info for invoice_id='81882'  ",
+    ]
+    for question in questions:
+        print(f"Running: {question}")
+
+    for result in await agent.ask_many(questions):
+        print(f"[{result.index + 1}] {result.question.strip()} ({result.elapsed:.1f}s, {result.attempts}회 시도)")
+        if result.ok:
+            result.response.pretty_print()
+            if result.response.schema:
+                print(f"스키마 토큰: {result.response.schema['sent_schema_tokens']} / {result.response.schema['full_schema_tokens']}")
+            print(f"⏱️  {format_summary(result.response.trace)}")
+        else:
+            print(f"오류: {result.error!r}")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
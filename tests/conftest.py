@@ -0,0 +1,99 @@
+"""
+공통 픽스처: 같은 Mock 홀딩 10건을 담은 저장소 백엔드 (메모리 / SQLite 대체 DB / 스냅숏)
+
+스냅숏 백엔드는 numpy 가 없으면 건너뜁니다.
+"""
+import pytest
+
+from hold_datasource import SQLitePool, SqlHoldRepository, seed_sqlite_standin
+from hold_mock_data import create_mock_repository
+
+BACKENDS = ["memory", "sqlite", "snapshot"]
+
+
+def make_repository(backend: str, tmp_path):
+    if backend == "memory":
+        return create_mock_repository()
+    if backend == "sqlite":
+        path = str(tmp_path / "holds.db")
+        seed_sqlite_standin(path, create_mock_repository().iter_records())
+        return SqlHoldRepository(SQLitePool(path))
+    if backend == "snapshot":
+        pytest.importorskip("numpy")
+        from hold_snapshot import SnapshotHoldRepository, save_snapshot
+
+        path = str(tmp_path / "snapshot")
+        save_snapshot(create_mock_repository().iter_records(), path)
+        return SnapshotHoldRepository(path)
+    raise ValueError(backend)
+
+
+@pytest.fixture(params=BACKENDS)
+def repository(request, tmp_path):
+    return make_repository(request.param, tmp_path)
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    path = str(tmp_path / "holds.db")
+    seed_sqlite_standin(path, create_mock_repository().iter_records())
+    return path
+
+
+@pytest.fixture
+def new_record():
+    """테스트용 홀딩 레코드를 만드는 함수 (기본값: 수량 불일치 / ORG 101)"""
+    def make(invoice_id: str, **overrides):
+        record = {
+            "id": invoice_id,
+            "status": "holding",
+            "reason": "수량 불일치",
+            "hold_lookup_code": "QTY ORD",
+            "org_id": 101,
+            "hold_date": "2024-10-01",
+            "detail": "테스트 홀딩",
+        }
+        record.update(overrides)
+        return record
+
+    return make
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Mock 저장소로 초기화한 hold_resolve_mcp 모듈 (핫 리로드 끔)"""
+    pytest.importorskip("fastmcp")
+    monkeypatch.setenv("HOT_RELOAD_INTERVAL", "0")
+    import hold_resolve_mcp
+
+    hold_resolve_mcp.set_repository(create_mock_repository())
+    hold_resolve_mcp.initialize()
+    return hold_resolve_mcp
+
+
+@pytest.fixture
+def server_rule_book(server, tmp_path):
+    """서버가 임시 GuideBook.md 사본을 쓰게 하고 사본 경로를 반환 (끝나면 원래 규정집으로 복원)"""
+    import shutil
+
+    from rulebook_procedures import build_procedure_table
+    from rulebook_search import RULE_BOOK_PATH, RuleBookIndex
+
+    path = tmp_path / "GuideBook.md"
+    shutil.copy(RULE_BOOK_PATH, path)
+    original = (server._rule_book_index, server._procedure_table)
+    index = RuleBookIndex.load_or_build(str(path), cache_path=None)
+    server._activate_rule_book((index, build_procedure_table(index.chunks)))
+    yield path
+    server._activate_rule_book(original)
+
+
+def edit_rule_book(path, old: str, new: str) -> None:
+    """규정집 사본을 고치고 mtime 을 앞당겨 변경으로 감지되게 합니다."""
+    import os
+
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new), encoding="utf-8")
+    mtime = os.path.getmtime(path) + 5
+    os.utime(path, (mtime, mtime))
@@ -0,0 +1,95 @@
+"""AgentPool: 미리 만든 Agent 슬롯 재사용, 헬스 체크/사용 횟수/오류에 따른 재생성"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("oci")
+
+from sqltool_call import AgentPool
+
+
+class _Client:
+    def __init__(self, healthy: bool = True):
+        self.healthy = healthy
+        self.checks = 0
+
+    def get_agent_endpoint_details(self, endpoint_id):
+        self.checks += 1
+        if not self.healthy:
+            raise ConnectionError("endpoint unavailable")
+
+
+class _Agent:
+    created = 0
+
+    def __init__(self):
+        _Agent.created += 1
+        self.client = _Client()
+        self.agent_endpoint_id = "ocid1.endpoint"
+        self.setup_calls = 0
+
+    def setup(self):
+        self.setup_calls += 1
+
+    async def run_async(self, question, **kwargs):
+        if question == "fail":
+            raise ValueError("bad question")
+        return f"answer: {question}"
+
+
+@pytest.fixture(autouse=True)
+def _reset_counter():
+    _Agent.created = 0
+
+
+def _run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=5))
+
+
+def test_slots_are_created_once_and_reused():
+    async def main():
+        pool = await AgentPool(size=2, agent_factory=_Agent, setup_tools=True).start()
+        answers = [await pool.run(f"q{number}") for number in range(5)]
+        return pool, answers
+
+    pool, answers = _run(main())
+    assert answers == [f"answer: q{number}" for number in range(5)]
+    assert _Agent.created == 2
+
+
+def test_run_many_keeps_input_order():
+    async def main():
+        pool = AgentPool(size=2, agent_factory=_Agent)
+        return await pool.run_many(["a", "fail", "b"], max_retries=0)
+
+    results = _run(main())
+    assert [result.response for result in results] == ["answer: a", None, "answer: b"]
+    assert isinstance(results[1].error, ValueError)
+
+
+def test_failed_and_worn_out_slots_are_replaced():
+    async def main():
+        pool = AgentPool(size=1, max_uses=2, agent_factory=_Agent)
+        with pytest.raises(ValueError):
+            await pool.run("fail")
+        await pool.run("after failure")
+        await pool.run("second use")
+        await pool.run("third use")
+
+    _run(main())
+    # 시작 1 + 실패 후 1 + 사용 횟수 초과 후 1
+    assert _Agent.created == 3
+
+
+def test_unhealthy_slot_is_replaced_after_check_interval():
+    async def main():
+        pool = await AgentPool(size=1, health_check_interval=0, agent_factory=_Agent).start()
+        async with pool.acquire() as agent:
+            agent.client.healthy = False
+        async with pool.acquire() as replacement:
+            return agent, replacement
+
+    agent, replacement = _run(main())
+    assert replacement is not agent
+    # 간격이 0이면 빌려줄 때마다 확인 (첫 번째는 정상, 두 번째에서 실패)
+    assert agent.client.checks == 2
@@ -0,0 +1,102 @@
+"""run_batch 의 동시 실행 제한/재시도/타임아웃과, AgentWorkerPool 의 결과/예외 전달"""
+import asyncio
+import contextlib
+
+import pytest
+
+from agent_runner import AgentWorkerPool, run_batch
+
+
+class _StubAgent:
+    async def run_async(self, question, **kwargs):
+        if question == "cancel":
+            raise asyncio.CancelledError()
+        if question == "fail":
+            raise ValueError("bad question")
+        return f"answer: {question}"
+
+
+@contextlib.asynccontextmanager
+async def _factory():
+    yield _StubAgent()
+
+
+def _run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=5))
+
+
+class _Throttled(Exception):
+    status = 429
+
+
+def test_run_batch_bounds_concurrency_and_keeps_order():
+    running, peak = 0, 0
+
+    async def run(question):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return question.upper()
+
+    finished = []
+    results = _run(run_batch([f"q{number}" for number in range(6)], run, concurrency=2, on_result=finished.append))
+    assert [result.response for result in results] == [f"Q{number}" for number in range(6)]
+    assert [result.index for result in results] == list(range(6))
+    assert peak == 2 and len(finished) == 6
+
+
+def test_run_batch_retries_only_throttling():
+    calls = {}
+
+    async def run(question):
+        calls[question] = calls.get(question, 0) + 1
+        if question == "throttled" and calls[question] < 3:
+            raise _Throttled()
+        if question == "broken":
+            raise ValueError("bad SQL")
+        if question == "slow":
+            await asyncio.sleep(1)
+        return "ok"
+
+    results = _run(run_batch(["throttled", "broken", "slow"], run, timeout=0.05, backoff=0.001))
+    assert (results[0].response, results[0].attempts) == ("ok", 3)
+    assert isinstance(results[1].error, ValueError) and results[1].attempts == 1
+    assert isinstance(results[2].error, asyncio.TimeoutError) and not results[2].ok
+
+
+def test_pool_returns_results_and_errors():
+    async def main():
+        async with AgentWorkerPool(_factory, size=2) as pool:
+            answers = await asyncio.gather(*(pool.run(f"q{number}") for number in range(4)))
+            with pytest.raises(ValueError):
+                await pool.run("fail")
+            return answers
+
+    assert _run(main()) == [f"answer: q{number}" for number in range(4)]
+
+
+def test_cancelled_job_does_not_hang_caller():
+    async def main():
+        async with AgentWorkerPool(_factory, size=1) as pool:
+            with pytest.raises(asyncio.CancelledError):
+                await pool.run("cancel")
+            # 워커 하나뿐인 풀에서도 다음 작업이 처리되어야 함
+            return await pool.run("next")
+
+    # 예전에는 CancelledError 가 결과로 전달되지 않아 run() 이 끝나지 않았음
+    assert _run(main()) == "answer: next"
+
+
+def test_factory_error_fails_start():
+    @contextlib.asynccontextmanager
+    async def broken():
+        raise ConnectionError("MCP server unavailable")
+        yield
+
+    async def main():
+        with pytest.raises(ConnectionError):
+            await AgentWorkerPool(broken, size=2).start()
+
+    _run(main())
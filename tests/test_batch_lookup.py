@@ -0,0 +1,36 @@
+"""일괄 조회 도구: 요청 순서대로 항목을 돌려주고, 없는 ID는 개별 오류로 담음"""
+import asyncio
+import json
+
+
+def _call(tool, **arguments) -> dict:
+    result = asyncio.run(tool.fn(**arguments))
+    return json.loads(result.content[0].text)
+
+
+def test_batch_returns_items_in_request_order(server):
+    batch = _call(server.get_holding_reason_details, invoice_ids=["INV-003", "INV-001", "INV-002"])
+    assert [item["invoice_id"] for item in batch["items"]] == ["INV-003", "INV-001", "INV-002"]
+    assert batch["items"][0]["reason"] == "재고 부족"
+    assert batch["errors"] == []
+
+
+def test_batch_reports_missing_ids_and_drops_duplicates(server):
+    batch = _call(server.get_holding_reason_details, invoice_ids=["INV-001", "INV-999", "INV-001"])
+    assert [item["invoice_id"] for item in batch["items"]] == ["INV-001"]
+    assert len(batch["errors"]) == 1
+    error = batch["errors"][0]
+    assert error["invoice_id"] == "INV-999"
+    assert "not found" in error["error"]
+    assert len(error["suggested_ids"]) <= 3
+
+
+def test_batch_matches_single_lookups(server):
+    batch = _call(server.get_holding_reason_details, invoice_ids=["INV-001", "INV-002"])
+    singles = [_call(server.get_holding_reason_detail, invoice_id=invoice_id) for invoice_id in ("INV-001", "INV-002")]
+    assert batch["items"] == singles
+
+
+def test_batch_size_is_limited(server):
+    invoice_ids = [f"INV-{number}" for number in range(server.MAX_PAGE_SIZE + 1)]
+    assert "Too many invoice IDs" in _call(server.get_holding_reason_details, invoice_ids=invoice_ids)["error"]
@@ -0,0 +1,112 @@
+"""벤치마크 하네스: 합성 데이터 적재, 백분위/요약, import 시간 파싱, 기준 대비 회귀 판정, 스텁 에이전트"""
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from hold_benchmark import (
+    StubSqlAgent, bench_agent, compare_with_baseline, parse_importtime, percentile, seed_benchmark_db, summarize,
+)
+from sql_cache import extract_sql, extract_sql_result
+
+
+@pytest.fixture
+def bench_db(tmp_path):
+    path = str(tmp_path / "bench.db")
+    seed_benchmark_db(path, rows=200)
+    return path
+
+
+def test_seed_benchmark_db_row_counts(tmp_path):
+    path = str(tmp_path / "bench.db")
+    summary = seed_benchmark_db(path, rows=200)
+    connection = sqlite3.connect(path)
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM ap_holds_all").fetchone()[0] == 200
+        assert connection.execute("SELECT COUNT(*) FROM ap_invoices").fetchone()[0] == summary["invoices"]
+    finally:
+        connection.close()
+    assert summary["rows"] == 200 and 0 < summary["invoices"] <= 200
+
+
+def test_seed_benchmark_db_overwrites_and_is_deterministic(tmp_path):
+    path = str(tmp_path / "bench.db")
+
+    def dump():
+        connection = sqlite3.connect(path)
+        try:
+            return connection.execute("SELECT INVOICE_ID, HOLD_REASON FROM ap_holds_all ORDER BY HOLD_ID").fetchall()
+        finally:
+            connection.close()
+
+    seed_benchmark_db(path, rows=50, seed=3)
+    first = dump()
+    seed_benchmark_db(path, rows=50, seed=3)
+    assert dump() == first and len(first) == 50
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([7.0], 0.99) == 7.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_summarize():
+    result = summarize("tool", [0.003, 0.001, 0.002], wall_seconds=0.5, peak_bytes=2048, answers={"hit": 3})
+    assert result["calls"] == 3
+    assert result["p50_ms"] == 2.0 and result["p99_ms"] == 3.0
+    assert result["throughput_per_s"] == 6.0
+    assert result["peak_alloc_kib"] == 2.0
+    assert result["answers"] == {"hit": 3}
+    assert summarize("empty", [], wall_seconds=0)["throughput_per_s"] == 0.0
+
+
+def test_parse_importtime_sums_self_time_per_package():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       500 |        500 |   encodings",
+        "import time:      2000 |       2500 | fastmcp.server",
+        "import time:      1500 |       1500 |   fastmcp.tools",
+        "import time:       300 |        300 | json",
+        "some other line",
+    ])
+    assert parse_importtime(stderr) == [("fastmcp", 3.5), ("encodings", 0.5), ("json", 0.3)]
+    assert parse_importtime(stderr, top=1) == [("fastmcp", 3.5)]
+
+
+def test_compare_with_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": [
+        {"name": "fast", "p95_ms": 10.0},
+        {"name": "slow", "p95_ms": 10.0},
+        {"name": "setup", "seconds": 1.0},
+    ]}), encoding="utf-8")
+    results = [
+        {"name": "fast", "p95_ms": 11.0},
+        {"name": "slow", "p95_ms": 13.0},
+        {"name": "setup", "seconds": 9.0},
+        {"name": "new", "p95_ms": 99.0},
+    ]
+    assert compare_with_baseline(results, str(baseline), threshold=0.2) == ["slow: p95 10.0ms → 13.0ms"]
+
+
+def test_stub_agent_response_carries_sql_and_rows(bench_db):
+    agent = StubSqlAgent(bench_db, model_latency=0)
+    response = asyncio.run(agent.run_async("INV-0000001 holding info"))
+    sql = extract_sql(response)
+    assert "INV-0000001" in sql
+    columns, rows = extract_sql_result(response)
+    assert columns[0] == "INVOICE_ID"
+    assert rows and all(row[0] == "INV-0000001" for row in rows)
+
+
+def test_bench_agent_reports_cache_answers(bench_db):
+    pytest.importorskip("oci")
+    no_cache, cached = asyncio.run(bench_agent(bench_db, iterations=20, concurrency=4, model_latency=0, repeat_ratio=1.0))
+    assert no_cache["calls"] == cached["calls"] == 20
+    assert "error" not in no_cache["answers"] and "error" not in cached["answers"]
+    assert sum(count for key, count in cached["answers"].items() if key != "miss") > 0
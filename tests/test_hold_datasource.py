@@ -0,0 +1,115 @@
+"""AP_HOLDS_ALL 저장소: Oracle 바인드, GROUP BY 집계, 한 인보이스의 여러 홀딩 행, DB 워터마크"""
+from collections import Counter
+
+import pytest
+
+from hold_datasource import SQLitePool, SqlHoldRepository, seed_sqlite_standin
+from hold_mock_data import create_mock_repository
+from hold_statistics import HoldStatistics
+from hot_reload import WatermarkReloadable
+
+
+def _check(reloadable) -> None:
+    """HotReloader.check_once 와 같은 순서: poll (워커 스레드) → install (이벤트 루프)"""
+    prepared = reloadable.poll()
+    if prepared is not None:
+        reloadable.install(prepared)
+
+
+@pytest.fixture
+def multi_hold_repository(tmp_path, new_record):
+    """INV-001 에 홀딩 행 3개, INV-100 은 HOLD_REASON 없이 HOLD_LOOKUP_CODE 만 있는 DB"""
+    path = str(tmp_path / "holds.db")
+    records = list(create_mock_repository().iter_records())
+    records += [
+        new_record("INV-001", reason="수량 불일치", hold_lookup_code="QTY ORD"),
+        new_record("INV-001", reason="재고 부족", hold_lookup_code="QTY REC"),
+        new_record("INV-100", reason="", hold_lookup_code="AMOUNT"),
+    ]
+    seed_sqlite_standin(path, records)
+    return SqlHoldRepository(SQLitePool(path))
+
+
+def test_aggregate_counts_match_full_scan(repository, new_record):
+    repository.add(new_record("INV-100", hold_date="2024-09-03"))
+    repository.release("INV-004")
+    counts = repository.aggregate_counts()
+    if counts is None:
+        pytest.skip("저장소가 직접 집계하지 않음 (iter_records 로 집계)")
+    records = list(repository.iter_records())
+    assert counts["reason"] == dict(Counter(record["reason"] for record in records))
+    assert counts["org_id"] == dict(Counter(record["org_id"] for record in records))
+    assert counts["hold_date"] == dict(Counter(record["hold_date"] for record in records))
+
+
+def test_releasing_multi_hold_invoice_keeps_statistics_in_sync(multi_hold_repository):
+    repository = multi_hold_repository
+    statistics = HoldStatistics.attach(repository)
+    assert statistics.total == len(repository) == 13
+
+    released = repository.release("INV-001")
+    assert released["reason"] == "발주금액 불일치"
+    assert repository.get("INV-001") is None
+    assert statistics.total == len(repository) == 10
+    assert statistics.reason_distribution == HoldStatistics.attach(repository).reason_distribution
+
+
+def test_reason_filter_matches_reported_reason(multi_hold_repository):
+    records, _ = multi_hold_repository.query(reason="AMOUNT")
+    assert [(record["id"], record["reason"]) for record in records] == [("INV-100", "AMOUNT")]
+    assert HoldStatistics.attach(multi_hold_repository).reason_distribution["AMOUNT"] == 1
+
+
+class _OracleDialectPool:
+    dialect = "oracle"
+    read_only = False
+
+
+def test_oracle_binds_only_numeric_invoice_ids():
+    repository = SqlHoldRepository.__new__(SqlHoldRepository)
+    repository.pool = _OracleDialectPool()
+    assert repository._invoice_id_bind(" 346843 ") == 346843
+    assert repository._invoice_id_bind("INV-999") is None
+    assert repository.get("INV-999") is None
+    assert repository.nearby_ids("INV-999", 3) == []
+
+
+def test_watermark_reloadable_detects_external_writes(sqlite_path):
+    repository = SqlHoldRepository(SQLitePool(sqlite_path))
+    external = SqlHoldRepository(SQLitePool(sqlite_path))
+    prepared, activated = [], []
+
+    def prepare(repo):
+        prepared.append(repo)
+        return len(repo)
+
+    reloadable = WatermarkReloadable(lambda: repository, prepare, activated.append, interval=0)
+    _check(reloadable)
+    assert activated == [10]
+    _check(reloadable)
+    assert activated == [10]
+
+    # 같은 초 안의 해제도 열린 홀딩 수로 감지
+    external.release("INV-003")
+    _check(reloadable)
+    assert activated == [10, 9]
+    assert prepared == [repository, repository]
+
+
+def test_watermark_reloadable_is_throttled(sqlite_path):
+    repository = SqlHoldRepository(SQLitePool(sqlite_path))
+    activated = []
+    reloadable = WatermarkReloadable(lambda: repository, len, activated.append, interval=3600)
+    _check(reloadable)
+    repository.release("INV-003")
+    _check(reloadable)
+    assert activated == [10]
+
+
+def test_external_db_changes_bump_generation(server):
+    repository = server._repository
+    bundle = server._prepare_repository(repository)
+    generation = repository.generation
+    server._activate_external_changes(bundle)
+    assert repository.generation == generation + 1
+    assert server._statistics is bundle[1]
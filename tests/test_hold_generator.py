@@ -0,0 +1,99 @@
+"""합성 홀딩 생성기: 청크 생성 분포/불변식, 컬럼 파일 저장, 스냅숏 저장소로 다시 열기"""
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hold_datasource import HOLD_COLUMNS
+from hold_generator import (
+    DICTIONARY_COLUMNS, ORG_IDS, STRING_COLUMNS, dictionaries, generate, iter_hold_chunks, reason_catalog,
+)
+
+
+def _concat(chunks):
+    merged = {}
+    for chunk in chunks:
+        for column, values in chunk.items():
+            merged.setdefault(column, []).extend(list(values))
+    return merged
+
+
+def test_chunks_cover_rows_in_chunk_sized_pieces():
+    chunks = list(iter_hold_chunks(250, seed=1, chunk_rows=100))
+    assert [len(chunk["HOLD_ID"]) for chunk in chunks] == [100, 100, 50]
+    assert all(set(chunk) == set(HOLD_COLUMNS) for chunk in chunks)
+    hold_ids = _concat(chunks)["HOLD_ID"]
+    assert hold_ids == list(range(1, 251))
+
+
+def test_chunks_invariants():
+    rows = _concat(iter_hold_chunks(2000, seed=5, chunk_rows=700))
+    catalog = reason_catalog()
+
+    # 인보이스 ID 는 단조 증가하고, 인보이스당 홀딩은 1~3건이며 같은 ORG_ID 를 공유
+    invoice_ids = rows["INVOICE_ID"]
+    assert invoice_ids == sorted(invoice_ids)
+    per_invoice = {}
+    for invoice_id, org_id in zip(invoice_ids, rows["ORG_ID"]):
+        per_invoice.setdefault(invoice_id, []).append(int(org_id))
+    assert all(1 <= len(orgs) <= 3 and len(set(orgs)) == 1 for orgs in per_invoice.values())
+    assert set(org for orgs in per_invoice.values() for org in orgs) <= set(ORG_IDS)
+
+    # 사유 코드와 홀딩 코드는 같은 사전 인덱스, 사유는 롱테일(첫 사유가 가장 많음)
+    reasons = np.asarray(rows["HOLD_REASON"])
+    assert (reasons == np.asarray(rows["HOLD_LOOKUP_CODE"])).all()
+    assert reasons.min() >= 1 and reasons.max() <= len(catalog)
+    counts = np.bincount(reasons, minlength=len(catalog) + 1)[1:]
+    assert counts.argmax() == 0
+
+    # 약 20% 해제, 수정일은 홀딩일 이후
+    released = np.asarray(rows["RELEASE_LOOKUP_CODE"]) != 0
+    assert 0.1 < released.mean() < 0.3
+    assert (np.asarray(rows["LAST_UPDATE_DATE"]) >= np.asarray(rows["HOLD_DATE"])).all()
+
+
+def test_chunks_are_deterministic_per_seed():
+    first = _concat(iter_hold_chunks(300, seed=9, chunk_rows=128))
+    again = _concat(iter_hold_chunks(300, seed=9, chunk_rows=128))
+    other = _concat(iter_hold_chunks(300, seed=10, chunk_rows=128))
+    assert first["HOLD_DETAILS"] == again["HOLD_DETAILS"]
+    assert first["HOLD_DETAILS"] != other["HOLD_DETAILS"]
+
+
+def test_dictionaries_reserve_null_code():
+    values = dictionaries(reason_catalog())
+    assert set(values) == set(DICTIONARY_COLUMNS)
+    assert all(column_values[0] is None for column_values in values.values())
+
+
+def test_generate_writes_columns_readable_by_snapshot(tmp_path):
+    from hold_snapshot import SnapshotHoldRepository
+
+    path = str(tmp_path / "holds")
+    summary = generate(path, rows=500, seed=3, chunk_rows=128)
+    assert summary["rows"] == 500 and summary["format"] == "npy"
+    assert not [name for name in os.listdir(path) if ".part" in name]
+    for column in STRING_COLUMNS:
+        assert len(np.load(os.path.join(path, f"{column}.offsets.npy"))) == 501
+
+    expected = _concat(iter_hold_chunks(500, seed=3, chunk_rows=128))
+    repository = SnapshotHoldRepository(path)
+    assert repository.rows == 500
+    assert len(repository) == sum(1 for code in expected["RELEASE_LOOKUP_CODE"] if code == 0)
+
+    catalog = reason_catalog()
+    position = next(i for i, code in enumerate(expected["RELEASE_LOOKUP_CODE"]) if code == 0)
+    record = repository.get(expected["INVOICE_ID"][position])
+    assert record.id == expected["INVOICE_ID"][position]
+    assert record.reason == catalog[expected["HOLD_REASON"][position] - 1]["reason"]
+    assert record.detail == expected["HOLD_DETAILS"][position]
+
+
+def test_generate_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "holds.parquet")
+    assert generate(path, rows=300, seed=3, chunk_rows=100, fmt="parquet")["rows"] == 300
+    table = pq.read_table(path)
+    assert table.num_rows == 300 and table.column_names == HOLD_COLUMNS
+    assert None in table.column("RELEASE_LOOKUP_CODE").to_pylist()
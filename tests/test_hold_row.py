@@ -0,0 +1,64 @@
+"""HoldRow: dict 레코드 호환, 문자열 intern, 피클링, 저장소/도구 응답이 Pydantic 모델과 같은 모양인지"""
+import pickle
+import sys
+
+import pytest
+
+from hold_store import HOLD_ROW_FIELDS, HoldRow, default_search_query
+
+RECORD = {
+    "id": "INV-100", "status": "holding", "reason": "수량 불일치", "hold_lookup_code": "QTY ORD",
+    "org_id": 101, "hold_date": "2024-10-01", "detail": "테스트", "hold_id": 7,
+}
+
+
+def test_row_reads_like_a_record():
+    row = HoldRow.from_record(RECORD)
+    assert row["reason"] == row.reason == "수량 불일치"
+    assert row.get("org_id") == 101
+    assert row.get("amount", "없음") == "없음"
+    with pytest.raises(KeyError):
+        row["amount"]
+    assert list(row) == list(HOLD_ROW_FIELDS) and len(row) == len(HOLD_ROW_FIELDS)
+    assert dict(row) == {**RECORD, "search_query": ""}
+    assert row == HoldRow.from_record(dict(row))
+
+
+def test_row_is_slotted():
+    row = HoldRow.from_record(RECORD)
+    assert not hasattr(row, "__dict__")
+    with pytest.raises(AttributeError):
+        row.amount = 1
+    assert HoldRow.from_record(row) is row
+
+
+def test_from_record_interns_repeated_strings():
+    first = HoldRow.from_record({**RECORD, "reason": "".join(["수량 ", "불일치"])})
+    second = HoldRow.from_record({**RECORD, "reason": "".join(["수량", " 불일치"])})
+    assert first.reason is second.reason is sys.intern("수량 불일치")
+    assert default_search_query("수량 불일치") is default_search_query("".join(["수량 ", "불일치"]))
+
+
+def test_row_pickles_as_value_tuple():
+    row = HoldRow.from_record(RECORD)
+    restored = pickle.loads(pickle.dumps(row))
+    assert isinstance(restored, HoldRow) and dict(restored) == dict(row)
+    assert len(pickle.dumps(row)) < len(pickle.dumps(dict(row)))
+
+
+def test_repositories_return_rows(repository, new_record):
+    repository.add(new_record("INV-100"))
+    assert isinstance(repository.get("INV-100"), HoldRow)
+    records, _ = repository.query(page_size=3)
+    assert all(isinstance(record, HoldRow) for record in records)
+    assert all(isinstance(record, HoldRow) for record in repository.iter_records())
+
+
+def test_tool_items_match_response_models(server):
+    for record in server.get_repository().iter_records():
+        invoice = server._invoice_item(record)
+        assert list(invoice) == list(server.HoldingInvoice.model_fields)
+        assert server.HoldingInvoice.model_validate(invoice).model_dump() == invoice
+        detail = server._reason_detail_item(record)
+        assert list(detail) == list(server.HoldingReasonDetail.model_fields)
+        assert server.HoldingReasonDetail.model_validate(detail).model_dump() == detail
@@ -0,0 +1,87 @@
+"""컬럼 스냅숏 저장소: 날짜 필터 검증, 해제 후 커서 안정성, 다중 홀딩 인보이스 해제와 통계, 지연 로딩"""
+import pytest
+
+from hold_mock_data import create_mock_repository
+from hold_statistics import HoldStatistics
+from hold_store import InvalidFilterError
+
+np = pytest.importorskip("numpy")
+
+from hold_snapshot import SnapshotHoldRepository, save_snapshot
+
+
+def _all_ids(repository, **filters) -> list:
+    ids, cursor = [], None
+    while True:
+        records, cursor = repository.query(cursor=cursor, page_size=3, **filters)
+        ids.extend(record["id"] for record in records)
+        if cursor is None:
+            return ids
+
+
+@pytest.fixture
+def multi_hold_snapshot(tmp_path, new_record):
+    """INV-001 에 홀딩 3건, INV-002 에 2건이 걸린 스냅숏 (Mock 10건 + 추가 3행)"""
+    records = list(create_mock_repository().iter_records())
+    records += [
+        new_record("INV-001", reason="가격 불일치", hold_lookup_code="PRICE", hold_date="2024-09-20"),
+        new_record("INV-001", reason="중복 인보이스", hold_lookup_code="DUP", org_id=301),
+        new_record("INV-002", reason="가격 불일치", hold_lookup_code="PRICE"),
+    ]
+    path = str(tmp_path / "snapshot")
+    save_snapshot(records, path)
+    return SnapshotHoldRepository(path)
+
+
+@pytest.mark.parametrize("filters", [
+    {"hold_date_from": "2024-13-01"},
+    {"hold_date_to": "yesterday"},
+    {"hold_date_from": "2024-9-1"},
+])
+def test_invalid_date_filter(repository, filters):
+    # 스냅숏은 np.datetime64 의 ValueError 대신 InvalidFilterError 를 내야 함 (도구가 ErrorResponse 로 변환)
+    with pytest.raises(InvalidFilterError):
+        repository.query(**filters)
+
+
+def test_cursor_stays_valid_after_release(repository, new_record):
+    # 스냅숏 위에 추가한 레코드의 커서 키는 해제 후에도 바뀌지 않아야 함
+    for number in range(100, 105):
+        repository.add(new_record(f"INV-{number}", reason="테스트 사유"))
+    first_page, cursor = repository.query(reason="테스트 사유", page_size=2)
+    assert [record["id"] for record in first_page] == ["INV-100", "INV-101"]
+    repository.release("INV-100")
+    rest = []
+    while cursor is not None:
+        records, cursor = repository.query(reason="테스트 사유", page_size=2, cursor=cursor)
+        rest.extend(record["id"] for record in records)
+    assert rest == ["INV-102", "INV-103", "INV-104"]
+
+
+def test_release_notifies_every_open_row(multi_hold_snapshot):
+    repository = multi_hold_snapshot
+    statistics = HoldStatistics.attach(repository)
+    assert statistics.total == len(repository) == 13
+
+    released = repository.release("INV-001")
+    assert released["id"] == "INV-001" and released["reason"] == "발주금액 불일치"
+    assert repository.get("INV-001") is None
+    assert statistics.total == len(repository) == 10
+    assert statistics.reason_distribution == HoldStatistics.attach(repository).reason_distribution
+
+    repository.release("INV-002")
+    assert statistics.total == len(repository) == 8
+    assert "INV-002" not in _all_ids(repository)
+    assert repository.release("INV-002") is None
+    assert statistics.total == len(repository) == 8
+
+
+def test_rows_are_materialized_lazily(multi_hold_snapshot):
+    repository = multi_hold_snapshot
+    assert repository.rows == 13
+    # 파일은 mmap 으로 열고, 사전 값은 intern 된 문자열을 공유
+    assert isinstance(repository._columns["HOLD_ID"], np.memmap)
+    first, second = repository.get("INV-003"), repository.query(reason="재고 부족")[0][0]
+    assert first["reason"] is second["reason"]
+    # 같은 인보이스의 홀딩은 각자의 ORG_ID 로 검색됨
+    assert "INV-001" in _all_ids(repository, org_id=301)
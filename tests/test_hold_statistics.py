@@ -0,0 +1,43 @@
+"""증분 통계가 저장소 변경 후 처음부터 다시 집계한 결과와 같은지 확인"""
+from datetime import date
+
+from hold_statistics import HoldStatistics
+
+
+def _snapshot(statistics: HoldStatistics) -> dict:
+    return {
+        "total": statistics.total,
+        "reasons": statistics.reason_distribution,
+        "orgs": statistics.org_distribution,
+        "days": statistics.daily_distribution,
+        "aging": statistics.aging_distribution(date(2024, 10, 1)),
+        "most_common_count": statistics.most_common[1],
+    }
+
+
+def test_incremental_statistics_match_fresh_attach(repository):
+    statistics = HoldStatistics.attach(repository)
+    assert statistics.total == 10
+    assert statistics.most_common[1] == 1
+
+    for number in range(100, 104):
+        repository.add({
+            "id": f"INV-{number}", "status": "holding", "reason": "중복 인보이스",
+            "hold_lookup_code": "DUP", "org_id": 301, "hold_date": "2024-08-01", "detail": "",
+        })
+    repository.release("INV-001")
+    repository.release("INV-002")
+
+    assert statistics.most_common == ("중복 인보이스", 5)
+    assert _snapshot(statistics) == _snapshot(HoldStatistics.attach(repository))
+
+
+def test_releasing_every_hold_resets_statistics(repository):
+    statistics = HoldStatistics.attach(repository)
+    for record in list(repository.iter_records()):
+        repository.release(record["id"])
+    assert statistics.total == 0
+    assert statistics.most_common == ("없음", 0)
+    assert statistics.reason_distribution == {}
+    assert statistics.org_distribution == {}
+    assert sum(statistics.aging_distribution(date(2024, 10, 1)).values()) == 0
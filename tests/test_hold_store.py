@@ -0,0 +1,74 @@
+"""저장소 백엔드 공통 동작: 조회, 커서 페이지네이션, 필터, 추가/해제"""
+import pytest
+
+from hold_store import InvalidCursorError
+
+
+def _all_pages(repository, page_size, **filters):
+    ids, cursor = [], None
+    while True:
+        records, cursor = repository.query(cursor=cursor, page_size=page_size, **filters)
+        ids.extend(record["id"] for record in records)
+        if cursor is None:
+            return ids
+
+
+def test_get_returns_record_or_none(repository):
+    record = repository.get("INV-002")
+    assert record["reason"] == "수량 불일치"
+    assert record["hold_lookup_code"] == "QTY ORD"
+    assert record["org_id"] == 101
+    assert record["hold_date"] == "2024-09-03"
+    assert repository.get("INV-999") is None
+    assert len(repository) == 10
+
+
+@pytest.mark.parametrize("page_size", [1, 3, 10, 50])
+def test_cursor_pagination_visits_every_hold_once(repository, page_size):
+    ids = _all_pages(repository, page_size)
+    assert sorted(ids) == [f"INV-{number:03d}" for number in range(1, 11)]
+
+
+def test_page_size_is_clamped(repository):
+    records, cursor = repository.query(page_size=0)
+    assert len(records) == 10 and cursor is None
+    records, cursor = repository.query(page_size=-5)
+    assert len(records) == 1 and cursor is not None
+
+
+def test_query_filters(repository):
+    assert sorted(_all_pages(repository, 2, org_id=101)) == ["INV-001", "INV-002", "INV-005", "INV-008"]
+    assert _all_pages(repository, 2, reason="재고 부족") == ["INV-003"]
+    assert _all_pages(repository, 2, hold_lookup_code="TAX") == ["INV-008"]
+    assert sorted(_all_pages(repository, 2, hold_date_from="2024-09-10", hold_date_to="2024-09-12")) == [
+        "INV-007", "INV-008", "INV-009",
+    ]
+    assert _all_pages(repository, 2, reason="없는 사유") == []
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor!", "Zm9v"])
+def test_invalid_cursor(repository, cursor):
+    with pytest.raises(InvalidCursorError):
+        repository.query(cursor=cursor)
+
+
+def test_add_and_release(repository, new_record):
+    generation = repository.generation
+    repository.add(new_record("INV-100"))
+    assert repository.get("INV-100")["reason"] == "수량 불일치"
+    assert len(repository) == 11
+    assert "INV-100" in _all_pages(repository, 4, reason="수량 불일치")
+
+    released = repository.release("INV-001")
+    assert released["id"] == "INV-001"
+    assert repository.get("INV-001") is None
+    assert repository.release("INV-001") is None
+    assert len(repository) == 10
+    assert repository.generation > generation
+
+
+def test_add_replaces_existing_invoice(repository, new_record):
+    repository.add(new_record("INV-001", reason="재고 부족", hold_lookup_code="QTY REC"))
+    assert len(repository) == 10
+    assert repository.get("INV-001")["reason"] == "재고 부족"
+    assert sorted(_all_pages(repository, 3, reason="재고 부족")) == ["INV-001", "INV-003"]
@@ -0,0 +1,87 @@
+"""오프라인 홀딩 분류: 규정집 기준 규칙, 판단 불가 홀딩 분리, 프로세스 풀 실행의 출력 순서"""
+import io
+import json
+
+import pytest
+
+from hold_mock_data import create_mock_repository
+from hold_triage import llm_question, load_procedure_table, run_triage, triage_record
+
+
+@pytest.fixture(scope="module")
+def table():
+    return load_procedure_table()
+
+
+def _hold(reason: str, detail: str, invoice_id: str = "INV-100") -> dict:
+    return {"id": invoice_id, "status": "holding", "reason": reason, "org_id": 101, "hold_date": "2024-10-01", "detail": detail}
+
+
+def _price(ordered: int, invoiced: int) -> dict:
+    return _hold("발주금액 불일치", f"발주서의 단가(₩{ordered:,})와 인보이스의 단가(₩{invoiced:,})가 일치하지 않습니다.")
+
+
+def test_price_variance_escalates_over_threshold(table):
+    result = triage_record(_price(15000, 18000), table)
+    assert result["decision"] == "auto"
+    assert result["section"] == "1. 발주금액 불일치"
+    assert result["action"] == "escalate_price_variance"
+    assert result["approver"] == "부서장"
+    assert result["metrics"]["variance_pct"] == 20.0 and result["metrics"]["threshold_pct"] == 5.0
+    assert result["route"] == "구매팀 담당자"
+
+
+def test_price_variance_within_threshold_is_approved(table):
+    result = triage_record(_price(10000, 10400), table)
+    assert result["action"] == "approve_price_variance"
+    assert result["approver"] == "구매팀장"
+    assert result["recommended_actions"][0] == "구매팀장 승인으로 처리 가능"
+    assert result["processing_time"] == "4-24시간"
+
+
+def test_quantity_shortage_and_over_delivery(table):
+    shortage = triage_record(_hold("수량 불일치", "발주 수량 100개에 대해 인보이스 수량이 85개로 15개 부족합니다."), table)
+    assert shortage["action"] == "confirm_partial_delivery"
+    assert shortage["metrics"] == {"ordered_qty": 100, "invoiced_qty": 85, "difference": -15}
+    over = triage_record(_hold("수량 불일치", "발주 수량 1,000개에 대해 인보이스 수량이 1,200개입니다."), table)
+    assert over["action"] == "resolve_over_delivery" and over["metrics"]["difference"] == 200
+
+
+@pytest.mark.parametrize("reason, detail, note", [
+    # 규정집 섹션과 일부만 겹치는 사유에 다른 사유의 규칙을 적용하지 않음
+    ("기타 불일치", "발주서의 단가(₩100)와 인보이스의 단가(₩200)", "규정집에 없는 사유"),
+    ("수량 불일치", "수량이 맞지 않습니다.", "상세 설명으로 규정집 기준을 판단할 수 없음"),
+    ("중복 인보이스", "같은 건으로 보입니다.", "상세 설명으로 규정집 기준을 판단할 수 없음"),
+])
+def test_undecidable_holds_are_left_for_llm(table, reason, detail, note):
+    result = triage_record(_hold(reason, detail), table)
+    assert result["decision"] == "llm" and result["note"] == note
+    assert "action" not in result
+    assert llm_question(result) == f"인보이스 INV-100 의 홀딩({reason})을 규정집 기준으로 어떻게 처리해야 하나요?"
+
+
+def test_reason_matching_ignores_whitespace(table):
+    assert triage_record(_price(100, 101) | {"reason": "발주금액  불일치"}, table)["decision"] == "auto"
+
+
+def test_run_triage_writes_in_input_order_and_splits_leftovers(table):
+    records = list(create_mock_repository().iter_records()) + [_hold("기타 불일치", "확인 필요", "INV-999")]
+    output, leftovers, progress = io.StringIO(), io.StringIO(), []
+    summary = run_triage(records, output, table, ambiguous_output=leftovers, workers=0, chunk_rows=4,
+                         on_progress=lambda current: progress.append(current["total"]))
+
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [result["invoice_id"] for result in results] == [record["id"] for record in records]
+    assert (summary["total"], summary["auto"], summary["llm"], summary["chunks"]) == (11, 10, 1, 3)
+    assert progress == [4, 8, 11]
+    assert summary["actions"]["escalate_price_variance"] == 1
+    assert [json.loads(line)["invoice_id"] for line in leftovers.getvalue().splitlines()] == ["INV-999"]
+
+
+def test_process_pool_matches_in_process_output(table):
+    records = list(create_mock_repository().iter_records()) * 3
+    serial, pooled = io.StringIO(), io.StringIO()
+    run_triage(records, serial, table, workers=0, chunk_rows=4)
+    summary = run_triage(records, pooled, table, workers=2, chunk_rows=4)
+    assert pooled.getvalue() == serial.getvalue()
+    assert summary["total"] == 30 and summary["chunks"] == 8
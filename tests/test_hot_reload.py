@@ -0,0 +1,185 @@
+"""핫 리로드: 변경 로그 재생(DeltaLogReloadable), 규정집 교체(RuleBookReloadable), 동시 갱신 중 통계 조회"""
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import edit_rule_book
+from hold_statistics import HoldStatistics
+from hot_reload import DeltaLogReloadable, HotReloader, RuleBookReloadable
+
+
+def _add(invoice_id: str) -> dict:
+    return {"op": "add", "record": {
+        "id": invoice_id, "reason": "재고 부족", "hold_lookup_code": "QTY REC",
+        "org_id": 201, "hold_date": "2024-09-20", "detail": "변경 로그",
+    }}
+
+
+def _write(path, *lines) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        for line in lines:
+            f.write((line if isinstance(line, str) else json.dumps(line, ensure_ascii=False)) + "\n")
+
+
+def _check(reloadable) -> None:
+    """HotReloader.check_once 와 같은 순서: poll (워커 스레드) → install (이벤트 루프)"""
+    prepared = reloadable.poll()
+    if prepared is not None:
+        reloadable.install(prepared)
+
+
+def test_delta_log_applies_new_lines_and_skips_bad_ones(repository, tmp_path):
+    path = tmp_path / "delta.ndjson"
+    reloadable = DeltaLogReloadable(str(path), lambda: repository)
+    _check(reloadable)
+    assert reloadable.offset == 0
+
+    _write(path, _add("INV-100"), "{not json", {"op": "release", "id": "INV-001"}, {"op": "rename"}, [1, 2])
+    # 개행으로 끝나지 않은 줄은 다음 확인까지 보류
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(_add("INV-101")))
+    _check(reloadable)
+
+    assert repository.get("INV-100") is not None
+    assert repository.get("INV-001") is None
+    assert repository.get("INV-101") is None
+    assert reloadable.applied == 2
+    assert len(reloadable.skipped) == 3
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n")
+    _check(reloadable)
+    assert repository.get("INV-101") is not None
+    assert reloadable.offset == path.stat().st_size
+    assert len(repository) == 11
+
+
+class _FlakyRepository:
+    """두 번째 적용에서 한 번 실패하는 저장소 래퍼 (DB 연결 오류 흉내)"""
+
+    def __init__(self, repository):
+        self._repository = repository
+        self.blocking_io = repository.blocking_io
+        self.calls = 0
+
+    def add(self, record):
+        self.calls += 1
+        if self.calls == 2:
+            raise ConnectionError("connection reset")
+        return self._repository.add(record)
+
+    def release(self, invoice_id):
+        return self._repository.release(invoice_id)
+
+
+def test_delta_log_resumes_after_repository_error(repository, tmp_path):
+    path = tmp_path / "delta.ndjson"
+    flaky = _FlakyRepository(repository)
+    reloadable = DeltaLogReloadable(str(path), lambda: flaky)
+    _write(path, _add("INV-100"), _add("INV-101"), _add("INV-102"))
+
+    with pytest.raises(ConnectionError):
+        _check(reloadable)
+    # 실패한 줄부터 다시 적용하므로 이미 적용한 INV-100 이 중복 추가되지 않음
+    _check(reloadable)
+    assert [repository.get(f"INV-{number}") is not None for number in (100, 101, 102)] == [True, True, True]
+    assert len(repository) == 13
+    assert reloadable.offset == path.stat().st_size
+
+
+def test_delta_log_restarts_when_log_is_truncated(tmp_path):
+    from hold_mock_data import create_mock_repository
+
+    repository = create_mock_repository()
+    path = tmp_path / "delta.ndjson"
+    reloadable = DeltaLogReloadable(str(path), lambda: repository)
+    _write(path, _add("INV-100"), _add("INV-101"))
+    _check(reloadable)
+    path.write_text(json.dumps({"op": "release", "id": "INV-100"}) + "\n", encoding="utf-8")
+    _check(reloadable)
+    assert repository.get("INV-100") is None
+    assert repository.get("INV-101") is not None
+
+
+def test_replay_applies_whole_log(repository, tmp_path):
+    path = tmp_path / "delta.ndjson"
+    _write(path, _add("INV-100"), {"op": "release", "id": "INV-100"}, {"op": "release", "id": "INV-002"})
+    reloadable = DeltaLogReloadable(str(path), lambda: repository)
+    assert reloadable.replay(repository, 0) == path.stat().st_size
+    assert repository.get("INV-100") is None
+    assert repository.get("INV-002") is None
+    assert len(repository) == 9
+
+
+def test_rule_book_reload_swaps_procedures_and_clears_cached_responses(server, server_rule_book, monkeypatch):
+    from rulebook_procedures import build_procedure_table
+    from rulebook_search import RuleBookIndex
+
+    def build():
+        index = RuleBookIndex.load_or_build(str(server_rule_book), cache_path=None)
+        return index, build_procedure_table(index.chunks)
+
+    def detail() -> dict:
+        result = asyncio.run(server.get_holding_reason_detail.fn(invoice_id="INV-001", include_procedure=True))
+        return json.loads(result.content[0].text)
+
+    # 서빙 중(감시 작업 실행 중)에는 요청 경로에서 규정집 파일을 확인하지 않음
+    monkeypatch.setattr(server, "_hot_reloader", SimpleNamespace(running=True))
+    reloader = HotReloader([RuleBookReloadable(str(server_rule_book), build, server._activate_rule_book)])
+    assert asyncio.run(reloader.check_once()) == 0
+
+    assert detail()["procedure"]["owner"] == "구매팀 담당자"
+    assert server._response_cache.metrics()["entries"] > 0
+    edit_rule_book(server_rule_book, "**담당자**: 구매팀 담당자", "**담당자**: 변경된담당자")
+    assert asyncio.run(reloader.check_once()) == 1
+    assert server._response_cache.metrics()["entries"] == 0
+    assert detail()["procedure"]["owner"] == "변경된담당자"
+
+    # 내용이 같은 규정집으로 다시 교체하면 캐시를 비우지 않음
+    entries = server._response_cache.metrics()["entries"]
+    server._activate_rule_book(build())
+    assert server._response_cache.metrics()["entries"] == entries
+
+
+def test_statistics_reads_during_concurrent_updates(repository, new_record):
+    statistics = HoldStatistics.attach(repository)
+    records = [new_record(f"INV-{number}", reason=f"사유 {number % 3}") for number in range(100, 400)]
+    stop = threading.Event()
+    seen, errors = [], []
+
+    def read():
+        # 버킷을 옮기는 도중의 상태(최다 건수는 있는데 사유가 없음)가 보이면 안 됨
+        while not stop.is_set():
+            try:
+                reason, count = statistics.most_common
+            except Exception as e:
+                errors.append(e)
+                return
+            seen.append(count)
+            if (reason == "없음") != (count == 0):
+                errors.append(AssertionError((reason, count)))
+
+    def write():
+        for record in records:
+            statistics.on_hold_added(record)
+        for record in records:
+            statistics.on_hold_released(record)
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    writers = [threading.Thread(target=write) for _ in range(2)]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert seen and not errors
+    assert statistics.reason_distribution == HoldStatistics.attach(repository).reason_distribution
+    assert statistics.total == len(repository)
@@ -0,0 +1,59 @@
+"""ID 추천: 전체 ID 대신 가까운 ID 몇 개만, DB/스냅숏은 전체 ID 를 읽지 않고 저장소에서 이웃을 조회"""
+import pytest
+
+from id_suggest import InvoiceIdSuggester
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("INV-999", ["INV-010", "INV-009", "INV-008"]),
+    ("inv-1", ["INV-001", "INV-002", "INV-003"]),
+    ("INV-00", ["INV-001", "INV-002", "INV-003"]),
+    ("7", ["INV-007", "INV-006", "INV-008"]),
+])
+def test_suggests_closest_ids(repository, query, expected):
+    assert InvoiceIdSuggester.attach(repository).suggest(query, k=3) == expected
+
+
+def test_suggestions_follow_repository_changes(repository, new_record):
+    suggester = InvoiceIdSuggester.attach(repository)
+    repository.release("INV-010")
+    repository.add(new_record("INV-998"))
+    assert suggester.suggest("INV-999", k=2) == ["INV-998", "INV-009"]
+    assert suggester.suggest("INV-999", k=0) == []
+
+
+def test_repository_lookup_does_not_scan_every_id(sqlite_path, monkeypatch):
+    from hold_datasource import SQLitePool, SqlHoldRepository
+
+    repository = SqlHoldRepository(SQLitePool(sqlite_path))
+    monkeypatch.setattr(repository, "ids", lambda: pytest.fail("ids() scanned on attach/suggest"))
+    suggester = InvoiceIdSuggester.attach(repository)
+    assert suggester not in repository._listeners
+    assert suggester.suggest("INV-011", k=1) == ["INV-010"]
+
+
+def test_nearby_ids_skips_released_holds(repository):
+    if repository.nearby_ids("", 0) is None:
+        pytest.skip("저장소가 ID 순서 조회를 지원하지 않음")
+    repository.release("INV-005")
+    assert repository.nearby_ids("INV-005", 2) == ["INV-006", "INV-007", "INV-004", "INV-003"]
+
+
+def test_memory_index_is_built_on_attach(monkeypatch):
+    from hold_mock_data import create_mock_repository
+
+    repository = create_mock_repository()
+    suggester = InvoiceIdSuggester.attach(repository)
+    monkeypatch.setattr(repository, "ids", lambda: pytest.fail("index rebuilt on the request path"))
+    assert len(suggester) == 10
+    assert suggester.suggest("INV-001", k=1) == ["INV-001"]
+
+
+def test_missing_invoice_error_lists_only_nearby_ids(server):
+    import asyncio
+    import json
+
+    result = asyncio.run(server.get_holding_reason_detail.fn(invoice_id="INV-999"))
+    error = json.loads(result.content[0].text)
+    assert "not found" in error["error"]
+    assert error["available_ids"] == ["INV-010", "INV-009", "INV-008", "INV-007", "INV-006"]
@@ -0,0 +1,103 @@
+"""도구 응답 축약: 필드 선택, 긴 문자열 자르기, table 형식, 절감량 보고와 도구 옵션 검증"""
+import asyncio
+import json
+
+import pytest
+
+from payload_compaction import (
+    PayloadOptionError, compact_payload, dumps, payload_savings, truncate_text, wants_compaction,
+)
+
+FIELDS = ["id", "reason", "detail"]
+PAYLOAD = {
+    "items": [
+        {"id": "INV-001", "reason": "발주금액 불일치", "detail": "발주서의 단가와 인보이스의 단가가 일치하지 않습니다."},
+        {"id": "INV-002", "reason": "수량 불일치", "detail": "짧음"},
+    ],
+    "next_cursor": "abc",
+}
+
+
+def _call(tool, **arguments) -> dict:
+    return json.loads(asyncio.run(tool.fn(**arguments)).content[0].text)
+
+
+def test_wants_compaction():
+    assert not wants_compaction(None, None, "json")
+    assert not wants_compaction([], None, "json")
+    assert wants_compaction(["id"], None, "json")
+    assert wants_compaction(None, 20, "json")
+    assert wants_compaction(None, None, "table")
+
+
+def test_truncate_text_nested_values():
+    assert truncate_text("가나다라마바사아자차", 8) == "가나다라마바사…"
+    assert truncate_text("짧음", 8) == "짧음"
+    assert truncate_text({"a": ["가나다라마바사아자차", 3]}, 8) == {"a": ["가나다라마바사…", 3]}
+
+
+def test_projection_keeps_requested_order_and_other_keys():
+    compacted = compact_payload(PAYLOAD, "items", FIELDS, fields=["reason", "id", "reason"])
+    assert compacted["items"] == [
+        {"reason": "발주금액 불일치", "id": "INV-001"},
+        {"reason": "수량 불일치", "id": "INV-002"},
+    ]
+    assert list(compacted["items"][0]) == ["reason", "id"]
+    assert compacted["next_cursor"] == "abc"
+    assert compacted["savings"]["saved_bytes"] > 0
+
+
+def test_table_format_and_truncation():
+    compacted = compact_payload(PAYLOAD, "items", FIELDS, max_text_chars=10, output_format="table")
+    assert compacted["columns"] == FIELDS
+    assert compacted["rows"][0] == ["INV-001", "발주금액 불일치", "발주서의 단가와 …"]
+    assert compacted["rows"][1][2] == "짧음"
+    assert "items" not in compacted
+
+
+def test_single_item_payload():
+    compacted = compact_payload(PAYLOAD["items"][0], None, FIELDS, fields=["id"])
+    assert compacted["item"] == {"id": "INV-001"}
+    with pytest.raises(PayloadOptionError):
+        compact_payload(PAYLOAD["items"][0], None, FIELDS, output_format="table")
+
+
+@pytest.mark.parametrize("options", [
+    {"fields": ["id", "amount"]},
+    {"max_text_chars": 3},
+    {"output_format": "csv"},
+])
+def test_invalid_options(options):
+    with pytest.raises(PayloadOptionError):
+        compact_payload(PAYLOAD, "items", FIELDS, **options)
+
+
+def test_payload_savings_counts_bytes_and_tokens():
+    savings = payload_savings(PAYLOAD, {"items": []})
+    assert savings["original_bytes"] == len(dumps(PAYLOAD).encode("utf-8"))
+    assert savings["bytes"] == len(b'{"items":[]}')
+    assert savings["saved_tokens"] == savings["original_tokens"] - savings["tokens"] > 0
+    assert 0 < savings["saved_ratio"] <= 1
+    assert dumps({"a": "가"}) == '{"a":"가"}'
+
+
+def test_list_tool_table_output(server):
+    full = _call(server.list_holding_invoices, org_id=101, page_size=50)
+    table = _call(server.list_holding_invoices, org_id=101, page_size=50, fields=["id", "reason"], output_format="table")
+    assert table["columns"] == ["id", "reason"]
+    assert table["rows"] == [[item["id"], item["reason"]] for item in full["items"]]
+    assert table["savings"]["bytes"] < table["savings"]["original_bytes"]
+
+
+def test_detail_tools_truncate_and_project(server):
+    page = _call(server.get_all_holding_reason_details, page_size=50, max_text_chars=12)
+    assert all(len(item["detail"]) <= 12 for item in page["items"])
+    assert any(item["detail"].endswith("…") for item in page["items"])
+
+    detail = _call(server.get_holding_reason_detail, invoice_id="INV-002", fields=["invoice_id", "reason"])
+    assert detail["item"] == {"invoice_id": "INV-002", "reason": "수량 불일치"}
+
+
+def test_tool_rejects_unknown_fields(server):
+    result = _call(server.list_holding_invoices, fields=["id", "amount"])
+    assert "Unknown fields: amount" in result["error"]
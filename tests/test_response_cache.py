@@ -0,0 +1,73 @@
+"""도구 응답 캐시: 같은 인자는 캐시된 응답을 쓰고, 저장소가 바뀌면(세대 번호) 다시 만듦"""
+import asyncio
+import json
+
+import pytest
+
+from response_cache import ResponseCache, make_cache_key
+
+
+def _call(tool, **arguments) -> dict:
+    result = asyncio.run(tool.fn(**arguments))
+    return json.loads(result.content[0].text)
+
+
+def _ids(page: dict) -> list:
+    return [invoice["id"] for invoice in page["items"]]
+
+
+def test_cache_key_ignores_argument_order():
+    assert make_cache_key("tool", {"a": 1, "b": "사유"}) == make_cache_key("tool", {"b": "사유", "a": 1})
+    assert make_cache_key("tool", {"a": 1}) != make_cache_key("other", {"a": 1})
+
+
+def test_generation_mismatch_is_a_miss():
+    cache = ResponseCache()
+    cache.put("key", 1, text="{}", structured={})
+    assert cache.get("key", 1).text == "{}"
+    assert cache.get("key", 2) is None
+    assert cache.get("key", 1) is None
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["invalidations"]) == (1, 2, 1)
+
+
+def test_ttl_expiry_and_lru_eviction():
+    cache = ResponseCache(max_entries=2, ttl_seconds=0)
+    cache.put("key", 1, text="{}", structured={})
+    assert cache.get("key", 1) is None
+    assert cache.metrics()["expirations"] == 1
+
+    cache = ResponseCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, 1, text="{}", structured={})
+    cache.get("a", 1)
+    cache.put("c", 1, text="{}", structured={})
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None and cache.get("c", 1) is not None
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_repeated_call_is_served_from_cache(server):
+    first = _call(server.list_holding_invoices, org_id=101)
+    hits = server._response_cache.metrics()["hits"]
+    assert _call(server.list_holding_invoices, org_id=101) == first
+    assert server._response_cache.metrics()["hits"] == hits + 1
+
+
+def test_repository_change_invalidates_cached_response(server, new_record):
+    repository = server._repository
+    before = _call(server.list_holding_invoices, org_id=101, page_size=50)
+    generation = repository.generation
+    repository.add(new_record("INV-100"))
+    assert repository.generation > generation
+    after = _call(server.list_holding_invoices, org_id=101, page_size=50)
+    assert _ids(after) == _ids(before) + ["INV-100"]
+
+    repository.release("INV-100")
+    assert _ids(_call(server.list_holding_invoices, org_id=101, page_size=50)) == _ids(before)
+
+
+def test_statistics_follow_repository_changes(server):
+    assert _call(server.get_invoice_statistics)["total_holding"] == 10
+    server._repository.release("INV-001")
+    assert _call(server.get_invoice_statistics)["total_holding"] == 9
@@ -0,0 +1,66 @@
+"""사유 → 처리 절차 테이블: 정확한 사유 매칭, 후보 추천, 상세 조회 응답에 절차 포함"""
+import asyncio
+import json
+
+import pytest
+
+from conftest import edit_rule_book
+from rulebook_procedures import build_procedure_table, find_procedure, suggest_procedures
+from rulebook_search import RuleBookIndex
+
+
+@pytest.fixture(scope="module")
+def table():
+    return build_procedure_table(RuleBookIndex.load_or_build(cache_path=None).chunks)
+
+
+def _detail(server, invoice_id: str) -> dict:
+    result = asyncio.run(server.get_holding_reason_detail.fn(invoice_id=invoice_id, include_procedure=True))
+    return json.loads(result.content[0].text)
+
+
+def test_table_has_structured_procedures(table):
+    procedure = table["발주금액 불일치"]
+    assert procedure["section"] == "1. 발주금액 불일치"
+    assert procedure["owner"] == "구매팀 담당자"
+    assert "단가차이" in procedure["keywords"]
+    assert procedure["steps"][0]["title"] == "차이 분석"
+    assert len(table) == 10
+
+
+def test_find_procedure_exact_and_whitespace(table):
+    assert find_procedure(table, "발주금액 불일치")["reason"] == "발주금액 불일치"
+    assert find_procedure(table, "중복인보이스")["reason"] == "중복 인보이스"
+    assert find_procedure(table, " 예산  초과 ")["reason"] == "예산 초과"
+
+
+@pytest.mark.parametrize("reason", ["불일치", "", "   ", "발주", "없는 사유"])
+def test_find_procedure_rejects_partial_matches(table, reason):
+    assert find_procedure(table, reason) is None
+
+
+def test_suggest_procedures(table):
+    suggestions = suggest_procedures(table, "불일치")
+    assert set(suggestions) == {"발주금액 불일치", "수량 불일치", "계약서 조건 불일치"}
+    assert len(suggest_procedures(table, "zzz", limit=3)) == 3
+
+
+def test_detail_includes_procedure(server):
+    detail = _detail(server, "INV-001")
+    assert detail["invoice_id"] == "INV-001"
+    assert detail["procedure"]["reason"] == "발주금액 불일치"
+    assert detail["procedure"]["owner"] == "구매팀 담당자"
+
+
+def test_cached_detail_follows_rule_book_changes(server, server_rule_book):
+    assert _detail(server, "INV-001")["procedure"]["owner"] == "구매팀 담당자"
+    edit_rule_book(server_rule_book, "**담당자**: 구매팀 담당자", "**담당자**: 변경된담당자")
+    # 저장소 세대는 그대로여도 규정집 해시가 캐시 키에 들어가므로 새 절차로 응답
+    assert _detail(server, "INV-001")["procedure"]["owner"] == "변경된담당자"
+
+
+def test_resolution_procedure_suggests_close_reasons(server):
+    result = server.get_resolution_procedure.fn("불일치")
+    assert result.error
+    assert "수량 불일치" in result.suggestions
+    assert server.get_resolution_procedure.fn("수량불일치").reason == "수량 불일치"
@@ -0,0 +1,56 @@
+"""규정집 검색: 섹션 청크 분할, BM25(+임베딩) 검색, 바뀐 청크만 다시 색인"""
+import os
+import shutil
+
+import pytest
+
+from rulebook_search import RULE_BOOK_PATH, RuleBookIndex, parse_sections
+
+
+@pytest.fixture
+def rule_book(tmp_path):
+    path = tmp_path / "GuideBook.md"
+    shutil.copy(RULE_BOOK_PATH, path)
+    return path
+
+
+def _index(rule_book, **kwargs) -> RuleBookIndex:
+    return RuleBookIndex.load_or_build(str(rule_book), str(rule_book.parent / "index.json"), **kwargs)
+
+
+def test_parse_sections_splits_by_heading():
+    with open(RULE_BOOK_PATH, encoding="utf-8") as f:
+        chunks = parse_sections(f.read())
+    titles = [chunk.title for chunk in chunks]
+    assert "4. 승인자 부재 > 해결 절차" in titles
+    assert not any(chunk.section == "목차" for chunk in chunks)
+    assert all("\n---\n" not in chunk.text for chunk in chunks)
+
+
+@pytest.mark.parametrize("embed", ["default", None])
+def test_search_ranks_matching_section_first(rule_book, embed):
+    index = _index(rule_book) if embed == "default" else _index(rule_book, embed=None)
+    hits = index.search("승인자 부재 대리승인", top_k=3)
+    assert hits[0][0].section == "4. 승인자 부재"
+    assert [score for _, score in hits] == sorted((score for _, score in hits), reverse=True)
+
+
+def test_only_changed_chunks_are_rebuilt(rule_book):
+    index = _index(rule_book)
+    total = len(index.chunks)
+    assert index.rebuilt_chunks == total
+    assert _index(rule_book).rebuilt_chunks == 0
+
+    text = rule_book.read_text(encoding="utf-8").replace("## 3. 재고 부족\n", "## 3. 재고 부족\n\n창고 재고 실사 메모\n", 1)
+    rule_book.write_text(text, encoding="utf-8")
+    os.utime(rule_book, (index.mtime + 5, index.mtime + 5))
+    assert index.refresh()
+    assert index.rebuilt_chunks == 1
+    assert index.search("창고 재고 실사", top_k=1)[0][0].title == "3. 재고 부족"
+    assert not index.refresh()
+
+
+def test_search_rule_book_tool(server):
+    result = server.search_rule_book.fn("중복 인보이스 처리", top_k=2)
+    assert len(result.results) == 2
+    assert result.results[0].title.startswith("10. 중복 인보이스")
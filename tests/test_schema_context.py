@@ -0,0 +1,78 @@
+"""SQL 도구 스키마 축소: 질문에 필요한 테이블/컬럼만 남기고 잡음 컬럼과 일반 설명은 제외"""
+import pytest
+
+from schema_context import SchemaContext, estimate_tokens
+
+DDL = """
+CREATE TABLE "AP"."AP_HOLDS_ALL" (
+  "INVOICE_ID" NUMBER(15,0) NOT NULL ENABLE,
+  "HOLD_LOOKUP_CODE" VARCHAR2(25 BYTE) NOT NULL ENABLE,
+  "HOLD_REASON" VARCHAR2(240 BYTE),
+  "LAST_UPDATED_BY" NUMBER(15,0),
+  "ORG_ID" NUMBER(15,0),
+  "ATTRIBUTE1" VARCHAR2(150 BYTE),
+  "HOLD_ID" NUMBER(15,0),
+  CONSTRAINT "AP_HOLDS_PK" PRIMARY KEY ("HOLD_ID")
+);
+CREATE TABLE "AP"."AP_INVOICES_ALL" (
+  "INVOICE_ID" NUMBER(15,0) NOT NULL ENABLE,
+  "VENDOR_ID" NUMBER(15,0) NOT NULL ENABLE,
+  "INVOICE_AMOUNT" NUMBER,
+  "INVOICE_CURRENCY_CODE" VARCHAR2(15 BYTE),
+  "GLOBAL_ATTRIBUTE1" VARCHAR2(150 BYTE),
+  "ORG_ID" NUMBER(15,0)
+);
+"""
+DESCRIPTIONS = """
+"AP_HOLDS_ALL"."HOLD_REASON" 'Reason for the hold'
+"AP_HOLDS_ALL"."LAST_UPDATED_BY" 'Standard Who column'
+"AP_INVOICES_ALL"."INVOICE_AMOUNT" 'Invoice amount in the invoice currency'
+"""
+
+
+@pytest.fixture
+def context():
+    return SchemaContext.parse(DDL, DESCRIPTIONS, core_columns={"AP_HOLDS_ALL": ["INVOICE_ID", "HOLD_REASON"]})
+
+
+def test_parse_tables_columns_and_descriptions(context):
+    holds = context.tables["AP_HOLDS_ALL"]
+    assert list(context.tables) == ["AP_HOLDS_ALL", "AP_INVOICES_ALL"]
+    assert holds.primary_key == ["HOLD_ID"]
+    assert holds.columns["HOLD_LOOKUP_CODE"].data_type == "VARCHAR2(25)"
+    assert holds.columns["INVOICE_ID"].not_null
+    assert holds.columns["HOLD_REASON"].description == "Reason for the hold"
+    assert holds.columns["LAST_UPDATED_BY"].description == ""
+
+
+def test_primary_table_only_for_hold_questions(context):
+    columns = context.select_columns("list holds by org")
+    assert columns == {"AP_HOLDS_ALL": ["INVOICE_ID", "HOLD_LOOKUP_CODE", "HOLD_REASON", "ORG_ID", "HOLD_ID"]}
+
+
+def test_other_table_joins_on_shared_id_when_mentioned(context):
+    columns = context.select_columns("hold reason with invoice amount and currency")
+    # 두 테이블에 모두 있는 *_ID 컬럼(INVOICE_ID, ORG_ID)은 조인 키로 유지
+    assert columns["AP_INVOICES_ALL"] == ["INVOICE_ID", "VENDOR_ID", "INVOICE_AMOUNT", "INVOICE_CURRENCY_CODE", "ORG_ID"]
+    assert "ORG_ID" in columns["AP_HOLDS_ALL"]
+    assert "GLOBAL_ATTRIBUTE1" not in columns["AP_INVOICES_ALL"]
+
+
+def test_noise_columns_only_when_named(context):
+    assert "ATTRIBUTE1" not in context.select_columns("hold attribute values")["AP_HOLDS_ALL"]
+    assert "ATTRIBUTE1" in context.select_columns("show attribute1 of holds")["AP_HOLDS_ALL"]
+
+
+def test_render_is_smaller_and_keeps_descriptions(context):
+    selection = context.select("list holds by org")
+    assert "HOLD_REASON VARCHAR2(240), -- Reason for the hold" in selection.schema
+    assert "PRIMARY KEY (HOLD_ID)" in selection.schema
+    assert "BYTE" not in selection.schema and "AP_INVOICES_ALL" not in selection.schema
+    assert selection.tokens == estimate_tokens(selection.schema) < selection.full_tokens
+    assert selection.report()["saved_tokens"] == selection.full_tokens - selection.tokens
+
+
+def test_select_many_merges_columns(context):
+    merged = context.select_many(["list holds by org", "invoice amount"])
+    assert set(merged.columns) == {"AP_HOLDS_ALL", "AP_INVOICES_ALL"}
+    assert "ORG_ID" in merged.columns["AP_HOLDS_ALL"]
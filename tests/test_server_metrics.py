@@ -0,0 +1,106 @@
+"""도구 계측: 히스토그램, 미들웨어의 호출/오류/느린 호출 집계, Prometheus /metrics 노출 형식"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from starlette.testclient import TestClient
+
+from server_metrics import Histogram, ToolMetricsMiddleware, record_serialization
+
+
+def _metric_types(text: str) -> dict:
+    return dict(line.split()[2:4] for line in text.splitlines() if line.startswith("# TYPE "))
+
+
+def _metric_values(text: str) -> dict:
+    return {name: float(value) for name, value in (line.split() for line in text.splitlines() if line and not line.startswith("#"))}
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((1, 5, 10))
+    for value in (0.5, 1, 3, 7, 20):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5 and histogram.sum == 31.5
+    assert histogram.quantile(0.4) == 1
+    assert histogram.quantile(0.6) == 5
+    assert histogram.quantile(1.0) == float("inf")
+    assert Histogram((1,)).quantile(0.5) == 0.0
+
+
+def test_middleware_counts_calls_errors_and_slow_calls():
+    metrics = ToolMetricsMiddleware(slow_call_seconds=0)
+    slow_events = []
+    metrics.on_slow_call.append(slow_events.append)
+    mcp = FastMCP("metrics-test")
+    mcp.add_middleware(metrics)
+
+    @mcp.tool()
+    def echo(text: str) -> dict:
+        record_serialization(0.002)
+        return {"text": text}
+
+    @mcp.tool()
+    def lookup(key: str) -> dict:
+        return {"error": f"없는 키: {key}"}
+
+    @mcp.tool()
+    def boom() -> dict:
+        raise RuntimeError("실패")
+
+    async def run():
+        async with Client(mcp) as client:
+            await client.call_tool("echo", {"text": "a" * 300})
+            await client.call_tool("echo", {"text": "b"})
+            await client.call_tool("lookup", {"key": "x"})
+            with pytest.raises(ToolError):
+                await client.call_tool("boom", {})
+
+    asyncio.run(run())
+    tools = metrics.snapshot()["tools"]
+    assert tools["echo"]["calls"] == 2 and tools["echo"]["errors"] == 0
+    assert tools["echo"]["in_flight"] == 0
+    assert tools["echo"]["serialization_seconds"]["sum"] == pytest.approx(0.004)
+    assert tools["echo"]["response_bytes"]["count"] == 2
+    assert tools["lookup"]["error_responses"] == 1
+    assert tools["boom"]["errors"] == 1 and tools["boom"]["response_bytes"]["count"] == 0
+    assert [event["tool"] for event in slow_events] == ["echo", "echo", "lookup", "boom"]
+    assert slow_events[0]["arguments"] == {"text": "a" * 300}
+    assert "실패" in slow_events[-1]["error"]
+
+    text = metrics.render_prometheus({"mcp_holds": 3}, extra_counters={"mcp_cache_hits_total": 7})
+    types = _metric_types(text)
+    values = _metric_values(text)
+    assert types["mcp_tool_calls_total"] == "counter"
+    assert types["mcp_tool_duration_seconds"] == "histogram"
+    assert types["mcp_holds"] == "gauge" and types["mcp_cache_hits_total"] == "counter"
+    assert values['mcp_tool_calls_total{tool="echo"}'] == 2
+    assert values['mcp_tool_errors_total{tool="boom",kind="exception"}'] == 1
+    assert values['mcp_tool_duration_seconds_count{tool="echo",phase="total"}'] == 2
+    assert values['mcp_tool_response_bytes_bucket{tool="echo",le="+Inf"}'] == 2
+
+
+def test_metrics_route_declares_counters(server):
+    text = TestClient(server.mcp.http_app(path="/mcp")).get("/metrics").text
+    types = _metric_types(text)
+    assert all(kind == "counter" for name, kind in types.items() if name.endswith("_total"))
+    assert types["mcp_holds"] == "gauge"
+    assert _metric_values(text)["mcp_holds"] == 10
+
+
+def test_metrics_route_before_initialize(server, monkeypatch):
+    monkeypatch.setattr(server, "_repository", None)
+    monkeypatch.setattr(server, "_statistics", None)
+    response = TestClient(server.mcp.http_app(path="/mcp")).get("/metrics")
+    assert response.status_code == 200
+    values = _metric_values(response.text)
+    assert values["mcp_holds"] == 0 and values["mcp_repository_generation"] == 0
+
+
+def test_get_server_metrics_tool(server):
+    metrics = server.get_server_metrics.fn()
+    assert {"tools", "slow_calls", "response_cache", "executor", "single_flight"} <= set(metrics)
@@ -0,0 +1,50 @@
+"""운영 서빙 모드: ASGI 앱 팩토리의 /health, /ready 와 serve 인자 처리"""
+import os
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from starlette.testclient import TestClient
+
+
+def test_ready_only_while_app_is_serving(server):
+    app = server.create_app()
+    client = TestClient(app)
+    assert client.get("/health").json()["status"] == "ok"
+    assert client.get("/ready").status_code == 503
+
+    with TestClient(app) as serving:
+        response = serving.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["holds"] == 10
+    assert client.get("/ready").status_code == 503
+
+
+def test_ready_reports_unavailable_repository(server, monkeypatch):
+    def fail():
+        raise ConnectionError("pool exhausted")
+
+    with TestClient(server.create_app()) as serving:
+        monkeypatch.setattr(server._repository, "ping", fail)
+        response = serving.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "repository_unavailable"
+
+
+def test_serve_passes_workers_and_stateless_mode(server, monkeypatch):
+    import uvicorn
+
+    calls = []
+    monkeypatch.setattr(uvicorn, "run", lambda *args, **kwargs: calls.append((args, kwargs)))
+    monkeypatch.setenv("MCP_STATELESS_HTTP", "0")
+    server.serve(["--workers", "3", "--port", "3100"])
+    (args, kwargs), = calls
+    assert args == ("hold_resolve_mcp:create_app",)
+    assert kwargs["factory"] and kwargs["workers"] == 3 and kwargs["port"] == 3100
+    assert os.environ["MCP_STATELESS_HTTP"] == "1"
+
+
+def test_serve_rejects_stateful_multi_worker(server):
+    with pytest.raises(SystemExit):
+        server.serve(["--stateful", "--workers", "2"])
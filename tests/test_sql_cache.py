@@ -0,0 +1,140 @@
+"""NL→SQL 캐시: 질문 정규화, 읽기 전용 판정, 바인드 변환, 응답에서 SQL/결과 추출, CachedSqlAgent 히트/미스"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from hold_datasource import SQLitePool, SqlHoldRepository
+from hold_store import ReadOnlyRepositoryError
+from sql_cache import (
+    NLSqlCache, extract_sql, extract_sql_result, is_read_only_sql, normalize_question, parameterize_sql,
+)
+
+SQL = "SELECT aha.INVOICE_ID, aha.HOLD_REASON FROM ap_holds_all aha WHERE aha.HOLD_LOOKUP_CODE = 'QTY ORD'"
+
+
+def _response(sql: str = SQL, rows=None) -> SimpleNamespace:
+    """SQL 도구 실행 트레이스(output 은 JSON 문자열)를 담은 RunResponse 모양의 객체"""
+    output = {"generated_sql": sql}
+    if rows is not None:
+        output["execution_result"] = rows
+    trace = {"trace_type": "EXECUTION_TRACE", "input": "question", "output": json.dumps(output)}
+    return SimpleNamespace(raw_responses=[SimpleNamespace(raw_data={"traces": [trace]})])
+
+
+def test_normalize_question():
+    assert normalize_question("  List  HOLDS?? ") == normalize_question("list holds")
+    assert normalize_question("‘INV-1’") == "'inv-1'"
+
+
+@pytest.mark.parametrize("sql, expected", [
+    (SQL, True),
+    ("with t as (select 1 from dual) select * from t", True),
+    ("select 'delete' from dual", True),
+    ("delete from ap_holds_all", False),
+    ("select 1 from dual; drop table ap_holds_all", False),
+    ("select * from ap_holds_all for update", False),
+])
+def test_is_read_only_sql(sql, expected):
+    assert is_read_only_sql(sql) is expected
+
+
+def test_parameterize_sql_keeps_typed_literals():
+    statement, binds = parameterize_sql("select * from t where a = 'x''y' and d > DATE '2024-01-01';")
+    assert statement == "select * from t where a = :p1 and d > DATE '2024-01-01'"
+    assert binds == {"p1": "x'y"}
+
+
+def test_extract_sql_and_result_from_tool_trace():
+    response = _response(rows=[{"INVOICE_ID": "INV-002", "HOLD_REASON": "수량 불일치"}])
+    assert extract_sql(response) == SQL
+    assert extract_sql_result(response) == (["INVOICE_ID", "HOLD_REASON"], [["INV-002", "수량 불일치"]])
+    assert extract_sql_result(_response()) is None
+
+    columnar = SimpleNamespace(raw_responses=[SimpleNamespace(raw_data={"result": {"columns": ["A"], "rows": [[1], [2]]}})])
+    assert extract_sql_result(columnar) == (["A"], [[1], [2]])
+
+
+def test_rows_cache_is_invalidated_by_watermark():
+    cache = NLSqlCache(watermark_interval=0)
+    watermark = ["w1"]
+    generation = cache.check_watermark(lambda: watermark[0])
+    cache.put_rows("select 1", {}, generation, ["A"], [(1,)])
+    assert cache.get_rows("select 1", {}, cache.check_watermark(lambda: watermark[0]))["rows"] == [[1]]
+    watermark[0] = "w2"
+    assert cache.get_rows("select 1", {}, cache.check_watermark(lambda: watermark[0])) is None
+
+
+def test_sqlite_read_only_pool_rejects_writes(sqlite_path, new_record):
+    repository = SqlHoldRepository(SQLitePool(sqlite_path, read_only=True))
+    assert repository.read_only
+    assert repository.get("INV-001") is not None
+    with pytest.raises(ReadOnlyRepositoryError):
+        repository.add(new_record("INV-100"))
+    with pytest.raises(Exception, match="readonly"):
+        repository.select("DELETE FROM ap_holds_all")
+
+
+class _Pool:
+    size = 2
+
+    def __init__(self, response):
+        self.response = response
+        self.questions = []
+
+    async def run(self, question):
+        self.questions.append(question)
+        return self.response
+
+
+@pytest.fixture
+def read_only_repository(sqlite_path):
+    return SqlHoldRepository(SQLitePool(sqlite_path, read_only=True))
+
+
+def _ask(agent, question):
+    return asyncio.run(agent._ask(question))
+
+
+def test_miss_uses_tool_rows_without_rerunning_sql(read_only_repository, monkeypatch):
+    sqltool_call = pytest.importorskip("sqltool_call")
+    selects = []
+    select = read_only_repository.select
+    monkeypatch.setattr(read_only_repository, "select", lambda *args, **kwargs: selects.append(args) or select(*args, **kwargs))
+    pool = _Pool(_response(rows=[{"INVOICE_ID": "INV-002", "HOLD_REASON": "수량 불일치"}]))
+    agent = sqltool_call.CachedSqlAgent(pool, repository=read_only_repository, verify_on_miss=False)
+
+    miss = _ask(agent, "QTY ORD 홀딩 목록")
+    assert miss.cache == "miss" and miss.rows == [["INV-002", "수량 불일치"]]
+    assert selects == []
+
+    # 같은 질문은 LLM 없이 L2 에 넣어 둔 행으로 응답
+    hit = _ask(agent, "qty ord 홀딩 목록?")
+    assert (hit.cache, hit.sql, hit.columns, hit.rows) == ("rows", SQL, miss.columns, miss.rows)
+    assert len(pool.questions) == 1 and selects == []
+
+
+def test_verify_on_miss_runs_sql_on_read_only_connection(read_only_repository):
+    sqltool_call = pytest.importorskip("sqltool_call")
+    agent = sqltool_call.CachedSqlAgent(_Pool(_response()), repository=read_only_repository, verify_on_miss=True)
+    miss = _ask(agent, "QTY ORD 홀딩 목록")
+    assert miss.cache == "miss" and miss.rows == [["INV-002", "수량 불일치"]]
+    assert _ask(agent, "QTY ORD 홀딩 목록").cache == "rows"
+
+    broken = sqltool_call.CachedSqlAgent(
+        _Pool(_response("SELECT NO_SUCH_COLUMN FROM ap_holds_all")), repository=read_only_repository, verify_on_miss=True
+    )
+    _ask(broken, "broken")
+    assert broken.cache.lookup_sql("broken") is None
+
+
+def test_failing_cached_sql_falls_back_to_agent(read_only_repository):
+    sqltool_call = pytest.importorskip("sqltool_call")
+    pool = _Pool(_response("SELECT NO_SUCH_COLUMN FROM ap_holds_all"))
+    agent = sqltool_call.CachedSqlAgent(pool, repository=read_only_repository, verify_on_miss=False)
+    _ask(agent, "broken")
+    assert agent.cache.lookup_sql("broken") is not None
+    # 기억한 SQL 이 읽기 전용 연결에서 실패하면 버리고 에이전트로 되돌아감
+    assert _ask(agent, "broken").cache == "miss"
+    assert len(pool.questions) == 2
@@ -0,0 +1,49 @@
+"""NDJSON 스트리밍 엔드포인트: 전체 페이지를 한 줄씩 내보내고, 잘못된 필터는 400"""
+import json
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from starlette.testclient import TestClient
+
+
+@pytest.fixture
+def client(server):
+    # lifespan 없이 라우트만 호출 (server 픽스처가 이미 초기화함)
+    return TestClient(server.mcp.http_app(path="/mcp"))
+
+
+def _lines(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_returns_every_detail_as_ndjson(client):
+    response = client.get("/stream/holding-reason-details")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(response)
+    assert [line["invoice_id"] for line in lines] == [f"INV-{number:03d}" for number in range(1, 11)]
+    assert set(lines[0]) == {"invoice_id", "reason", "detail", "search_query"}
+
+
+def test_stream_applies_filters(client):
+    response = client.get("/stream/holding-reason-details", params={"org_id": "101"})
+    assert [line["invoice_id"] for line in _lines(response)] == ["INV-001", "INV-002", "INV-005", "INV-008"]
+    response = client.get("/stream/holding-reason-details", params={"reason": "없는 사유"})
+    assert response.status_code == 200 and response.text == ""
+
+
+def test_stream_spans_multiple_pages(server, client, new_record):
+    for number in range(100, 100 + server.MAX_PAGE_SIZE + 5):
+        server._repository.add(new_record(f"INV-{number}", org_id=777))
+    lines = _lines(client.get("/stream/holding-reason-details", params={"org_id": "777"}))
+    assert len(lines) == server.MAX_PAGE_SIZE + 5
+    assert len({line["invoice_id"] for line in lines}) == len(lines)
+
+
+@pytest.mark.parametrize("params", [{"org_id": "abc"}, {"hold_date_from": "2024-13-01"}])
+def test_stream_rejects_invalid_filters(client, params):
+    response = client.get("/stream/holding-reason-details", params=params)
+    assert response.status_code == 400
+    assert "error" in response.json()
@@ -0,0 +1,140 @@
+"""BlockingExecutor (전용 스레드 풀) 와 SingleFlight (동일 호출 합치기), 도구의 블로킹 조회 오프로드"""
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from hold_datasource import SQLitePool, SqlHoldRepository
+from tool_executor import BlockingExecutor, SingleFlight
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_blocking_executor_runs_in_pool_thread_with_context():
+    executor = BlockingExecutor(2, thread_name_prefix="test-io")
+
+    def work(value):
+        return threading.current_thread().name, _request_id.get(), value * 2
+
+    async def main():
+        _request_id.set("req-1")
+        return await executor.run(work, 21)
+
+    try:
+        thread_name, request_id, value = asyncio.run(main())
+    finally:
+        executor.shutdown(wait=True)
+    assert thread_name.startswith("test-io")
+    assert request_id == "req-1"
+    assert value == 42
+    metrics = executor.metrics()
+    assert metrics["submitted"] == metrics["completed"] == 1
+    assert metrics["errors"] == 0
+
+
+def test_blocking_executor_counts_errors():
+    executor = BlockingExecutor(1)
+
+    def fail():
+        raise LookupError("boom")
+
+    try:
+        with pytest.raises(LookupError):
+            asyncio.run(executor.run(fail))
+    finally:
+        executor.shutdown(wait=True)
+    assert executor.metrics()["errors"] == 1
+
+
+def test_disabled_executor_runs_inline():
+    executor = BlockingExecutor(0)
+    assert not executor.enabled
+    name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+    assert name == threading.current_thread().name
+    assert executor.metrics()["submitted"] == 0
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    started = 0
+
+    async def factory():
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", factory) for _ in range(5)), flight.do("other", factory))
+
+    results = asyncio.run(main())
+    assert started == 2
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] is not results[0]
+    assert flight.metrics() == {"calls": 6, "shared": 4, "inflight": 0}
+
+
+def test_single_flight_survives_first_caller_cancellation():
+    flight = SingleFlight()
+
+    async def factory():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.create_task(flight.do("key", factory))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", factory))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_single_flight_propagates_errors_and_forgets_key():
+    flight = SingleFlight()
+    attempts = 0
+
+    async def factory():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("backend down")
+        return "ok"
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await flight.do("key", factory)
+        return await flight.do("key", factory)
+
+    assert asyncio.run(main()) == "ok"
+    assert attempts == 2
+
+
+def _concurrent_details(server, count: int) -> list:
+    async def main():
+        return await asyncio.gather(*(server.get_holding_reason_detail.fn(invoice_id="INV-002") for _ in range(count)))
+
+    return [result.content[0].text for result in asyncio.run(main())]
+
+
+def test_blocking_repository_lookups_are_offloaded_and_coalesced(server, sqlite_path):
+    server.set_repository(SqlHoldRepository(SQLitePool(sqlite_path)))
+    submitted = server._blocking_executor.metrics()["submitted"]
+    shared = server._single_flight.shared
+
+    texts = _concurrent_details(server, 5)
+    assert len(set(texts)) == 1 and '"INV-002"' in texts[0]
+    # 캐시 미스 5건이 한 번의 풀 실행으로 합쳐짐
+    assert server._blocking_executor.metrics()["submitted"] == submitted + 1
+    assert server._single_flight.shared == shared + 4
+
+
+def test_in_memory_repository_runs_inline(server):
+    submitted = server._blocking_executor.metrics()["submitted"]
+    _concurrent_details(server, 3)
+    assert server._blocking_executor.metrics()["submitted"] == submitted
@@ -0,0 +1,134 @@
+"""요청 추적: traceparent 전파, span 중첩과 내보내기, category 별 시간 분해, 도구 미들웨어"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from tracing import (
+    JsonlSpanExporter, Span, Tracer, current_traceparent, format_summary, instrument_agent, parse_traceparent,
+    summarize_spans,
+)
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+PARENT_ID = "b7ad6b7169203331"
+
+
+def _span(name, span_id, parent_id, start, end, category=None) -> Span:
+    attributes = {"category": category} if category else {}
+    return Span(name, TRACE_ID, span_id, parent_id, "test", int(start * 1e9), int(end * 1e9), attributes)
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID)
+    assert parse_traceparent(None) is None
+    assert parse_traceparent("00-short-id-01") is None
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}") is None
+
+
+def test_nested_spans_are_exported_when_root_ends(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracer = Tracer("cli", [JsonlSpanExporter(str(path))])
+    ended = []
+    tracer.on_trace_end.append(ended.append)
+
+    with tracer.span("cli.turn", question="q") as root:
+        with tracer.span("llm.chat", category="llm") as child:
+            assert current_traceparent() == child.traceparent
+        assert not ended
+    assert current_traceparent() is None
+
+    assert child.trace_id == root.trace_id and child.parent_id == root.span_id
+    assert root.parent_id is None and child.attributes["category"] == "llm"
+    assert [span.name for span in ended[0]] == ["cli.turn", "llm.chat"]
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["name"] for line in lines] == ["cli.turn", "llm.chat"]
+    assert lines[0]["attributes"] == {"question": "q"}
+    assert tracer.spans(root.trace_id) == ended[0]
+
+
+def test_span_continues_remote_parent_and_records_errors():
+    tracer = Tracer("mcp")
+    with pytest.raises(ValueError):
+        with tracer.span("tool.lookup", category="tool", traceparent=f"00-{TRACE_ID}-{PARENT_ID}-01") as span:
+            raise ValueError("bad id")
+    assert (span.trace_id, span.parent_id, span.remote_parent) == (TRACE_ID, PARENT_ID, True)
+    assert span.error == "ValueError: bad id"
+    assert tracer.summarize(TRACE_ID)["errors"] == 1
+
+
+def test_failing_exporter_does_not_break_the_trace(capsys):
+    class Broken:
+        def export(self, spans):
+            raise OSError("disk full")
+
+    tracer = Tracer("cli", [Broken()])
+    with tracer.span("cli.turn") as root:
+        pass
+    assert len(tracer.spans(root.trace_id)) == 1
+    assert "disk full" in capsys.readouterr().err
+
+
+def test_summarize_spans_does_not_double_count_nested_categories():
+    spans = [
+        _span("cli.turn", "r", None, 0, 10),
+        _span("llm.chat", "a", "r", 0, 6, "llm"),
+        _span("mcp.call", "b", "a", 1, 3, "mcp"),
+        _span("tool.detail", "c", "b", 1.5, 2.5, "tool"),
+        _span("llm.chat", "d", "a", 4, 5, "llm"),
+        _span("sql.execute", "e", "r", 7, 8, "sql"),
+    ]
+    summary = summarize_spans(spans)
+    assert summary == {
+        "total": 10.0, "llm": 4.0, "mcp": 1.0, "tool": 1.0, "sql": 1.0, "other": 3.0, "spans": 6, "errors": 0,
+    }
+    assert format_summary(summary).startswith("총 10.00초 = llm 4.00초 (40%) + mcp 1.00초 (10%)")
+    assert summarize_spans([]) == {} and format_summary({}) == "트레이스 없음"
+
+
+def test_instrument_agent_wraps_remote_calls_once():
+    tracer = Tracer("cli")
+    client = SimpleNamespace(chat=lambda *args, **kwargs: "answer", create_session=lambda: "session")
+    agent = SimpleNamespace(client=client)
+    instrument_agent(agent, tracer)
+    instrument_agent(agent, tracer)
+    with tracer.span("cli.turn") as root:
+        assert agent.client.create_session() == "session"
+        assert agent.client.chat("q") == "answer"
+    names = [span.name for span in tracer.spans(root.trace_id)]
+    assert names == ["cli.turn", "agent.create_session", "llm.chat"]
+    assert tracer.summarize(root.trace_id)["spans"] == 3
+
+
+def test_tracing_middleware_records_tool_span():
+    pytest.importorskip("fastmcp")
+    from fastmcp import Client, FastMCP
+    from mcp import types
+
+    from tracing import tracing_middleware
+
+    tracer = Tracer("mcp")
+    ended = []
+    tracer.on_trace_end.append(ended.extend)
+    mcp = FastMCP("tracing-test")
+    mcp.add_middleware(tracing_middleware(tracer))
+
+    @mcp.tool()
+    def lookup(key: str) -> dict:
+        return {"key": key}
+
+    async def run():
+        async with Client(mcp) as client:
+            await client.call_tool("lookup", {"key": "INV-001"})
+            # CLI 의 TracedMCPClient 처럼 요청 _meta 에 traceparent 를 실어 보냄
+            await client.session.send_request(types.ClientRequest(types.CallToolRequest(
+                method="tools/call",
+                params=types.CallToolRequestParams(
+                    name="lookup", arguments={"key": "INV-002"}, _meta={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+                ),
+            )), types.CallToolResult)
+
+    asyncio.run(run())
+    assert [(span.name, span.attributes) for span in ended] == [("tool.lookup", {"tool": "lookup", "category": "tool"})] * 2
+    assert ended[0].trace_id != TRACE_ID and ended[0].parent_id is None
+    assert (ended[1].trace_id, ended[1].parent_id, ended[1].remote_parent) == (TRACE_ID, PARENT_ID, True)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+블로킹 데이터 접근 오프로딩 (Tool Executor)
+
+DB 드라이버나 파일 I/O 로 막히는 도구 본문을 이벤트 루프에서 실행하면, 같은 루프를 쓰는
+streamable-http 세션 전체가 그 호출이 끝날 때까지 멈춥니다.
+
+- BlockingExecutor: 크기가 제한된 전용 스레드 풀에서 블로킹 함수를 실행합니다.
+  asyncio 기본 풀(to_thread)과 분리해 DB 커넥션 풀 크기에 맞추고, 넘치는 호출은 풀 큐에서 기다립니다.
+  contextvars 를 복사해 실행하므로 트레이스/도구 계측 문맥이 스레드에서도 이어집니다.
+- SingleFlight: 같은 키의 호출이 진행 중이면 새로 실행하지 않고 그 결과를 함께 기다립니다
+  (request coalescing). 먼저 온 호출이 취소되어도 실행은 계속되어 나머지 호출이 결과를 받습니다.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BlockingExecutor:
+    """블로킹 함수를 제한된 스레드 풀에서 실행하는 실행기 (max_workers=0 이면 비활성)"""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "tool-io") -> None:
+        self.max_workers = max(0, max_workers)
+        self.thread_name_prefix = thread_name_prefix
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.errors = 0
+        self.active = 0
+        self.max_active = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+        return self._pool
+
+    def _call(self, fn: Callable[..., T], args: tuple, kwargs: Dict[str, Any]) -> T:
+        with self._lock:
+            self.started += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            return fn(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """fn(*args, **kwargs) 를 풀에서 실행하고 결과를 기다립니다. 비활성이면 현재 스레드에서 바로 실행합니다."""
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        with self._lock:
+            self.submitted += 1
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, fn, args, kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor(), call)
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "submitted": self.submitted,
+                "queued": self.submitted - self.started,
+                "active": self.active,
+                "max_active": self.max_active,
+                "completed": self.completed,
+                "errors": self.errors,
+            }
+
+
+class SingleFlight:
+    """키별로 진행 중인 호출을 하나로 합칩니다 (이벤트 루프 안에서만 사용)."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """key 로 진행 중인 호출이 있으면 그 결과를, 없으면 factory() 를 실행한 결과를 반환합니다."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 기다리던 호출이 모두 취소된 경우에도 "exception was never retrieved" 경고가 나지 않게 함
+            task.exception()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "shared": self.shared, "inflight": len(self._inflight)}
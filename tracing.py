@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+에이전트 턴 단위 분산 트레이싱 (Span Tracing)
+
+질문 하나(턴)가 20초 걸렸을 때 LLM 호출, MCP 왕복, 서버 도구 실행, SQL 실행 중 어디에 시간이 들었는지
+보기 위한 가벼운 span 트레이서입니다 (외부 의존성 없음, OTLP/HTTP JSON 형식으로 내보내기 가능).
+
+- span 문맥은 contextvars 로 전파되므로 asyncio.to_thread / 워커 스레드의 태스크에도 이어집니다.
+- 프로세스 간에는 W3C traceparent 로 전파합니다 (클라이언트: MCP 요청 _meta, 서버: TracingMiddleware).
+- span 의 category 속성(llm / mcp / tool / sql)으로 턴별 시간 분해(summarize)를 계산합니다.
+  같은 category 의 하위 span 시간은 한 번만 세고, 어느 category 에도 속하지 않은 시간은 other 입니다.
+
+환경 변수:
+    TRACE_FILE=.cache/traces.jsonl                  : 끝난 span 을 JSON Lines 로 기록
+    OTEL_EXPORTER_OTLP_ENDPOINT=http://host:4318    : OTLP/HTTP(JSON) 수집기로 전송 (/v1/traces)
+    TRACE_SERVICE_NAME                              : service.name (기본값은 프로세스별 이름)
+"""
+import contextvars
+import json
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+MAX_KEPT_TRACES = 256
+CATEGORIES = ("llm", "mcp", "tool", "sql")
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """시간 구간 하나 (OTLP span 과 같은 식별자 체계)"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    service: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    # 부모가 다른 프로세스에 있는 span (서버 쪽 진입점)
+    remote_parent: bool = False
+
+    @property
+    def duration(self) -> float:
+        return max(self.end_ns - self.start_ns, 0) / 1e9
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "service": self.service,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """W3C traceparent ("00-<trace_id>-<span_id>-<flags>") → (trace_id, span_id). 형식이 틀리면 None."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_traceparent() -> Optional[str]:
+    span = _current_span.get()
+    return span.traceparent if span is not None else None
+
+
+class JsonlSpanExporter:
+    """끝난 span 을 파일에 한 줄씩 추가합니다."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpHttpSpanExporter:
+    """OTLP/HTTP JSON 으로 span 을 보냅니다. 전송은 백그라운드 스레드에서 하므로 요청 경로를 막지 않습니다."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+        self._queue: "queue.Queue[List[Span]]" = queue.Queue(maxsize=1000)
+        threading.Thread(target=self._send_loop, name="otlp-exporter", daemon=True).start()
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            pass  # 수집기가 느리면 버림 (서비스 지연보다 트레이스 유실이 낫다)
+
+    def _payload(self, spans: List[Span]) -> bytes:
+        by_service: Dict[str, List[Dict[str, Any]]] = {}
+        for span in spans:
+            by_service.setdefault(span.service, []).append({
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_id or "",
+                "name": span.name,
+                "kind": 2 if span.remote_parent else 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            })
+        return json.dumps({"resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+                "scopeSpans": [{"scope": {"name": "ebsagent.tracing"}, "spans": otlp_spans}],
+            }
+            for service, otlp_spans in by_service.items()
+        ]}).encode("utf-8")
+
+    def _send_loop(self) -> None:
+        while True:
+            spans = self._queue.get()
+            request = urllib.request.Request(
+                self.url, data=self._payload(spans), headers={"Content-Type": "application/json"}, method="POST"
+            )
+            try:
+                urllib.request.urlopen(request, timeout=self.timeout).close()
+            except Exception as e:
+                print(f"⚠️  OTLP 전송 실패 ({self.url}): {e}", file=sys.stderr)
+
+
+class Tracer:
+    """
+    span 을 만들고, 프로세스 안의 루트 span(또는 원격 부모를 가진 진입 span)이 끝나면
+    그 트레이스의 span 들을 한 번에 내보냅니다.
+    """
+
+    def __init__(self, service: str, exporters: Optional[List[Any]] = None) -> None:
+        self.service = service
+        self.exporters = list(exporters or [])
+        self.on_trace_end: List[Callable[[List[Span]], None]] = []
+        self._open: Dict[str, List[Span]] = {}
+        self._finished: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, service: str) -> "Tracer":
+        exporters: List[Any] = []
+        if os.getenv("TRACE_FILE"):
+            exporters.append(JsonlSpanExporter(os.environ["TRACE_FILE"]))
+        if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            exporters.append(OtlpHttpSpanExporter(os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"]))
+        return cls(os.getenv("TRACE_SERVICE_NAME", service), exporters)
+
+    @contextmanager
+    def span(self, name: str, category: Optional[str] = None, traceparent: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+        """
+        현재 span 의 하위 span 을 엽니다. traceparent 를 주면 (현재 span 이 없을 때) 원격 부모에 이어 붙입니다.
+        예외가 나면 span 에 기록하고 다시 던집니다.
+        """
+        parent = _current_span.get()
+        remote = parse_traceparent(traceparent) if parent is None else None
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif remote is not None:
+            trace_id, parent_id = remote
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+        if category is not None:
+            attributes["category"] = category
+        span = Span(
+            name=name, trace_id=trace_id, span_id=secrets.token_hex(8), parent_id=parent_id,
+            service=self.service, start_ns=time.time_ns(), attributes=attributes, remote_parent=remote is not None,
+        )
+        with self._lock:
+            self._open.setdefault(trace_id, []).append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            if parent is None:
+                self._finish(trace_id, span)
+
+    def _finish(self, trace_id: str, local_root: Span) -> None:
+        with self._lock:
+            spans = self._open.get(trace_id, [])
+            # 같은 트레이스의 다른 진입 span 이 아직 열려 있으면(서버의 동시 도구 호출 등) 끝난 것만 내보냄
+            done = [span for span in spans if span.end_ns]
+            remaining = [span for span in spans if not span.end_ns]
+            if remaining:
+                self._open[trace_id] = remaining
+            else:
+                self._open.pop(trace_id, None)
+            kept = self._finished.setdefault(trace_id, [])
+            kept.extend(done)
+            self._finished.move_to_end(trace_id)
+            while len(self._finished) > MAX_KEPT_TRACES:
+                self._finished.popitem(last=False)
+        for exporter in self.exporters:
+            try:
+                exporter.export(done)
+            except Exception as e:
+                print(f"⚠️  span 내보내기 실패: {e}", file=sys.stderr)
+        for hook in self.on_trace_end:
+            hook(done)
+
+    def spans(self, trace_id: str) -> List[Span]:
+        """이 프로세스에서 끝난 트레이스의 span 목록 (최근 MAX_KEPT_TRACES 개 트레이스만 보관)"""
+        with self._lock:
+            return list(self._finished.get(trace_id, []))
+
+    def summarize(self, trace_id: str) -> Dict[str, Any]:
+        return summarize_spans(self.spans(trace_id))
+
+
+def traced_method(tracer: Tracer, method: Callable, name: str, category: Optional[str] = None) -> Callable:
+    """동기 메서드를 span 으로 감쌉니다 (예: AgentClient.chat → llm.chat)."""
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with tracer.span(name, category=category):
+            return method(*args, **kwargs)
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def instrument_agent(agent: Any, tracer: Tracer) -> Any:
+    """
+    ADK Agent 의 원격 호출(세션 생성, chat)을 span 으로 감쌉니다.
+    chat 한 번은 LLM 추론(+ 원격 SQL 도구의 SQL 생성/실행)을 포함하므로 category 는 llm 입니다.
+    """
+    client = agent.client
+    if getattr(client, "_traced", False):
+        return agent
+    client.chat = traced_method(tracer, client.chat, "llm.chat", category="llm")
+    client.create_session = traced_method(tracer, client.create_session, "agent.create_session", category="llm")
+    client._traced = True
+    return agent
+
+
+def summarize_spans(spans: List[Span]) -> Dict[str, Any]:
+    """
+    트레이스 하나의 시간 분해: 루트 span 시간과 category 별 시간(초), 나머지(other).
+    category span 의 시간에서 다른 category 의 하위 span 시간을 빼서 두 번 세지 않습니다.
+    """
+    if not spans:
+        return {}
+    by_id = {span.span_id: span for span in spans}
+    roots = [span for span in spans if span.parent_id not in by_id]
+    total = sum(root.duration for root in roots)
+
+    def nearest_category(span: Span) -> Optional[str]:
+        parent = by_id.get(span.parent_id) if span.parent_id else None
+        while parent is not None:
+            if parent.attributes.get("category"):
+                return parent.attributes["category"]
+            parent = by_id.get(parent.parent_id) if parent.parent_id else None
+        return None
+
+    breakdown = {category: 0.0 for category in CATEGORIES}
+    for span in spans:
+        category = span.attributes.get("category")
+        if not category or category not in breakdown:
+            continue
+        enclosing = nearest_category(span)
+        if enclosing == category:
+            continue  # 같은 category 의 바깥 span 에서 이미 셈
+        breakdown[category] += span.duration
+        if enclosing is not None and enclosing in breakdown:
+            breakdown[enclosing] -= span.duration
+    summary = {"total": round(total, 4)}
+    summary.update({category: round(max(seconds, 0.0), 4) for category, seconds in breakdown.items()})
+    summary["other"] = round(max(total - sum(breakdown.values()), 0.0), 4)
+    summary["spans"] = len(spans)
+    summary["errors"] = sum(1 for span in spans if span.error)
+    return summary
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """'총 12.3초 = llm 9.8초 (80%) + mcp 1.2초 (10%) + ...' 형식의 한 줄 요약"""
+    if not summary:
+        return "트레이스 없음"
+    total = summary["total"] or 1e-9
+    parts = [
+        f"{category} {summary[category]:.2f}초 ({summary[category] / total:.0%})"
+        for category in CATEGORIES + ("other",)
+        if summary.get(category)
+    ]
+    return f"총 {summary['total']:.2f}초 = " + " + ".join(parts)
+
+
+def _meta_traceparent(meta: Any) -> Optional[str]:
+    if meta is None:
+        return None
+    if isinstance(meta, dict):
+        return meta.get("traceparent")
+    return getattr(meta, "traceparent", None) or (getattr(meta, "model_extra", None) or {}).get("traceparent")
+
+
+def tracing_middleware(tracer: Tracer) -> Any:
+    """
+    서버용 FastMCP 미들웨어: 요청 _meta(또는 HTTP 헤더)의 traceparent 를 이어받아 도구 실행을 span 으로 기록합니다.
+    """
+    from fastmcp.server.dependencies import get_http_headers
+    from fastmcp.server.middleware import Middleware
+
+    class TracingMiddleware(Middleware):
+        async def on_call_tool(self, context: Any, call_next: Callable) -> Any:
+            # FastMCP 는 미들웨어에 _meta 없이 name/arguments 만 넘기므로 원래 요청 문맥의 _meta 를 확인
+            request_context = getattr(context.fastmcp_context, "request_context", None)
+            traceparent = _meta_traceparent(getattr(context.message, "meta", None)) or _meta_traceparent(
+                getattr(request_context, "meta", None)
+            )
+            if traceparent is None:
+                traceparent = get_http_headers(include_all=True).get("traceparent")
+            with tracer.span(f"tool.{context.message.name}", category="tool", traceparent=traceparent, tool=context.message.name):
+                return await call_next(context)
+
+    return TracingMiddleware()